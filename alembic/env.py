@@ -1,6 +1,7 @@
 from app.core.settings import settings
-from app.database import DATABASE_URL, engine
+from app.database import SYNC_DATABASE_URL, engine
 from app.models import *  # all your SQLModel models
+import asyncio
 import sys
 import os
 from logging.config import fileConfig
@@ -18,8 +19,8 @@ sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 config = context.config
 fileConfig(config.config_file_name)
 
-# Dynamically set the DB URL
-db_url = str(DATABASE_URL)
+# Dynamically set the DB URL (sync driver: only offline mode renders SQL from it)
+db_url = str(SYNC_DATABASE_URL)
 
 # Ensure SSL mode for Supabase
 if settings.ENV != "dev" and "sslmode" not in db_url:
@@ -47,16 +48,26 @@ def run_migrations_offline():
         context.run_migrations()
 
 
-def run_migrations_online():
-    """Run migrations in online mode (connect to DB)."""
-    # Use the app's engine directly
+def do_run_migrations(connection):
+    context.configure(connection=connection,
+                      target_metadata=target_metadata)
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+async def run_async_migrations():
+    # Use the app's async engine directly
     connectable = engine
 
-    with connectable.connect() as connection:
-        context.configure(connection=connection,
-                          target_metadata=target_metadata)
-        with context.begin_transaction():
-            context.run_migrations()
+    async with connectable.connect() as connection:
+        await connection.run_sync(do_run_migrations)
+
+    await connectable.dispose()
+
+
+def run_migrations_online():
+    """Run migrations in online mode (connect to DB)."""
+    asyncio.run(run_async_migrations())
 
 
 # Choose offline or online based on context
@@ -0,0 +1,100 @@
+"""Add composite indexes for hot transaction queries
+
+Revision ID: 3b9d2e7c41a6
+Revises: f632b07fe41b
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b9d2e7c41a6'
+down_revision: Union[str, Sequence[str], None] = 'f632b07fe41b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE/DROP INDEX CONCURRENTLY cannot run inside a transaction block, so
+    # each statement is committed on its own. This keeps writes flowing while
+    # the indexes build against a live database.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_transactions_user_id_created_at', 'transactions',
+            ['user_id', sa.text('created_at DESC'),
+             sa.text('transaction_id DESC')],
+            unique=False,
+            postgresql_where=sa.text('is_active'),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_transactions_user_id_wallet_id_created_at', 'transactions',
+            ['user_id', 'wallet_id', sa.text('created_at DESC')],
+            unique=False,
+            postgresql_where=sa.text('is_active'),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_transactions_user_id_category_id_created_at', 'transactions',
+            ['user_id', 'category_id', sa.text('created_at DESC')],
+            unique=False,
+            postgresql_where=sa.text('is_active'),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_transactions_user_id_transaction_date', 'transactions',
+            ['user_id', 'transaction_date'],
+            unique=False,
+            postgresql_include=['currency', 'amount'],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_wallets_user_id_is_active', 'wallets',
+            ['user_id', 'is_active'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_categories_user_id_is_active', 'categories',
+            ['user_id', 'is_active'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+        # Unique indexes duplicating the primary keys: the PK constraint
+        # already enforces uniqueness and serves lookups by id.
+        op.drop_index(op.f('ix_transactions_transaction_id'),
+                      table_name='transactions', postgresql_concurrently=True)
+        op.drop_index(op.f('ix_wallets_wallet_id'),
+                      table_name='wallets', postgresql_concurrently=True)
+        op.drop_index(op.f('ix_categories_category_id'),
+                      table_name='categories', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(op.f('ix_categories_category_id'), 'categories',
+                        ['category_id'], unique=True, postgresql_concurrently=True)
+        op.create_index(op.f('ix_wallets_wallet_id'), 'wallets',
+                        ['wallet_id'], unique=True, postgresql_concurrently=True)
+        op.create_index(op.f('ix_transactions_transaction_id'), 'transactions',
+                        ['transaction_id'], unique=True, postgresql_concurrently=True)
+
+        op.drop_index('ix_categories_user_id_is_active',
+                      table_name='categories', postgresql_concurrently=True)
+        op.drop_index('ix_wallets_user_id_is_active',
+                      table_name='wallets', postgresql_concurrently=True)
+        op.drop_index('ix_transactions_user_id_transaction_date',
+                      table_name='transactions', postgresql_concurrently=True)
+        op.drop_index('ix_transactions_user_id_category_id_created_at',
+                      table_name='transactions', postgresql_concurrently=True)
+        op.drop_index('ix_transactions_user_id_wallet_id_created_at',
+                      table_name='transactions', postgresql_concurrently=True)
+        op.drop_index('ix_transactions_user_id_created_at',
+                      table_name='transactions', postgresql_concurrently=True)
@@ -0,0 +1,36 @@
+"""Widen transactions.transaction_no
+
+Revision ID: 5e2a7c9d1b40
+Revises: 8c1f5a2d9e37
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e2a7c9d1b40'
+down_revision: Union[str, Sequence[str], None] = '8c1f5a2d9e37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # short_uuid() generates "TXN" + 12 hex digits. Growing a varchar is a
+    # catalog-only change, no table rewrite.
+    op.alter_column('transactions', 'transaction_no',
+                    existing_type=sqlmodel.sql.sqltypes.AutoString(length=12),
+                    type_=sqlmodel.sql.sqltypes.AutoString(length=15),
+                    existing_nullable=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column('transactions', 'transaction_no',
+                    existing_type=sqlmodel.sql.sqltypes.AutoString(length=15),
+                    type_=sqlmodel.sql.sqltypes.AutoString(length=12),
+                    existing_nullable=False)
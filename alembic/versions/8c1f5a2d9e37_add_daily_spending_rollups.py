@@ -0,0 +1,72 @@
+"""Add daily spending rollups
+
+Requires PostgreSQL 15+: the unique key uses NULLS NOT DISTINCT so that
+uncategorized spending has a single row that ON CONFLICT can target.
+
+The initial backfill buckets days in the app's DEFAULT_TIMEZONE (read from
+app settings at migration time). If that setting changes later, rebuild
+with `python -m app.core.rollups backfill`.
+
+Revision ID: 8c1f5a2d9e37
+Revises: 3b9d2e7c41a6
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+from app.core.settings import settings
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c1f5a2d9e37'
+down_revision: Union[str, Sequence[str], None] = '3b9d2e7c41a6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    server_version = op.get_bind().dialect.server_version_info
+    if server_version and server_version < (15,):
+        raise RuntimeError(
+            "daily_spending needs PostgreSQL 15+ (UNIQUE NULLS NOT DISTINCT), "
+            f"server is {'.'.join(map(str, server_version))}")
+
+    op.create_table('daily_spending',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('local_date', sa.Date(), nullable=False),
+    sa.Column('currency', sqlmodel.sql.sqltypes.AutoString(length=3), nullable=False),
+    sa.Column('wallet_id', sqlmodel.sql.sqltypes.AutoString(length=36), nullable=False),
+    sa.Column('category_id', sqlmodel.sql.sqltypes.AutoString(length=36), nullable=True),
+    sa.Column('total_amount', sa.Numeric(), nullable=False),
+    sa.Column('transaction_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'local_date', 'currency', 'wallet_id', 'category_id',
+                        name='uq_daily_spending_key', postgresql_nulls_not_distinct=True)
+    )
+
+    # Initial backfill; `python -m app.core.rollups backfill` does the same
+    op.execute(
+        sa.text("""
+            INSERT INTO daily_spending
+                (user_id, local_date, currency, wallet_id, category_id,
+                 total_amount, transaction_count)
+            SELECT user_id,
+                   date(timezone(:tz, timezone('UTC', transaction_date))),
+                   upper(currency), wallet_id, category_id,
+                   sum(amount::numeric), count(*)
+            FROM transactions
+            WHERE is_active
+            GROUP BY 1, 2, 3, 4, 5
+        """).bindparams(tz=settings.DEFAULT_TIMEZONE)
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('daily_spending')
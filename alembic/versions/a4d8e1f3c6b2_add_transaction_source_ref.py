@@ -0,0 +1,40 @@
+"""Add transactions.source_ref for statement imports
+
+Revision ID: a4d8e1f3c6b2
+Revises: 5e2a7c9d1b40
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4d8e1f3c6b2'
+down_revision: Union[str, Sequence[str], None] = '5e2a7c9d1b40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Nullable without default: a catalog-only change
+    op.add_column('transactions', sa.Column(
+        'source_ref', sqlmodel.sql.sqltypes.AutoString(length=80), nullable=True))
+
+    with op.get_context().autocommit_block():
+        op.create_index('uq_transactions_wallet_id_source_ref', 'transactions',
+                        ['wallet_id', 'source_ref'], unique=True,
+                        postgresql_where=sa.text('source_ref IS NOT NULL'),
+                        postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('uq_transactions_wallet_id_source_ref', table_name='transactions',
+                      postgresql_concurrently=True)
+    op.drop_column('transactions', 'source_ref')
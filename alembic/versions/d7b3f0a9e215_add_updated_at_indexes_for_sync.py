@@ -0,0 +1,41 @@
+"""Add (user_id, updated_at) indexes for delta sync
+
+Revision ID: d7b3f0a9e215
+Revises: a4d8e1f3c6b2
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7b3f0a9e215'
+down_revision: Union[str, Sequence[str], None] = 'a4d8e1f3c6b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index, table, columns); the primary key breaks updated_at ties for keyset seeks
+INDEXES = [
+    ('ix_transactions_user_id_updated_at', 'transactions',
+     ['user_id', 'updated_at', 'transaction_id']),
+    ('ix_wallets_user_id_updated_at', 'wallets',
+     ['user_id', 'updated_at', 'wallet_id']),
+    ('ix_categories_user_id_updated_at', 'categories',
+     ['user_id', 'updated_at', 'category_id']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
@@ -0,0 +1,162 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+from app.core.metrics import CACHE_LOOKUPS
+from app.core.settings import settings
+
+
+class TTLCache:
+    """
+    Bounded in-process LRU cache whose entries expire after `ttl` seconds.
+
+    Safe to share between the event loop and threadpool workers. Hit and miss
+    counters are kept so the cache can be sized from real traffic; a named
+    cache also reports them as `cache_lookups_total{cache=name}`.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, name: Optional[str] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._hit_counter = CACHE_LOOKUPS.labels(name, "hit") if name else None
+        self._miss_counter = CACHE_LOOKUPS.labels(name, "miss") if name else None
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None or item[0] < time.monotonic():
+                if item is not None:
+                    del self._data[key]
+                self.misses += 1
+                hit = False
+            else:
+                self._data.move_to_end(key)
+                self.hits += 1
+                hit = True
+        counter = self._hit_counter if hit else self._miss_counter
+        if counter is not None:
+            counter.inc()
+        return item[1] if hit else default
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> Any:
+        with self._lock:
+            item = self._data.pop(key, None)
+            return item[1] if item else None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class InvalidationBus:
+    """
+    Fan-out of cache invalidations, keyed by channel name.
+
+    The in-process bus only reaches listeners of the current worker; use
+    `RedisInvalidationBus` so every uvicorn worker drops its stale entries.
+    """
+
+    def __init__(self):
+        self._listeners: Dict[str, List[Callable[[str], None]]] = {}
+
+    def subscribe(self, channel: str, callback: Callable[[str], None]) -> None:
+        self._listeners.setdefault(channel, []).append(callback)
+
+    def _dispatch(self, channel: str, key: str) -> None:
+        for callback in self._listeners.get(channel, ()):
+            callback(key)
+
+    async def publish(self, channel: str, key: str) -> None:
+        self._dispatch(channel, key)
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+
+class RedisInvalidationBus(InvalidationBus):
+    """Invalidation bus shared by all workers through Redis pub/sub."""
+
+    PREFIX = "xpense:invalidate:"
+
+    def __init__(self, url: str):
+        super().__init__()
+        self._url = url
+        self._redis = None
+        self._pubsub = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise RuntimeError(
+                "CACHE_BACKEND=redis requires the `redis` package") from e
+
+        self._redis = redis.from_url(self._url)
+        self._pubsub = self._redis.pubsub()
+        await self._pubsub.psubscribe(f"{self.PREFIX}*")
+        self._task = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+        if self._pubsub:
+            await self._pubsub.aclose()
+        if self._redis:
+            await self._redis.aclose()
+
+    async def publish(self, channel: str, key: str) -> None:
+        # Evict locally right away; the other workers evict when the message
+        # arrives (this one receives it too, which is harmless)
+        self._dispatch(channel, key)
+        if self._redis is not None:
+            await self._redis.publish(f"{self.PREFIX}{channel}", key)
+
+    async def _listen(self) -> None:
+        async for message in self._pubsub.listen():
+            if message["type"] != "pmessage":
+                continue
+            channel = message["channel"].decode()[len(self.PREFIX):]
+            self._dispatch(channel, message["data"].decode())
+
+
+def _build_invalidation_bus() -> InvalidationBus:
+    if settings.CACHE_BACKEND == "redis" and not settings.CACHE_REDIS_URL:
+        raise EnvironmentError("CACHE_BACKEND=redis requires CACHE_REDIS_URL")
+    # In-process caches still need every worker to hear about writes
+    if settings.CACHE_REDIS_URL:
+        return RedisInvalidationBus(settings.CACHE_REDIS_URL)
+    return InvalidationBus()
+
+
+invalidation_bus = _build_invalidation_bus()
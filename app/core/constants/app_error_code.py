@@ -15,4 +15,5 @@ class AppErrorCode(str, Enum):
 
     # Server / DB
     INVALID_ERROR = "E500"
-    DATABASE_ERROR = "E501"
\ No newline at end of file
+    DATABASE_ERROR = "E501"
+    SERVICE_UNAVAILABLE = "E503"    # overloaded, retry later
\ No newline at end of file
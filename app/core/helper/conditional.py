@@ -0,0 +1,82 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Optional, Tuple
+
+from fastapi import Request, Response, status
+from sqlmodel import func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+# Bump when a representation changes shape, so clients stop reusing old bodies
+ETAG_VERSION = "1"
+
+
+def make_etag(*parts: Any) -> str:
+    """Weak ETag over the values that determine a representation."""
+    digest = hashlib.sha1(
+        "|".join(str(part) for part in (ETAG_VERSION, *parts)).encode()
+    ).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+
+async def collection_version(
+    session: AsyncSession,
+    model,
+    *conditions,
+) -> Tuple[int, Optional[datetime]]:
+    """
+    `(count, max(updated_at))` of the rows matching `conditions`: one
+    aggregate over the (user_id, ...) indexes, no rows loaded. An update moves
+    the max and a soft delete or insert changes the count.
+    """
+    statement = select(func.count(), func.max(model.updated_at)).where(*conditions)
+    count, last_modified = (await session.exec(statement)).one()
+    return count, last_modified
+
+
+def _http_date(value: datetime) -> str:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    """
+    Evaluate If-None-Match (weak comparison) or, only when it is absent,
+    If-Modified-Since.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        opaque = etag.removeprefix("W/")
+        return any(
+            candidate.strip().removeprefix("W/") == opaque
+            for candidate in if_none_match.split(",")
+        )
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if last_modified.tzinfo is None:
+            last_modified = last_modified.replace(tzinfo=timezone.utc)
+        # HTTP dates have one-second resolution
+        return last_modified.replace(microsecond=0) <= since
+    return False
+
+
+def set_validators(response: Response, etag: str, last_modified: Optional[datetime]) -> Response:
+    """Attach ETag/Last-Modified; clients must revalidate before reuse."""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
+    if last_modified is not None:
+        response.headers["Last-Modified"] = _http_date(last_modified)
+    return response
+
+
+def not_modified(etag: str, last_modified: Optional[datetime]) -> Response:
+    return set_validators(
+        Response(status_code=status.HTTP_304_NOT_MODIFIED), etag, last_modified)
@@ -0,0 +1,82 @@
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+from enum import Enum
+from typing import AsyncIterator, Sequence
+
+from app.core.settings import settings
+from app.database import async_read_session
+
+
+class ExportFormat(str, Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.CSV: "text/csv",
+    ExportFormat.NDJSON: "application/x-ndjson",
+}
+
+
+def _format_value(value):
+    if isinstance(value, datetime):
+        # Stored as naive UTC, rendered like the JSON API
+        return value.strftime("%Y-%m-%dT%H:%M:%SZ")
+    return value
+
+
+def _render_csv(columns: Sequence[str], rows) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if columns:
+        writer.writerow(columns)
+    writer.writerows([_format_value(value) for value in row] for row in rows)
+    return buffer.getvalue()
+
+
+def _render_ndjson(columns: Sequence[str], rows) -> str:
+    return "".join(
+        json.dumps(
+            {column: _format_value(value) for column, value in zip(columns, row)},
+            ensure_ascii=False,
+        ) + "\n"
+        for row in rows
+    )
+
+
+async def stream_rows(statement, fmt: ExportFormat, compress: bool = False) -> AsyncIterator[bytes]:
+    """
+    Encode the rows of `statement` as CSV or NDJSON chunks, optionally gzipped.
+
+    Rows are read through a server-side cursor `EXPORT_BATCH_SIZE` at a time,
+    so memory stays flat however many rows match. The generator opens its own
+    session: a `StreamingResponse` body runs after request dependencies (and
+    the session from `get_session`) have been closed.
+    """
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16) if compress else None
+
+    def encode(text: str) -> bytes:
+        data = text.encode("utf-8")
+        return compressor.compress(data) if compressor else data
+
+    async with async_read_session() as session:
+        result = await session.stream(
+            statement.execution_options(yield_per=settings.EXPORT_BATCH_SIZE))
+        columns = list(result.keys())
+
+        if fmt == ExportFormat.CSV:
+            yield encode(_render_csv(columns, ()))
+            render = lambda rows: _render_csv((), rows)
+        else:
+            render = lambda rows: _render_ndjson(columns, rows)
+
+        async for rows in result.partitions():
+            chunk = encode(render(rows))
+            if chunk:
+                yield chunk
+
+    if compressor:
+        yield compressor.flush()
@@ -0,0 +1,49 @@
+from functools import lru_cache
+from typing import Any
+
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
+
+
+class FastJSONResponse(ORJSONResponse):
+    """orjson-rendered response that also passes pre-encoded JSON bytes through."""
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return super().render(content)
+
+
+@lru_cache(maxsize=None)
+def response_adapter(response_type: Any) -> TypeAdapter:
+    """Compiled validator/serializer for a response envelope type, built once."""
+    return TypeAdapter(response_type)
+
+
+def fast_response(
+    response_type: Any,
+    data: Any = None,
+    result_code: int = 200,
+    result_message: str = "Success",
+    **extra: Any,
+) -> FastJSONResponse:
+    """
+    Encode a `response_type` envelope (e.g. `BaseResponse[List[TransactionRead]]`)
+    straight from ORM objects: one validation with `from_attributes`, one
+    serialization to JSON bytes, with the same output as `success_response`.
+
+    Returning a Response makes FastAPI skip its own validation and
+    serialization against `response_model`, which then only documents the
+    route. `extra` carries the other envelope fields (e.g. pagination).
+    """
+    adapter = response_adapter(response_type)
+    envelope = adapter.validate_python(
+        {
+            "result_code": result_code,
+            "result_message": result_message,
+            "data": data,
+            **extra,
+        },
+        from_attributes=True,
+    )
+    return FastJSONResponse(content=adapter.dump_json(envelope), status_code=result_code)
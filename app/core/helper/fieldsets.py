@@ -0,0 +1,137 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from fastapi import status
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.constants.app_error_code import AppErrorCode
+from app.exceptions import AppHTTPException
+from app.models.category import Category
+from app.models.transaction import Transaction
+from app.models.wallet import Wallet
+from app.schemas.category import CategoryRead
+from app.schemas.wallet import AccountRead
+
+# Fields a client can request with `fields=`: TransactionRead's fields plus
+# the foreign keys, which replace the embedded objects in normalized mode
+TRANSACTION_FIELDS = {
+    "transaction_no": Transaction.transaction_no,
+    "amount": Transaction.amount,
+    "currency": Transaction.currency,
+    "note": Transaction.note,
+    "transaction_date": Transaction.transaction_date,
+    "user_id": Transaction.user_id,
+    "wallet_id": Transaction.wallet_id,
+    "category_id": Transaction.category_id,
+    "wallet": Transaction.wallet_id,
+    "category": Transaction.category_id,
+}
+
+DEFAULT_FIELDS = (
+    "transaction_no", "amount", "currency", "note", "transaction_date",
+    "user_id", "wallet", "category",
+)
+
+
+def parse_fields(fields: Optional[str], normalized: bool) -> List[str]:
+    """
+    Validate a comma-separated `fields=` value. Without one, every
+    TransactionRead field is returned. In normalized mode `wallet` and
+    `category` become `wallet_id` and `category_id`.
+    """
+    if fields:
+        names = list(dict.fromkeys(
+            name.strip() for name in fields.split(",") if name.strip()))
+        unknown = [name for name in names if name not in TRANSACTION_FIELDS]
+        if unknown or not names:
+            raise AppHTTPException(
+                result_code=status.HTTP_400_BAD_REQUEST,
+                result_message=(
+                    f"Unknown fields: {', '.join(unknown) or '(none)'}. "
+                    f"Allowed: {', '.join(TRANSACTION_FIELDS)}"
+                ),
+                error_code=AppErrorCode.INVALID_REQUEST,
+            )
+    else:
+        names = list(DEFAULT_FIELDS)
+
+    if normalized:
+        renamed = {"wallet": "wallet_id", "category": "category_id"}
+        names = list(dict.fromkeys(renamed.get(name, name) for name in names))
+    return names
+
+
+def selected_columns(names: Sequence[str]) -> list:
+    """
+    Columns to SELECT for `names`, plus the keyset pagination columns.
+    Everything else is left out of the query.
+    """
+    columns = {Transaction.created_at.key: Transaction.created_at,
+               Transaction.transaction_id.key: Transaction.transaction_id}
+    for name in names:
+        column = TRANSACTION_FIELDS[name]
+        columns[column.key] = column
+    return list(columns.values())
+
+
+def _format_datetime(value: datetime) -> str:
+    # Same rendering as BaseUTCModel; naive values are UTC
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+async def load_related(
+    session: AsyncSession,
+    rows: Sequence[Any],
+    names: Sequence[str],
+    normalized: bool,
+) -> Dict[str, Dict[str, dict]]:
+    """
+    Serialized wallets and categories referenced by `rows`, keyed by id and
+    loaded with one IN query each: for embedding (`wallet`, `category`) or,
+    in normalized mode, for side-loading next to `wallet_id`/`category_id`.
+    """
+    wanted = (
+        ("wallets", "wallet", Wallet, Wallet.wallet_id, AccountRead),
+        ("categories", "category", Category, Category.category_id, CategoryRead),
+    )
+    related: Dict[str, Dict[str, dict]] = {}
+    for key, name, model, id_column, schema in wanted:
+        attribute = id_column.key
+        if name not in names and not (normalized and attribute in names):
+            continue
+        related[key] = {}
+        ids = {getattr(row, attribute) for row in rows} - {None}
+        if ids:
+            objects = (await session.exec(
+                select(model).where(id_column.in_(ids)))).all()
+            related[key] = {
+                getattr(obj, attribute): schema.model_validate(obj).model_dump(mode="json")
+                for obj in objects
+            }
+    return related
+
+
+def serialize_rows(
+    rows: Iterable[Any],
+    names: Sequence[str],
+    related: Dict[str, Dict[str, dict]],
+) -> List[dict]:
+    """Rows as JSON-ready dicts holding exactly the requested fields."""
+    wallets = related.get("wallets", {})
+    categories = related.get("categories", {})
+    items = []
+    for row in rows:
+        item = {}
+        for name in names:
+            if name == "wallet":
+                item[name] = wallets.get(row.wallet_id)
+            elif name == "category":
+                item[name] = categories.get(row.category_id)
+            else:
+                value = getattr(row, TRANSACTION_FIELDS[name].key)
+                item[name] = _format_datetime(value) if isinstance(value, datetime) else value
+        items.append(item)
+    return items
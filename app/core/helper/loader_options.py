@@ -0,0 +1,38 @@
+from sqlalchemy.orm import joinedload, selectinload
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models.transaction import Transaction
+
+# Eager-loading options for every query whose rows are serialized as
+# `TransactionRead`, which nests the wallet and the category. Without them each
+# row lazily issues its own SELECT for both relationships during serialization.
+
+# Pages: one extra `IN (...)` query per relationship, and each wallet/category
+# is fetched once no matter how many rows of the page reference it.
+TRANSACTION_LIST_OPTIONS = (
+    selectinload(Transaction.wallet),
+    selectinload(Transaction.category),
+)
+
+# Single rows: resolve both relationships in the same round trip.
+TRANSACTION_DETAIL_OPTIONS = (
+    joinedload(Transaction.wallet),
+    joinedload(Transaction.category),
+)
+
+
+async def load_transaction_for_read(session: AsyncSession, transaction_id: str) -> Transaction:
+    """
+    (Re)load a transaction with its relationships, e.g. right after a write.
+
+    `populate_existing` overwrites the instance already in the session so
+    server-generated columns and both relationships are current.
+    """
+    statement = (
+        select(Transaction)
+        .where(Transaction.transaction_id == transaction_id)
+        .options(*TRANSACTION_DETAIL_OPTIONS)
+        .execution_options(populate_existing=True)
+    )
+    return (await session.exec(statement)).one()
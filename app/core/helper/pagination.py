@@ -0,0 +1,156 @@
+import base64
+import itertools
+import json
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from fastapi import status
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+from sqlmodel import func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.cache import InvalidationBus, TTLCache, invalidation_bus
+from app.core.constants.app_error_code import AppErrorCode
+from app.core.settings import settings
+from app.exceptions import AppHTTPException
+
+
+class CountStrategy(str, Enum):
+    """How the `total` of a paginated listing is computed."""
+    EXACT = "exact"          # COUNT(*) over the filtered set on every call
+    CACHED = "cached"        # exact count, reused until the user writes again
+    ESTIMATE = "estimate"    # planner row estimate once the set is large
+    NONE = "none"            # skip counting, `total` is null
+
+
+def encode_cursor(created_at: datetime, transaction_id: str) -> str:
+    """Encode a `(created_at, transaction_id)` seek position as an opaque token."""
+    payload = json.dumps(
+        [created_at.isoformat(), transaction_id],
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """Decode a token produced by `encode_cursor`."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, transaction_id = json.loads(
+            base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), str(transaction_id)
+    except (ValueError, TypeError):
+        raise AppHTTPException(
+            result_code=status.HTTP_400_BAD_REQUEST,
+            result_message="Invalid pagination cursor",
+            error_code=AppErrorCode.INVALID_REQUEST,
+        )
+
+
+class CountCache:
+    """
+    Per-user cache of listing totals keyed by filter signature.
+
+    Each user's counts are keyed by a generation token. Invalidation drops
+    the token (in every worker, through the invalidation bus), so the next
+    lookup mints a fresh one and the old entries, now unreachable, age out
+    of the LRU. A token that is evicted or expires is replaced the same
+    way, which is only a miss, never a stale hit. Callers read the
+    generation once, before counting, and store under it: a count that
+    races with a write is then filed under the generation it dropped.
+    """
+
+    CHANNEL = "counts"
+
+    def __init__(self, bus: InvalidationBus, maxsize: int, ttl: float):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl, name="counts")
+        self._generations = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._next_generation = itertools.count()
+        self._bus = bus
+        bus.subscribe(self.CHANNEL, lambda key: self._generations.pop(int(key)))
+
+    def generation(self, user_id: int) -> int:
+        generation = self._generations.get(user_id)
+        if generation is None:
+            generation = next(self._next_generation)
+            self._generations.set(user_id, generation)
+        return generation
+
+    def get(self, user_id: int, generation: int, signature: Hashable) -> Optional[int]:
+        return self._cache.get((user_id, generation, signature))
+
+    def set(self, user_id: int, generation: int, signature: Hashable, total: int) -> None:
+        self._cache.set((user_id, generation, signature), total)
+
+    async def invalidate_user(self, user_id: int) -> None:
+        await self._bus.publish(self.CHANNEL, str(user_id))
+
+    def stats(self) -> Dict[str, float]:
+        return self._cache.stats()
+
+
+count_cache = CountCache(
+    invalidation_bus,
+    maxsize=settings.COUNT_CACHE_MAX_SIZE,
+    ttl=settings.COUNT_CACHE_TTL_SECONDS,
+)
+
+
+class _ExplainJSON(Executable, ClauseElement):
+    """`EXPLAIN (FORMAT JSON)` wrapper that keeps the statement's bound parameters."""
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(_ExplainJSON, "postgresql")
+def _compile_explain_json(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+async def estimate_row_count(session: AsyncSession, statement) -> int:
+    """Return the planner's row estimate for `statement` without executing it."""
+    plan: Any = (await session.exec(_ExplainJSON(statement))).scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def count_rows(
+    session: AsyncSession,
+    statement,
+    strategy: CountStrategy,
+    user_id: int,
+    signature: Hashable,
+) -> Tuple[Optional[int], bool]:
+    """
+    Count the rows matched by `statement` using the given strategy.
+
+    Returns `(total, is_estimate)`; `total` is None for `CountStrategy.NONE`.
+    """
+    if strategy == CountStrategy.NONE:
+        return None, False
+
+    if strategy == CountStrategy.ESTIMATE:
+        # Small sets are cheap to count exactly and estimates are noisy there
+        estimate = await estimate_row_count(session, statement)
+        if estimate >= settings.COUNT_ESTIMATE_THRESHOLD:
+            return estimate, True
+
+    if strategy == CountStrategy.CACHED:
+        # Read before counting: a write that commits meanwhile drops this
+        # generation, so the total stored under it is never served
+        generation = count_cache.generation(user_id)
+        total = count_cache.get(user_id, generation, signature)
+        if total is not None:
+            return total, False
+
+    count_statement = select(func.count()).select_from(statement.subquery())
+    total = (await session.exec(count_statement)).one()
+
+    if strategy == CountStrategy.CACHED:
+        count_cache.set(user_id, generation, signature, total)
+    return total, False
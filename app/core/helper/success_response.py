@@ -18,9 +18,12 @@ def success_response(
 
 def paginated_success_response(
         data: Optional[Union[T, List[T]]] = None,
-        total: int = 0,
+        total: Optional[int] = 0,
+        total_is_estimate: bool = False,
         skip: int = 0,
         limit: int = 0,
+        cursor: Optional[str] = None,
+        next_cursor: Optional[str] = None,
         result_code: int = 200,
         result_message: str = "Success",
 ) -> PaginatedResponse[Union[T, List[T]]]:
@@ -29,6 +32,9 @@ def paginated_success_response(
         result_message=result_message,
         data=data,
         total=total,
+        total_is_estimate=total_is_estimate,
         skip=skip, # control pagination (offset)
         limit=limit, # control pagination
+        cursor=cursor, # control pagination (keyset)
+        next_cursor=next_cursor,
     )
@@ -0,0 +1,205 @@
+from datetime import date, timedelta
+from enum import Enum
+from typing import Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from fastapi import status
+from sqlalchemy import Date, DateTime, Numeric, cast, func, literal
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.constants.app_error_code import AppErrorCode
+from app.core.helper.timezones import local_range_to_utc
+from app.core.settings import settings
+from app.exceptions import AppHTTPException
+from app.models.daily_spending import DailySpending
+from app.models.transaction import Transaction
+
+
+class TimeBucket(str, Enum):
+    """Width of a spending time-series bucket. Weeks start on Monday."""
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+
+
+def resolve_timezone(name: Optional[str]) -> ZoneInfo:
+    """IANA timezone by name, defaulting to the app timezone."""
+    try:
+        return ZoneInfo(name or settings.DEFAULT_TIMEZONE)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise AppHTTPException(
+            result_code=status.HTTP_400_BAD_REQUEST,
+            result_message=f"Unknown timezone: {name}",
+            error_code=AppErrorCode.INVALID_REQUEST,
+        )
+
+
+def bucket_start(day: date, bucket: TimeBucket) -> date:
+    """First local day of the bucket containing `day`."""
+    if bucket == TimeBucket.WEEK:
+        return day - timedelta(days=day.weekday())
+    if bucket == TimeBucket.MONTH:
+        return day.replace(day=1)
+    return day
+
+
+def next_bucket_start(start: date, bucket: TimeBucket) -> date:
+    if bucket == TimeBucket.WEEK:
+        return start + timedelta(days=7)
+    if bucket == TimeBucket.MONTH:
+        return (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return start + timedelta(days=1)
+
+
+def bucket_bounds(from_date: date, to_date: date, bucket: TimeBucket) -> Tuple[date, date]:
+    """Widen `from_date`..`to_date` (inclusive) to whole buckets."""
+    first = bucket_start(from_date, bucket)
+    last = next_bucket_start(bucket_start(to_date, bucket), bucket) - timedelta(days=1)
+    return first, last
+
+
+def bucket_count(first: date, last: date, bucket: TimeBucket) -> int:
+    """Number of buckets in `first`..`last`, already widened to whole buckets."""
+    if bucket == TimeBucket.MONTH:
+        return (last.year - first.year) * 12 + last.month - first.month + 1
+    days = (last - first).days + 1
+    return days // 7 if bucket == TimeBucket.WEEK else days
+
+
+def checked_bucket_bounds(
+    from_date: date, to_date: date, bucket: TimeBucket, zone: ZoneInfo,
+) -> Tuple[date, date]:
+    """
+    `bucket_bounds`, rejecting with a 400 any range of more than
+    TIMESERIES_MAX_BUCKETS buckets or one that cannot be expressed in UTC
+    (dates at the very ends of the calendar).
+    """
+    try:
+        first, last = bucket_bounds(from_date, to_date, bucket)
+        local_range_to_utc(first, last, zone)
+    except OverflowError:
+        raise AppHTTPException(
+            result_code=status.HTTP_400_BAD_REQUEST,
+            result_message="Date range is out of bounds",
+            error_code=AppErrorCode.INVALID_REQUEST,
+        )
+    if bucket_count(first, last, bucket) > settings.TIMESERIES_MAX_BUCKETS:
+        raise AppHTTPException(
+            result_code=status.HTTP_400_BAD_REQUEST,
+            result_message=f"Date range must span at most {settings.TIMESERIES_MAX_BUCKETS} buckets",
+            error_code=AppErrorCode.INVALID_REQUEST,
+        )
+    return first, last
+
+
+async def spending_timeseries(
+    session: AsyncSession,
+    user_id: int,
+    bucket: TimeBucket,
+    from_date: date,
+    to_date: date,
+    zone: ZoneInfo,
+    currency: Optional[str] = None,
+    wallet_id: Optional[str] = None,
+    category_id: Optional[str] = None,
+) -> List[Dict]:
+    """
+    Spending totals per bucket of local time in `zone`, oldest first.
+
+    The range is widened to whole buckets and empty buckets are returned with
+    zero totals; ranges of more than TIMESERIES_MAX_BUCKETS buckets are
+    rejected. Bucketing happens in SQL, in a single grouped query: on the
+    daily rollups when `zone` is the app timezone, otherwise on transactions
+    restricted by a half-open UTC range so the (user_id, transaction_date)
+    index is used.
+    """
+
+    first, last = checked_bucket_bounds(from_date, to_date, bucket, zone)
+
+    if zone.key == settings.DEFAULT_TIMEZONE:
+        if bucket == TimeBucket.DAY:
+            bucket_column = DailySpending.local_date
+        else:
+            bucket_column = cast(
+                func.date_trunc(bucket.value, cast(DailySpending.local_date, DateTime)), Date)
+        rows = (
+            select(
+                bucket_column.label("bucket_start"),
+                DailySpending.currency.label("currency"),
+                DailySpending.total_amount.label("amount"),
+                DailySpending.transaction_count.label("transaction_count"),
+            )
+            .where(
+                DailySpending.user_id == user_id,
+                DailySpending.local_date >= first,
+                DailySpending.local_date <= last,
+            )
+        )
+        if currency:
+            rows = rows.where(DailySpending.currency == currency.upper())
+        if wallet_id:
+            rows = rows.where(DailySpending.wallet_id == wallet_id)
+        if category_id:
+            rows = rows.where(DailySpending.category_id == category_id)
+    else:
+        start_utc, end_utc = local_range_to_utc(first, last, zone)
+        local_time = func.timezone(
+            zone.key, func.timezone("UTC", Transaction.transaction_date))
+        rows = (
+            select(
+                cast(func.date_trunc(bucket.value, local_time), Date).label("bucket_start"),
+                func.upper(Transaction.currency).label("currency"),
+                cast(Transaction.amount, Numeric).label("amount"),
+                literal(1).label("transaction_count"),
+            )
+            .where(
+                Transaction.user_id == user_id,
+                Transaction.is_active == True,
+                Transaction.transaction_date >= start_utc,
+                Transaction.transaction_date < end_utc,
+            )
+        )
+        if currency:
+            rows = rows.where(func.upper(Transaction.currency) == currency.upper())
+        if wallet_id:
+            rows = rows.where(Transaction.wallet_id == wallet_id)
+        if category_id:
+            rows = rows.where(Transaction.category_id == category_id)
+
+    # Grouped outside so the bucket expression (and its bound parameters)
+    # is written once
+    rows = rows.subquery("bucketed")
+    statement = (
+        select(
+            rows.c.bucket_start,
+            rows.c.currency,
+            func.sum(rows.c.amount),
+            func.sum(rows.c.transaction_count),
+        )
+        .group_by(rows.c.bucket_start, rows.c.currency)
+    )
+    results = (await session.exec(statement)).all()
+
+    points: Dict[date, Dict] = {}
+    start = first
+    while start <= last:
+        points[start] = {
+            "bucket_start": start,
+            "total_in_usd": 0.0,
+            "total_in_khr": 0.0,
+            "transaction_count": 0,
+        }
+        start = next_bucket_start(start, bucket)
+
+    for start, row_currency, total, count in results:
+        point = points.get(start)
+        if point is None:
+            continue
+        if row_currency == "USD":
+            point["total_in_usd"] += float(total or 0)
+        elif row_currency == "KHR":
+            point["total_in_khr"] += float(total or 0)
+        point["transaction_count"] += int(count or 0)
+
+    return list(points.values())
@@ -1,4 +1,6 @@
-from datetime import datetime, timezone, timedelta
+from datetime import date, datetime, time, timezone, timedelta
+from typing import Tuple
+from zoneinfo import ZoneInfo
 
 UTC_PLUS_7 = timezone(timedelta(hours=7))
 
@@ -6,3 +8,40 @@ UTC_PLUS_7 = timezone(timedelta(hours=7))
 def get_now_utc_plus_7() -> datetime:
     """Returns current datetime in UTC+7 without timezone info"""
     return datetime.now() + timedelta(hours=7)
+
+
+def to_naive_utc(value: datetime | None) -> datetime | None:
+    """
+    Convert an aware datetime to naive UTC.
+
+    `transactions.transaction_date` is a `timestamp without time zone` holding
+    UTC, and asyncpg refuses to bind aware datetimes to such columns.
+    """
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def local_today(zone: ZoneInfo) -> date:
+    """Current date in `zone`."""
+    return datetime.now(zone).date()
+
+
+def local_date_start_utc(day: date, zone: ZoneInfo) -> datetime:
+    """Naive-UTC instant at which local `day` begins in `zone`."""
+    return to_naive_utc(datetime.combine(day, time.min, tzinfo=zone))
+
+
+def local_range_to_utc(from_date: date, to_date: date, zone: ZoneInfo) -> Tuple[datetime, datetime]:
+    """
+    Half-open naive-UTC range `[start, end)` covering local days
+    `from_date`..`to_date` (inclusive) in `zone`.
+
+    Compare the raw column against the bounds (`col >= start AND col < end`)
+    so the predicate stays sargable; wrapping the column in `date()` or a
+    timezone conversion would prevent index use.
+    """
+    return (
+        local_date_start_utc(from_date, zone),
+        local_date_start_utc(to_date + timedelta(days=1), zone),
+    )
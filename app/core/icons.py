@@ -0,0 +1,186 @@
+"""
+Category icon manifest: the icons in ICON_DIR read once, content-hashed and
+precompressed, so requests never touch the filesystem.
+
+Every icon is reachable at its plain URL (`/static/icons/book.svg`, the form
+stored in `Category.icon_url`) and at a content-hashed URL
+(`/static/icons/book.1a2b3c4d5e6f.svg`) that can be cached forever. The
+manifest is rebuilt when the directory's mtime changes, i.e. when an icon is
+added, removed or replaced by a rename (as deploys do).
+"""
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+import threading
+from typing import Dict, List, NamedTuple, Optional
+
+from fastapi import Request, Response, status
+
+from app.core.helper.conditional import is_not_modified, make_etag
+from app.core.settings import settings
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+ICON_DIR = "app/static/icons"
+ICON_BASE_URL = "/static/icons"
+ICON_EXTENSIONS = (".svg", ".png", ".jpg", ".jpeg", ".ico")
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Representations are only kept when they save at least this much
+_MIN_SAVING = 0.9
+
+_SVG = re.compile(r"<svg\b([^>]*)>(.*)</svg>", re.DOTALL | re.IGNORECASE)
+_VIEW_BOX = re.compile(r'viewBox="([^"]*)"', re.IGNORECASE)
+
+
+class IconAsset(NamedTuple):
+    name: str
+    media_type: str
+    digest: str
+    # Content-Encoding ("identity", "br", "gzip") -> body
+    bodies: Dict[str, bytes]
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.digest}"'
+
+
+def _build_asset(name: str, content: bytes, media_type: str) -> IconAsset:
+    bodies = {"identity": content}
+    candidates = {"gzip": gzip.compress(content, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        candidates["br"] = brotli.compress(content, quality=11)
+    for encoding, body in candidates.items():
+        if len(body) < len(content) * _MIN_SAVING:
+            bodies[encoding] = body
+    return IconAsset(
+        name=name,
+        media_type=media_type,
+        digest=hashlib.sha256(content).hexdigest()[:12],
+        bodies=bodies,
+    )
+
+
+def hashed_name(asset: IconAsset) -> str:
+    stem, extension = os.path.splitext(asset.name)
+    return f"{stem}.{asset.digest}{extension}"
+
+
+def _build_sprite(icons: List[IconAsset]) -> bytes:
+    """One SVG holding every SVG icon as a `<symbol id="{stem}">`."""
+    symbols = []
+    for icon in icons:
+        if icon.media_type != "image/svg+xml":
+            continue
+        match = _SVG.search(icon.bodies["identity"].decode("utf-8"))
+        if match is None:
+            continue
+        attributes, inner = match.groups()
+        view_box = _VIEW_BOX.search(attributes)
+        view_box_attribute = f' viewBox="{view_box.group(1)}"' if view_box else ""
+        stem = os.path.splitext(icon.name)[0]
+        symbols.append(f'<symbol id="{stem}"{view_box_attribute}>{inner}</symbol>')
+    return (
+        '<svg xmlns="http://www.w3.org/2000/svg" style="display:none">'
+        + "".join(symbols) + "</svg>"
+    ).encode("utf-8")
+
+
+class IconManifest:
+    """The icons of `directory`, reloaded when the directory changes."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.icons: Dict[str, IconAsset] = {}
+        self.sprite: Optional[IconAsset] = None
+        self.version = ""
+        self._by_hashed_name: Dict[str, IconAsset] = {}
+        self._mtime_ns: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def load(self) -> None:
+        with self._lock:
+            mtime_ns = os.stat(self.directory).st_mtime_ns
+            icons = {}
+            for entry in sorted(os.scandir(self.directory), key=lambda e: e.name):
+                if entry.is_file() and entry.name.lower().endswith(ICON_EXTENSIONS):
+                    with open(entry.path, "rb") as file:
+                        content = file.read()
+                    media_type = mimetypes.guess_type(entry.name)[0] or "application/octet-stream"
+                    icons[entry.name] = _build_asset(entry.name, content, media_type)
+
+            self.icons = icons
+            self._by_hashed_name = {hashed_name(icon): icon for icon in icons.values()}
+            self.sprite = _build_asset(
+                "sprite.svg", _build_sprite(list(icons.values())), "image/svg+xml")
+            self.version = make_etag(*(icon.digest for icon in icons.values()))
+            self._mtime_ns = mtime_ns
+
+    def refresh(self) -> None:
+        """Reload if the directory changed since the last load (one stat)."""
+        if os.stat(self.directory).st_mtime_ns != self._mtime_ns:
+            self.load()
+
+    def find(self, filename: str) -> Optional[IconAsset]:
+        """Resolve a plain or hashed file name."""
+        self.refresh()
+        return self.icons.get(filename) or self._by_hashed_name.get(filename)
+
+    def urls(self) -> List[str]:
+        self.refresh()
+        return [f"{ICON_BASE_URL}/{name}" for name in self.icons]
+
+
+icon_manifest = IconManifest(ICON_DIR)
+
+
+def _accepted_encodings(request: Request) -> Dict[str, float]:
+    accepted = {}
+    for part in request.headers.get("accept-encoding", "").split(","):
+        coding, _, params = part.strip().partition(";")
+        if not coding:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip().lower()] = quality
+    return accepted
+
+
+def asset_response(request: Request, asset: IconAsset, immutable: bool) -> Response:
+    """
+    Serve `asset` in the best encoding the client accepts. Hashed URLs are
+    cacheable forever; plain URLs for ICON_CACHE_MAX_AGE_SECONDS, then
+    revalidated with the ETag.
+    """
+    headers = {
+        "ETag": asset.etag,
+        "Vary": "Accept-Encoding",
+        "Cache-Control": (
+            IMMUTABLE_CACHE_CONTROL if immutable
+            else f"public, max-age={settings.ICON_CACHE_MAX_AGE_SECONDS}"
+        ),
+    }
+    if is_not_modified(request, asset.etag, None):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    accepted = _accepted_encodings(request)
+    encoding = "identity"
+    for candidate in ("br", "gzip"):
+        if candidate in asset.bodies and accepted.get(candidate, accepted.get("*", 0)) > 0:
+            encoding = candidate
+            break
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(
+        content=asset.bodies[encoding], media_type=asset.media_type, headers=headers)
@@ -0,0 +1,153 @@
+"""
+Per-request SQL instrumentation.
+
+Engine event hooks time every statement and add it to the QueryStats of the
+current request (a ContextVar set by QueryTimingMiddleware). Each response
+gets a `Server-Timing` header with the statement count, total DB time and
+the slowest statement. Statements slower than SLOW_QUERY_MS, and requests
+spending more than SLOW_REQUEST_DB_MS in the database, are logged as JSON
+with normalized SQL so that similar queries group together.
+"""
+import json
+import logging
+import re
+import time
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.settings import settings
+
+logger = logging.getLogger("app.sql")
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w$])-?\d+(?:\.\d+)?(?![\w])")
+_PARAMETER = re.compile(r"\$\d+|%\([^)]+\)s|%s|\?")
+_IN_LIST = re.compile(r"\((?:\s*\?\s*,)+\s*\?\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=1024)
+def normalize_sql(statement: str) -> str:
+    """
+    Fingerprint of a statement: literals and bind parameters become `?`,
+    IN lists collapse to `(?...)` and whitespace is squeezed.
+    """
+    sql = _STRING.sub("?", statement)
+    sql = _PARAMETER.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _IN_LIST.sub("(?...)", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+class QueryStats:
+    """Statements executed on behalf of one request."""
+
+    __slots__ = ("scope", "count", "total_ms", "slowest_ms", "slowest_sql")
+
+    def __init__(self, scope: Optional[dict] = None):
+        self.scope = scope
+        self.count = 0
+        self.total_ms = 0.0
+        self.slowest_ms = 0.0
+        self.slowest_sql: Optional[str] = None
+
+    def record(self, statement: str, elapsed_ms: float) -> None:
+        self.count += 1
+        self.total_ms += elapsed_ms
+        if elapsed_ms > self.slowest_ms:
+            self.slowest_ms = elapsed_ms
+            self.slowest_sql = statement
+
+    @property
+    def path(self) -> Optional[str]:
+        """Route template once routing has run (e.g. /transactions/{id})."""
+        if self.scope is None:
+            return None
+        route = self.scope.get("route")
+        return getattr(route, "path", self.scope.get("path"))
+
+    def server_timing(self) -> str:
+        return (
+            f'db;dur={self.total_ms:.1f};desc="{self.count} queries", '
+            f"db-slowest;dur={self.slowest_ms:.1f}"
+        )
+
+
+current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar(
+    "current_query_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_started_at = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started_at = getattr(context, "_query_started_at", None)
+    if started_at is None:
+        return
+    elapsed_ms = (time.perf_counter() - started_at) * 1000
+
+    stats = current_query_stats.get()
+    if stats is not None:
+        stats.record(statement, elapsed_ms)
+
+    if elapsed_ms >= settings.SLOW_QUERY_MS:
+        logger.warning(json.dumps({
+            "event": "slow_query",
+            "path": stats.path if stats is not None else None,
+            "duration_ms": round(elapsed_ms, 1),
+            "sql": normalize_sql(statement),
+            "executemany": executemany,
+        }))
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Time every statement of `engine` (the sync engine behind an async one)."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class QueryTimingMiddleware:
+    """
+    ASGI middleware collecting QueryStats per HTTP request. Statements run
+    after the response has started (streamed bodies) are not in the header.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats(scope)
+        token = current_query_stats.set(stats)
+        started_at = time.perf_counter()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start" and stats.count:
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", stats.server_timing().encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_query_stats.reset(token)
+            if stats.count and stats.total_ms >= settings.SLOW_REQUEST_DB_MS:
+                logger.warning(json.dumps({
+                    "event": "slow_request_db",
+                    "method": scope["method"],
+                    "path": stats.path,
+                    "queries": stats.count,
+                    "db_ms": round(stats.total_ms, 1),
+                    "duration_ms": round((time.perf_counter() - started_at) * 1000, 1),
+                    "slowest_ms": round(stats.slowest_ms, 1),
+                    "slowest_sql": normalize_sql(stats.slowest_sql or ""),
+                }))
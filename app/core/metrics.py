@@ -0,0 +1,175 @@
+"""
+Prometheus metrics.
+
+Metrics are updated where things happen (requests, AppHTTPExceptions, pool
+checkouts, password hashing, cache lookups), never computed at scrape time, so that with
+several uvicorn workers `prometheus_client`'s multiprocess mode can sum
+every worker's values: set PROMETHEUS_MULTIPROC_DIR to an empty directory
+shared by the workers (and wiped on deploy).
+"""
+import os
+import time
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    REGISTRY,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+UNMATCHED_ROUTE = "unmatched"
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests by route template and status code.",
+    ["method", "route", "status"],
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency until the response is complete.",
+    ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+APP_ERRORS = Counter(
+    "app_errors_total",
+    "AppHTTPExceptions raised, by route and error code.",
+    ["route", "error_code", "status"],
+)
+
+DB_POOL_SIZE = Gauge(
+    "db_pool_size", "Configured connection pool size.",
+    multiprocess_mode="livesum",
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out", "Connections currently checked out of the pool.",
+    multiprocess_mode="livesum",
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow", "Connections open beyond the pool size.",
+    multiprocess_mode="livesum",
+)
+DB_POOL_WAIT = Histogram(
+    "db_pool_wait_seconds",
+    "Time to get a connection from the pool, including opening one.",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30),
+)
+
+PASSWORD_HASH_DURATION = Histogram(
+    "password_hash_duration_seconds",
+    "bcrypt hash or verify time on the hashing pool.",
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+PASSWORD_HASH_QUEUE_WAIT = Histogram(
+    "password_hash_queue_wait_seconds",
+    "Time a hashing job waited for a free pool thread.",
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+PASSWORD_HASH_PENDING = Gauge(
+    "password_hash_pending", "Hashing jobs queued or running.",
+    multiprocess_mode="livesum",
+)
+PASSWORD_HASH_REJECTED = Counter(
+    "password_hash_rejected_total",
+    "Hashing jobs refused with 503 because the queue was full.",
+)
+
+CACHE_LOOKUPS = Counter(
+    "cache_lookups_total",
+    "Cache lookups by cache and result (hit or miss).",
+    ["cache", "result"],
+)
+RESPONSE_CACHE_LOOKUPS = Counter(
+    "response_cache_lookups_total",
+    "Response cache lookups by endpoint and result (hit or miss).",
+    ["endpoint", "result"],
+)
+
+
+def route_of(scope) -> str:
+    """Route template (`/transactions/{id}`) so label values stay bounded."""
+    route = scope.get("route")
+    return getattr(route, "path", UNMATCHED_ROUTE)
+
+
+class MetricsMiddleware:
+    """ASGI middleware counting requests and timing them per route."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started_at = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = route_of(scope)
+            HTTP_REQUESTS.labels(scope["method"], route, str(status_code)).inc()
+            HTTP_REQUEST_DURATION.labels(scope["method"], route).observe(
+                time.perf_counter() - started_at)
+
+
+def record_app_error(scope, status_code: int, error_code: str) -> None:
+    # AppErrorCode members render as their value, like in the response body
+    error_code = getattr(error_code, "value", error_code)
+    APP_ERRORS.labels(route_of(scope), error_code or "", str(status_code)).inc()
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """The default asyncio pool, timing how long each checkout waits."""
+
+    def _do_get(self):
+        started_at = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_WAIT.observe(time.perf_counter() - started_at)
+
+
+def instrument_pool(engine) -> None:
+    """Keep the pool gauges of `engine` (a sync Engine) current."""
+    if not hasattr(engine.pool, "checkedout"):
+        return  # NullPool: nothing is pooled
+    DB_POOL_SIZE.set(engine.pool.size())
+
+    def update(*args) -> None:
+        # engine.pool is replaced by dispose(), so look it up each time
+        pool = engine.pool
+        DB_POOL_CHECKED_OUT.set(pool.checkedout())
+        DB_POOL_OVERFLOW.set(max(pool.overflow(), 0))
+
+    event.listen(engine, "checkout", update)
+    event.listen(engine, "checkin", update)
+
+
+def render_metrics():
+    """Exposition text and content type, summed over workers when multiprocess."""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead() -> None:
+    """Drop this worker's live gauges from the multiprocess aggregate."""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        multiprocess.mark_process_dead(os.getpid())
@@ -0,0 +1,130 @@
+"""
+Connection pooling profiles for the application engine.
+
+- direct: a QueuePool of DB_POOL_SIZE connections (plus DB_MAX_OVERFLOW)
+  talking straight to Postgres. There is no ping per checkout: a background
+  task probes the pool every DB_POOL_LIVENESS_SECONDS, and a probe that hits
+  a dead connection invalidates the whole pool, so a restart or failover is
+  noticed without adding a round trip to every request. DB_POOL_RECYCLE_SECONDS
+  retires connections before servers or NATs drop them as idle.
+- pooler: behind a transaction-mode pooler (PgBouncer, Supabase's pooler),
+  which does the real pooling. A small client pool avoids a TLS handshake per
+  request; DB_POOL_SIZE=0 uses NullPool instead. Prepared statements are
+  disabled because consecutive statements may reach different server
+  connections.
+- test: NullPool and no background task, so tests and scripts never share
+  connections between event loops.
+
+The profile defaults to "pooler" when SUPABASE_USE_POOLER is set and
+"direct" otherwise. Every sizing setting left unset takes the profile's
+value from POOL_PROFILES.
+"""
+import asyncio
+import logging
+from typing import Any, Callable, Dict, NamedTuple, Optional
+from uuid import uuid4
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import NullPool
+
+from app.core.metrics import InstrumentedAsyncQueuePool
+from app.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class PoolProfile(NamedTuple):
+    pool_size: int
+    max_overflow: int
+    # Seconds between background liveness probes; 0 disables them
+    liveness_seconds: int
+    prepared_statements: bool
+
+
+POOL_PROFILES: Dict[str, PoolProfile] = {
+    "direct": PoolProfile(
+        pool_size=5, max_overflow=10, liveness_seconds=30, prepared_statements=True),
+    "pooler": PoolProfile(
+        pool_size=3, max_overflow=2, liveness_seconds=0, prepared_statements=False),
+    "test": PoolProfile(
+        pool_size=0, max_overflow=0, liveness_seconds=0, prepared_statements=True),
+}
+
+
+def pool_profile_name() -> str:
+    if settings.DB_POOL_PROFILE:
+        return settings.DB_POOL_PROFILE
+    return "pooler" if settings.SUPABASE_USE_POOLER else "direct"
+
+
+def resolve_pool_profile() -> PoolProfile:
+    """The selected profile with the DB_POOL_* overrides applied."""
+    profile = POOL_PROFILES[pool_profile_name()]
+    overrides = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "liveness_seconds": settings.DB_POOL_LIVENESS_SECONDS,
+    }
+    return profile._replace(
+        **{key: value for key, value in overrides.items() if value is not None})
+
+
+def engine_options(connect_args: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Keyword arguments for `create_async_engine` under the selected profile."""
+    profile = resolve_pool_profile()
+    connect_args = dict(connect_args or {})
+
+    if not profile.prepared_statements:
+        connect_args.update(
+            # asyncpg's own statement cache and SQLAlchemy's
+            statement_cache_size=0,
+            prepared_statement_cache_size=0,
+            # Unnamed statements are still prepared; unique names keep them
+            # from colliding on a server connection shared with other clients
+            prepared_statement_name_func=lambda: f"__asyncpg_{uuid4()}__",
+        )
+
+    options: Dict[str, Any] = {
+        "echo": settings.DB_ECHO,
+        "connect_args": connect_args,
+    }
+    if profile.pool_size > 0:
+        options.update(
+            poolclass=InstrumentedAsyncQueuePool,
+            pool_size=profile.pool_size,
+            max_overflow=profile.max_overflow,
+            pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+            pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+            pool_pre_ping=False,
+        )
+    else:
+        options["poolclass"] = NullPool
+    return options
+
+
+class PoolLivenessCheck:
+    """Periodically runs `SELECT 1` on a pooled connection of `get_engine()`."""
+
+    def __init__(self, get_engine: Callable[[], AsyncEngine], interval: float):
+        self._get_engine = get_engine
+        self._interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        if self._interval > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self._interval)
+            try:
+                async with self._get_engine().connect() as connection:
+                    await connection.execute(text("SELECT 1"))
+            except Exception:
+                # A disconnect error has already invalidated the pool
+                logger.warning("Database liveness check failed", exc_info=True)
@@ -0,0 +1,112 @@
+"""
+Read-replica routing.
+
+Sessions from `get_read_session` go to the replica unless:
+- no replica is configured (DATABASE_READ_URL),
+- the replica's last probe failed or showed more than REPLICA_MAX_LAG_SECONDS
+  of replay lag, or
+- the current user committed a write within READ_YOUR_WRITES_SECONDS, so they
+  would not see their own change on a lagging replica.
+
+Otherwise they fall back to the primary. Writes are announced on the
+invalidation bus, so stickiness holds across workers when it runs on Redis.
+"""
+import asyncio
+import logging
+from contextvars import ContextVar
+from typing import Callable, Optional, Set
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Session
+
+from app.core.cache import InvalidationBus, TTLCache
+from app.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Set by get_current_user; read when a session picks its engine and when a
+# primary session commits
+current_user_id: ContextVar[Optional[int]] = ContextVar("current_user_id", default=None)
+
+# Replay lag in seconds; 0 when everything received has been replayed (an
+# idle primary does not look like lag) or when not in recovery at all
+_LAG_QUERY = text(
+    "SELECT CASE"
+    " WHEN NOT pg_is_in_recovery()"
+    "  OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0"
+    " ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)"
+    " END"
+)
+
+
+class ReplicaRouter:
+    """Decides per read session whether the replica may serve it."""
+
+    CHANNEL = "writes"
+
+    def __init__(
+        self,
+        bus: InvalidationBus,
+        get_replica: Optional[Callable[[], AsyncEngine]],
+    ):
+        # The replica engine is built by start(), not at import
+        self._get_replica = get_replica
+        self.replica: Optional[AsyncEngine] = None
+        self.lag_seconds: Optional[float] = None  # None: unknown or unreachable
+        self._bus = bus
+        self._recent_writers = TTLCache(
+            maxsize=settings.USER_CACHE_MAX_SIZE, ttl=settings.READ_YOUR_WRITES_SECONDS)
+        self._task: Optional[asyncio.Task] = None
+        self._pending: Set[asyncio.Task] = set()
+        bus.subscribe(self.CHANNEL, lambda key: self._recent_writers.set(int(key), True))
+
+    def use_replica(self, user_id: Optional[int]) -> bool:
+        if self.replica is None or self.lag_seconds is None:
+            return False
+        if self.lag_seconds > settings.REPLICA_MAX_LAG_SECONDS:
+            return False
+        return user_id is None or self._recent_writers.get(user_id) is None
+
+    def record_write(self, user_id: int) -> None:
+        """Pin `user_id` to the primary for READ_YOUR_WRITES_SECONDS."""
+        self._recent_writers.set(user_id, True)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # no event loop (scripts): nothing else to notify
+        task = loop.create_task(self._bus.publish(self.CHANNEL, str(user_id)))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    def track_writes(self) -> None:
+        """Pin the current user after every commit of a primary session."""
+        def _record_write(session: Session) -> None:
+            user_id = current_user_id.get()
+            if user_id is not None and not session.info.get("read_only"):
+                self.record_write(user_id)
+
+        event.listen(Session, "after_commit", _record_write)
+
+    async def start(self) -> None:
+        if self._get_replica is not None:
+            self.replica = self._get_replica()
+            await self._probe()
+            self._task = asyncio.create_task(self._monitor())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+
+    async def _probe(self) -> None:
+        try:
+            async with self.replica.connect() as connection:
+                self.lag_seconds = float((await connection.execute(_LAG_QUERY)).scalar_one())
+        except Exception:
+            logger.warning("Replica lag check failed", exc_info=True)
+            self.lag_seconds = None
+
+    async def _monitor(self) -> None:
+        while True:
+            await asyncio.sleep(settings.REPLICA_LAG_CHECK_SECONDS)
+            await self._probe()
@@ -0,0 +1,287 @@
+"""
+Per-user cache of encoded responses for read endpoints.
+
+An entry is keyed by endpoint, user id, the request's normalized query
+parameters and the user's current version of every tag (entity type) the
+endpoint reads. Writes bump the user's tag versions (in every worker), which
+makes the entries built from the old data unreachable; they then age out of
+the LRU (or expire in Redis). Versions are read before the handler runs, so an entry computed
+while a write commits is stored under the old version and never served.
+"""
+import functools
+import hashlib
+import itertools
+import json
+import logging
+import time
+from collections import defaultdict
+from datetime import date, datetime
+from email.utils import parsedate_to_datetime
+from enum import Enum
+from typing import Any, Callable, Dict, Iterable, Optional, Sequence, Tuple
+
+from fastapi import Request, Response, status
+
+from app.core.cache import InvalidationBus, TTLCache, invalidation_bus
+from app.core.helper.conditional import is_not_modified
+from app.core.helper.fast_response import FastJSONResponse
+from app.core.metrics import RESPONSE_CACHE_LOOKUPS
+from app.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Response headers stored with the body and restored on a hit
+CACHED_HEADERS = ("etag", "last-modified", "cache-control")
+
+# Handler arguments that are not query parameters
+NON_KEY_PARAMS = {"session", "current_user", "request", "response"}
+
+Entry = Tuple[Dict[str, str], bytes]
+
+
+class MemoryCacheBackend:
+    """
+    In-process LRU store; entries are private to the worker. Tag versions
+    are tokens in a bounded TTL/LRU cache: a bump drops the token in every
+    worker, through the invalidation bus, and the next lookup mints one
+    never used before. A token that is evicted or expires is replaced the
+    same way, so losing one is a miss, never a stale hit.
+    """
+
+    CHANNEL = "responses"
+
+    def __init__(self, bus: InvalidationBus, maxsize: int, ttl: float):
+        self._entries = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._versions = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._next_version = itertools.count()
+        self._bus = bus
+        bus.subscribe(self.CHANNEL, self._drop_versions)
+
+    def _drop_versions(self, key: str) -> None:
+        user_id, tags = key.split(":", 1)
+        for tag in tags.split(","):
+            self._versions.pop((int(user_id), tag))
+
+    def _version(self, user_id: int, tag: str) -> str:
+        version = self._versions.get((user_id, tag))
+        if version is None:
+            version = str(next(self._next_version))
+            self._versions.set((user_id, tag), version)
+        return version
+
+    async def versions(self, user_id: int, tags: Sequence[str]) -> Tuple[str, ...]:
+        return tuple(self._version(user_id, tag) for tag in tags)
+
+    async def bump(self, user_id: int, tags: Iterable[str]) -> None:
+        await self._bus.publish(self.CHANNEL, f"{user_id}:{','.join(tags)}")
+
+    async def get(self, key: str) -> Optional[Entry]:
+        return self._entries.get(key)
+
+    async def set(self, key: str, entry: Entry) -> None:
+        self._entries.set(key, entry)
+
+    async def close(self) -> None:
+        pass
+
+    def stats(self) -> Dict[str, float]:
+        stats = self._entries.stats()
+        return {"size": stats["size"], "maxsize": stats["maxsize"]}
+
+
+class RedisCacheBackend:
+    """
+    Store shared by every worker. Eviction is Redis's own: run it with a
+    `maxmemory` limit and `maxmemory-policy allkeys-lru`.
+
+    A bump writes a fresh token rather than incrementing, and version keys
+    outlive the entries built under them, so an evicted or expired version
+    can never make an old entry reachable again.
+    """
+
+    PREFIX = "xpense:response:"
+
+    def __init__(self, url: str, ttl: int):
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise RuntimeError(
+                "CACHE_BACKEND=redis requires the `redis` package") from e
+        self._redis = redis.from_url(url)
+        self._ttl = ttl
+
+    def _version_key(self, user_id: int, tag: str) -> str:
+        return f"{self.PREFIX}v:{user_id}:{tag}"
+
+    async def versions(self, user_id: int, tags: Sequence[str]) -> Tuple[str, ...]:
+        values = await self._redis.mget([self._version_key(user_id, tag) for tag in tags])
+        return tuple(value.decode() if value else "0" for value in values)
+
+    async def bump(self, user_id: int, tags: Iterable[str]) -> None:
+        token = str(time.time_ns())
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for tag in tags:
+                pipe.set(self._version_key(user_id, tag), token, ex=self._ttl * 2)
+            await pipe.execute()
+
+    async def get(self, key: str) -> Optional[Entry]:
+        value = await self._redis.get(f"{self.PREFIX}e:{key}")
+        if value is None:
+            return None
+        headers, body = value.split(b"\n", 1)
+        return json.loads(headers), body
+
+    async def set(self, key: str, entry: Entry) -> None:
+        headers, body = entry
+        value = json.dumps(headers).encode() + b"\n" + body
+        await self._redis.set(f"{self.PREFIX}e:{key}", value, ex=self._ttl)
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+    def stats(self) -> Dict[str, float]:
+        return {}
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+class ResponseCache:
+    """
+    Decorator factory caching 200 responses of per-user read endpoints, with
+    hit/miss counters per endpoint (also exported as
+    `response_cache_lookups_total`). Backend failures are treated as misses.
+    """
+
+    def __init__(self, backend, max_entry_bytes: int):
+        self.backend = backend
+        self.max_entry_bytes = max_entry_bytes
+        self._hits: Dict[str, int] = defaultdict(int)
+        self._misses: Dict[str, int] = defaultdict(int)
+
+    def __call__(
+        self,
+        name: str,
+        tags: Sequence[str],
+        vary: Optional[Callable[..., Any]] = None,
+    ):
+        """
+        Cache the decorated endpoint under `name`, invalidated by writes to
+        any of `tags`. `vary(**kwargs)` adds to the key whatever else the
+        answer depends on, such as the current date.
+
+        The endpoint must take `current_user` and return a Response (e.g.
+        from `fast_response`). A cached ETag is honoured without a query.
+        """
+        hit_counter = RESPONSE_CACHE_LOOKUPS.labels(name, "hit")
+        miss_counter = RESPONSE_CACHE_LOOKUPS.labels(name, "miss")
+
+        def decorator(endpoint):
+            @functools.wraps(endpoint)
+            async def wrapper(**kwargs):
+                user_id = kwargs["current_user"].id
+                params = {
+                    key: _normalize(value) for key, value in kwargs.items()
+                    if key not in NON_KEY_PARAMS
+                }
+                if vary is not None:
+                    params["_vary"] = _normalize(vary(**kwargs))
+
+                try:
+                    versions = await self.backend.versions(user_id, tags)
+                    key = self._key(name, user_id, versions, params)
+                    entry = await self.backend.get(key)
+                except Exception:
+                    logger.exception("Response cache lookup failed for %s", name)
+                    key, entry = None, None
+
+                if entry is not None:
+                    self._hits[name] += 1
+                    hit_counter.inc()
+                    return self._cached_response(entry, kwargs.get("request"))
+
+                self._misses[name] += 1
+                miss_counter.inc()
+                response = await endpoint(**kwargs)
+                if key is not None and self._cacheable(response):
+                    headers = {
+                        header: response.headers[header]
+                        for header in CACHED_HEADERS if header in response.headers
+                    }
+                    try:
+                        await self.backend.set(key, (headers, bytes(response.body)))
+                    except Exception:
+                        logger.exception("Response cache store failed for %s", name)
+                return response
+            return wrapper
+        return decorator
+
+    @staticmethod
+    def _key(name: str, user_id: int, versions: Tuple[str, ...], params: Dict[str, Any]) -> str:
+        digest = hashlib.sha1(
+            json.dumps(params, sort_keys=True, default=str).encode()).hexdigest()
+        return f"{name}:{user_id}:{'.'.join(versions)}:{digest}"
+
+    def _cacheable(self, response: Any) -> bool:
+        return (
+            isinstance(response, Response)
+            and response.status_code == status.HTTP_200_OK
+            and len(response.body) <= self.max_entry_bytes
+        )
+
+    @staticmethod
+    def _cached_response(entry: Entry, request: Optional[Request]) -> Response:
+        headers, body = entry
+        etag = headers.get("etag")
+        if request is not None and etag:
+            last_modified = headers.get("last-modified")
+            if is_not_modified(
+                    request, etag,
+                    parsedate_to_datetime(last_modified) if last_modified else None):
+                return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return FastJSONResponse(content=body, headers=headers)
+
+    async def invalidate(self, user_id: int, *tags: str) -> None:
+        """Make every entry of `user_id` that read any of `tags` unreachable."""
+        try:
+            await self.backend.bump(user_id, tags)
+        except Exception:
+            logger.exception("Response cache invalidation failed for user %s", user_id)
+
+    async def close(self) -> None:
+        await self.backend.close()
+
+    def stats(self) -> Dict[str, Any]:
+        endpoints = {}
+        for name in sorted(set(self._hits) | set(self._misses)):
+            hits, misses = self._hits[name], self._misses[name]
+            endpoints[name] = {
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+            }
+        return {**self.backend.stats(), "endpoints": endpoints}
+
+
+def _build_backend():
+    if settings.CACHE_BACKEND == "redis":
+        if not settings.CACHE_REDIS_URL:
+            raise EnvironmentError("CACHE_BACKEND=redis requires CACHE_REDIS_URL")
+        return RedisCacheBackend(
+            settings.CACHE_REDIS_URL, settings.RESPONSE_CACHE_TTL_SECONDS)
+    return MemoryCacheBackend(
+        invalidation_bus,
+        maxsize=settings.RESPONSE_CACHE_MAX_SIZE,
+        ttl=settings.RESPONSE_CACHE_TTL_SECONDS,
+    )
+
+
+response_cache = ResponseCache(
+    _build_backend(),
+    max_entry_bytes=settings.RESPONSE_CACHE_MAX_ENTRY_BYTES,
+)
@@ -0,0 +1,254 @@
+"""
+Maintenance of the `daily_spending` rollup table.
+
+The transaction write paths call `apply_spending_changes` inside their own
+database transaction, so rollups commit (or roll back) with the rows they
+summarize. `backfill` rebuilds rollups from `transactions` and `reconcile`
+reports (and optionally repairs) drift:
+
+    python -m app.core.rollups backfill [--user-id ID]
+    python -m app.core.rollups reconcile [--fix]
+"""
+import argparse
+import asyncio
+from collections import defaultdict
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import Numeric, and_, cast, delete, func, or_, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.settings import settings
+from app.models.daily_spending import DailySpending
+from app.models.transaction import Transaction
+
+ROLLUP_TZ = ZoneInfo(settings.DEFAULT_TIMEZONE)
+
+
+class SpendingKey(NamedTuple):
+    user_id: int
+    local_date: date
+    currency: str
+    wallet_id: str
+    category_id: Optional[str]
+
+
+SpendingEntry = Tuple[SpendingKey, Decimal]
+
+
+def local_date_of(transaction_date: datetime) -> date:
+    """Local day of a naive-UTC `transaction_date`."""
+    if transaction_date.tzinfo is None:
+        transaction_date = transaction_date.replace(tzinfo=timezone.utc)
+    return transaction_date.astimezone(ROLLUP_TZ).date()
+
+
+def spending_of(transaction: Transaction) -> SpendingEntry:
+    """
+    Snapshot the rollup key and amount of a transaction. Take it before
+    mutating the row when the old values have to be removed, from a row
+    loaded FOR UPDATE so a concurrent writer cannot remove them too.
+    """
+    key = SpendingKey(
+        user_id=transaction.user_id,
+        local_date=local_date_of(transaction.transaction_date),
+        currency=transaction.currency.upper(),
+        wallet_id=transaction.wallet_id,
+        category_id=transaction.category_id,
+    )
+    # 15 significant digits, as PostgreSQL renders float8 -> numeric casts
+    return key, Decimal(f"{transaction.amount:.15g}")
+
+
+async def apply_spending_changes(
+    session: AsyncSession,
+    added: Iterable[SpendingEntry] = (),
+    removed: Iterable[SpendingEntry] = (),
+) -> None:
+    """Upsert the net deltas of added/removed transactions in one statement."""
+    deltas: Dict[SpendingKey, List] = defaultdict(lambda: [Decimal(0), 0])
+    for key, amount in added:
+        deltas[key][0] += amount
+        deltas[key][1] += 1
+    for key, amount in removed:
+        deltas[key][0] -= amount
+        deltas[key][1] -= 1
+
+    rows = [
+        {**key._asdict(), "total_amount": amount, "transaction_count": count}
+        # Sorted so concurrent writers lock rollup rows in the same order
+        for key, (amount, count) in sorted(deltas.items(), key=lambda item: str(item[0]))
+        if amount or count
+    ]
+    if not rows:
+        return
+
+    statement = insert(DailySpending).values(rows)
+    statement = statement.on_conflict_do_update(
+        constraint="uq_daily_spending_key",
+        set_={
+            "total_amount": DailySpending.total_amount + statement.excluded.total_amount,
+            "transaction_count": DailySpending.transaction_count + statement.excluded.transaction_count,
+        },
+    )
+    await session.exec(statement)
+
+
+def local_date_sql(transaction_date):
+    """SQL twin of `local_date_of` for a naive-UTC timestamp column."""
+    return func.date(
+        func.timezone(
+            settings.DEFAULT_TIMEZONE,
+            func.timezone("UTC", transaction_date),
+        )
+    )
+
+
+def _rollups_of(source):
+    """
+    Rollup rows aggregated from `source`, a selectable with the user_id,
+    transaction_date, currency, wallet_id, category_id and amount columns
+    of `transactions`.
+    """
+    local_date = local_date_sql(source.c.transaction_date)
+    currency = func.upper(source.c.currency)
+    return (
+        select(
+            source.c.user_id,
+            local_date.label("local_date"),
+            currency.label("currency"),
+            source.c.wallet_id,
+            source.c.category_id,
+            func.sum(cast(source.c.amount, Numeric)).label("total_amount"),
+            func.count().label("transaction_count"),
+        )
+        .group_by(
+            source.c.user_id, local_date, currency,
+            source.c.wallet_id, source.c.category_id,
+        )
+    )
+
+
+_ROLLUP_COLUMNS = [
+    "user_id", "local_date", "currency", "wallet_id", "category_id",
+    "total_amount", "transaction_count",
+]
+
+
+def add_rollups_from(source):
+    """
+    INSERT ... SELECT that adds the transactions in `source` (see
+    `_rollups_of`) to the rollups. `source` may be a CTE over
+    `INSERT ... RETURNING`, which keeps set-based writers in one statement.
+    """
+    statement = insert(DailySpending).from_select(
+        _ROLLUP_COLUMNS, _rollups_of(source))
+    return statement.on_conflict_do_update(
+        constraint="uq_daily_spending_key",
+        set_={
+            "total_amount": DailySpending.total_amount + statement.excluded.total_amount,
+            "transaction_count": DailySpending.transaction_count + statement.excluded.transaction_count,
+        },
+    )
+
+
+def _expected_rollups(user_id: Optional[int] = None):
+    """Rollups recomputed from `transactions`, as a SELECT."""
+    active = select(Transaction).where(Transaction.is_active == True)
+    if user_id is not None:
+        active = active.where(Transaction.user_id == user_id)
+    return _rollups_of(active.subquery("active"))
+
+
+async def backfill(session: AsyncSession, user_id: Optional[int] = None) -> None:
+    """Rebuild rollups for one user, or for everyone, from `transactions`."""
+    # Block transaction writes until commit so none is counted twice or lost
+    await session.exec(text("LOCK TABLE transactions IN SHARE MODE"))
+
+    clear = delete(DailySpending)
+    if user_id is not None:
+        clear = clear.where(DailySpending.user_id == user_id)
+    await session.exec(clear)
+
+    await session.exec(
+        insert(DailySpending).from_select(_ROLLUP_COLUMNS, _expected_rollups(user_id)))
+    await session.commit()
+
+
+async def reconcile(session: AsyncSession, fix: bool = False) -> List[int]:
+    """
+    Compare rollups with `transactions` and return the ids of users whose
+    rollups drifted. With `fix`, rebuild those users.
+
+    The comparison takes no lock. It is one statement over one snapshot,
+    but with writes in flight a reported user may have changed again by
+    the time it is rebuilt, and a report taken mid-write can differ from
+    the next one. Each rebuild runs under `backfill`'s lock, so it is exact.
+    For a clean report, run it while writes are paused.
+    """
+    expected = _expected_rollups().subquery("expected")
+    actual = (
+        select(DailySpending)
+        .where(DailySpending.transaction_count != 0)
+        .subquery("actual")
+    )
+    same_key = and_(
+        expected.c.user_id == actual.c.user_id,
+        expected.c.local_date == actual.c.local_date,
+        expected.c.currency == actual.c.currency,
+        expected.c.wallet_id == actual.c.wallet_id,
+        expected.c.category_id.is_not_distinct_from(actual.c.category_id),
+    )
+    statement = (
+        select(func.coalesce(expected.c.user_id, actual.c.user_id))
+        .select_from(expected.join(actual, same_key, full=True))
+        .where(
+            or_(
+                expected.c.user_id.is_(None),
+                actual.c.user_id.is_(None),
+                expected.c.total_amount != actual.c.total_amount,
+                expected.c.transaction_count != actual.c.transaction_count,
+            )
+        )
+        .distinct()
+    )
+    user_ids = sorted((await session.exec(statement)).all())
+
+    if fix:
+        for user_id in user_ids:
+            await backfill(session, user_id)
+    return user_ids
+
+
+async def _main() -> None:
+    from app.database import async_session, engine
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    backfill_parser = commands.add_parser(
+        "backfill", help="Rebuild rollups from transactions")
+    backfill_parser.add_argument("--user-id", type=int, default=None)
+    reconcile_parser = commands.add_parser(
+        "reconcile", help="Report users whose rollups drifted")
+    reconcile_parser.add_argument(
+        "--fix", action="store_true", help="Rebuild drifted users")
+    args = parser.parse_args()
+
+    async with async_session() as session:
+        if args.command == "backfill":
+            await backfill(session, args.user_id)
+            print("Rollups rebuilt" + (f" for user {args.user_id}" if args.user_id else ""))
+        else:
+            user_ids = await reconcile(session, fix=args.fix)
+            print(f"{len(user_ids)} user(s) with drifted rollups: {user_ids}")
+            if args.fix and user_ids:
+                print("Rebuilt")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(_main())
@@ -1,15 +1,27 @@
+import asyncio
 import os
+import time
 
 from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, Optional, Set, Tuple
 from fastapi import Depends, HTTPException, status
-from jose import JWTError, jwt
-from passlib.context import CryptContext
 from fastapi.security import OAuth2PasswordBearer
-from sqlmodel import Session
+from sqlalchemy import event
+from sqlalchemy.orm import Session, make_transient_to_detached, object_session
 
+from app.core.cache import InvalidationBus, TTLCache, invalidation_bus
+from app.core.constants.app_error_code import AppErrorCode
 from app.core.helper.custom_oauth2_password_bearer import CustomOAuth2PasswordBearer
+from app.core.metrics import (
+    PASSWORD_HASH_DURATION,
+    PASSWORD_HASH_PENDING,
+    PASSWORD_HASH_QUEUE_WAIT,
+    PASSWORD_HASH_REJECTED,
+)
 from app.core.settings import settings
-from app.database import get_session
+from app.exceptions import AppHTTPException
 from app.models.user import User
 
 # SECRET_KEY = os.getenv("JWT_SECRET_KEY", "123")
@@ -17,20 +29,102 @@ ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
 REFRESH_TOKEN_EXPIRE_DAYS = 30
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+@lru_cache(maxsize=None)
+def get_pwd_context():
+    """
+    The passlib context, built on first use. passlib and python-jose are
+    imported inside the functions that need them, which keeps them (and
+    their crypto backends) off the import path of a cold start.
+    """
+    from passlib.context import CryptContext
+
+    # Hashes whose cost differs from BCRYPT_ROUNDS (either way) need an update
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__rounds=settings.BCRYPT_ROUNDS,
+    )
+
 
 oauth2_scheme = CustomOAuth2PasswordBearer(tokenUrl="auth/login")
 
 
 def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
 
 
 def get_password_hash(password):
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt on a dedicated, size-limited thread pool.
+
+    bcrypt releases the GIL, so a few threads give real parallelism without
+    starving the threadpool shared by sync routes. Jobs queued or running are
+    capped at `max_pending`; beyond that callers get a fast 503 instead of
+    piling up behind a login spike. Queue wait, hash time, pending jobs
+    and rejections are exported as `password_hash_*` metrics.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="bcrypt")
+        self._max_pending = max_pending
+        # Only touched from the event loop thread, so no lock is needed
+        self._pending = 0
+
+    async def _run(self, fn, *args):
+        if self._pending >= self._max_pending:
+            PASSWORD_HASH_REJECTED.inc()
+            raise AppHTTPException(
+                result_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                result_message="Server is busy, please retry shortly",
+                error_code=AppErrorCode.SERVICE_UNAVAILABLE,
+                headers={"Retry-After": "1"},
+            )
+
+        submitted_at = time.perf_counter()
+
+        def job():
+            started_at = time.perf_counter()
+            PASSWORD_HASH_QUEUE_WAIT.observe(started_at - submitted_at)
+            try:
+                return fn(*args)
+            finally:
+                PASSWORD_HASH_DURATION.observe(time.perf_counter() - started_at)
+
+        self._pending += 1
+        PASSWORD_HASH_PENDING.inc()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, job)
+        finally:
+            self._pending -= 1
+            PASSWORD_HASH_PENDING.dec()
+
+    async def hash(self, password: str) -> str:
+        return await self._run(get_password_hash, password)
+
+    async def verify_and_update(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """
+        Verify a password. When the stored hash uses an outdated cost, also
+        return a replacement hash to persist (otherwise None).
+        """
+        return await self._run(get_pwd_context().verify_and_update, password, hashed_password)
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
 
 
 def create_access_token(data: dict, expire_delta: timedelta | None = None):
+    from jose import jwt
+
     to_encode = data.copy()
 
     if "sub" in to_encode and isinstance(to_encode["sub"], int):
@@ -43,6 +137,8 @@ def create_access_token(data: dict, expire_delta: timedelta | None = None):
 
 
 def create_refresh_token(user_id: int, token_version: int):
+    from jose import jwt
+
     expire = datetime.now(timezone.utc) + \
         timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
     payload = {
@@ -51,3 +147,78 @@ def create_refresh_token(user_id: int, token_version: int):
         "exp": expire,
     }
     return jwt.encode(payload, settings.JWT_SECRET_KEY, algorithm=ALGORITHM)
+
+
+class UserCache:
+    """
+    In-process TTL/LRU cache of user rows for `get_current_user`.
+
+    Entries hold plain column values, never ORM instances, so nothing is
+    shared between sessions. Any committed UPDATE of a user row (token
+    rotation on refresh/logout included) evicts it here and, through the
+    invalidation bus, in every other worker.
+    """
+
+    CHANNEL = "users"
+
+    def __init__(self, bus: InvalidationBus, maxsize: int, ttl: float):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl, name="users")
+        self._bus = bus
+        self._pending: Set[asyncio.Task] = set()
+        bus.subscribe(self.CHANNEL, lambda key: self._cache.pop(int(key)))
+
+    def get(self, user_id: int) -> Optional[User]:
+        """Return a detached `User` built from the cached row, if present."""
+        row = self._cache.get(user_id)
+        if row is None:
+            return None
+        user = User(**row)
+        # Mark it as loaded from the database: adding it to a session then
+        # makes it persistent without a SELECT, and changes flush as UPDATEs.
+        make_transient_to_detached(user)
+        return user
+
+    def set(self, user: User) -> None:
+        self._cache.set(user.id, user.model_dump())
+
+    async def invalidate(self, user_id: int) -> None:
+        await self._bus.publish(self.CHANNEL, str(user_id))
+
+    def invalidate_soon(self, user_id: int) -> None:
+        """Invalidate from sync code such as ORM events."""
+        self._cache.pop(user_id)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # no event loop (scripts): nothing else to notify
+        task = loop.create_task(self.invalidate(user_id))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    def stats(self) -> Dict[str, float]:
+        return self._cache.stats()
+
+
+user_cache = UserCache(
+    invalidation_bus,
+    maxsize=settings.USER_CACHE_MAX_SIZE,
+    ttl=settings.USER_CACHE_TTL_SECONDS,
+)
+
+
+@event.listens_for(User, "after_update")
+def _collect_updated_user(mapper, connection, target: User) -> None:
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("updated_user_ids", set()).add(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_updated_users(session: Session) -> None:
+    for user_id in session.info.pop("updated_user_ids", ()):
+        user_cache.invalidate_soon(user_id)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_updated_users(session: Session, previous_transaction) -> None:
+    session.info.pop("updated_user_ids", None)
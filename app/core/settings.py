@@ -1,4 +1,6 @@
 # app/core/settings.py
+from typing import Literal
+
 from pydantic_settings import BaseSettings
 from pydantic import Field
 
@@ -20,6 +22,85 @@ class Settings(BaseSettings):
     SUPABASE_PASSWORD: str | None = None
     SUPABASE_USE_POOLER: bool = Field(default=False)
 
+    # Connection pooling profile: "direct", "pooler" or "test" (see
+    # app/core/pooling.py; defaults to "pooler" when SUPABASE_USE_POOLER).
+    # Unset sizes take the profile's value; DB_POOL_SIZE=0 means NullPool.
+    DB_POOL_PROFILE: Literal["direct", "pooler", "test"] | None = None
+    DB_POOL_SIZE: int | None = None
+    DB_MAX_OVERFLOW: int | None = None
+    DB_POOL_LIVENESS_SECONDS: int | None = None
+    DB_POOL_TIMEOUT_SECONDS: float = Field(default=30)
+    DB_POOL_RECYCLE_SECONDS: int = Field(default=1_800)
+
+    # Optional read replica (full SQLAlchemy asyncpg URL) for read-only
+    # endpoints. Reads fall back to the primary while the replica lags more
+    # than REPLICA_MAX_LAG_SECONDS (checked every REPLICA_LAG_CHECK_SECONDS)
+    # and, for READ_YOUR_WRITES_SECONDS after a user commits, for that user
+    DATABASE_READ_URL: str | None = None
+    REPLICA_MAX_LAG_SECONDS: float = Field(default=5)
+    REPLICA_LAG_CHECK_SECONDS: float = Field(default=2)
+    READ_YOUR_WRITES_SECONDS: float = Field(default=10)
+
+    # Log every SQL statement (SQLAlchemy echo). Slow statements are logged
+    # regardless: above SLOW_QUERY_MS each, or SLOW_REQUEST_DB_MS per request
+    DB_ECHO: bool = Field(default=False)
+    SLOW_QUERY_MS: float = Field(default=200)
+    SLOW_REQUEST_DB_MS: float = Field(default=500)
+
+    # Local timezone for day boundaries (spending rollups, time buckets)
+    DEFAULT_TIMEZONE: str = Field(default="Asia/Phnom_Penh")
+
+    # Most buckets one /transactions/timeseries call may return (~3 years of days)
+    TIMESERIES_MAX_BUCKETS: int = Field(default=1_100)
+
+    # Paginated listing totals (see CountStrategy)
+    COUNT_CACHE_TTL_SECONDS: int = Field(default=300)
+    COUNT_CACHE_MAX_SIZE: int = Field(default=10_000)
+    COUNT_ESTIMATE_THRESHOLD: int = Field(default=10_000)
+
+    # Caches: "memory" keeps entries in each worker, "redis" shares them.
+    # With CACHE_REDIS_URL set, invalidations reach every worker either way;
+    # without it, run a single worker.
+    CACHE_BACKEND: Literal["memory", "redis"] = Field(default="memory")
+    CACHE_REDIS_URL: str | None = None
+
+    # Authenticated user records (get_current_user)
+    USER_CACHE_TTL_SECONDS: int = Field(default=60)
+    USER_CACHE_MAX_SIZE: int = Field(default=10_000)
+
+    # Per-user response cache of read endpoints (see app/core/response_cache.py).
+    # Larger responses are not cached.
+    RESPONSE_CACHE_TTL_SECONDS: int = Field(default=300)
+    RESPONSE_CACHE_MAX_SIZE: int = Field(default=10_000)
+    RESPONSE_CACHE_MAX_ENTRY_BYTES: int = Field(default=256 * 1024)
+
+    # Password hashing. Changing BCRYPT_ROUNDS rehashes passwords on next login.
+    BCRYPT_ROUNDS: int = Field(default=12)
+    PASSWORD_HASH_WORKERS: int = Field(default=2)
+    PASSWORD_HASH_MAX_PENDING: int = Field(default=32)
+
+    # Browser cache lifetime of icons served by plain (unhashed) URL
+    ICON_CACHE_MAX_AGE_SECONDS: int = Field(default=86_400)
+
+    # Open pool connections and compile validators in the background at
+    # startup; /health/ready answers 503 until that is done
+    WARMUP_ON_STARTUP: bool = Field(default=False)
+
+    # Rows fetched per server-side cursor round trip in /transactions/export
+    EXPORT_BATCH_SIZE: int = Field(default=1_000)
+
+    # Maximum items accepted by POST /transactions/bulk
+    BULK_MAX_ITEMS: int = Field(default=500)
+
+    # Maximum lines read from one uploaded bank statement
+    IMPORT_MAX_LINES: int = Field(default=200_000)
+
+    # Delta sync (GET /sync): rows per entity per call, and how long a change
+    # waits before it is handed out, so rows written by transactions that
+    # started earlier but committed later are not skipped
+    SYNC_PAGE_SIZE: int = Field(default=500)
+    SYNC_SETTLE_SECONDS: int = Field(default=5)
+
     class Config:
         env_file = ".env"  # auto-loads from .env
         env_file_encoding = "utf-8"
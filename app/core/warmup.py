@@ -0,0 +1,78 @@
+"""
+Startup warmup and readiness.
+
+After a scale-to-zero cold start the first requests would otherwise pay for
+opening database connections, importing the JWT and password hashing
+libraries, and compiling pydantic validators. With WARMUP_ON_STARTUP the
+lifespan runs that work in the background and `/health/ready` answers 503
+until it is done, so the platform routes traffic only to a warm instance.
+`/health/live` answers as soon as the process serves HTTP.
+"""
+import asyncio
+import importlib
+import logging
+import time
+from typing import Callable, Optional
+
+from fastapi import FastAPI
+from fastapi.routing import APIRoute
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.helper.fast_response import response_adapter
+
+logger = logging.getLogger(__name__)
+
+
+class Warmup:
+    """Background warmup task and the readiness flag it sets."""
+
+    def __init__(self, get_engine: Callable[[], AsyncEngine], enabled: bool, connections: int):
+        self._get_engine = get_engine
+        self._enabled = enabled
+        self._connections = connections
+        # Without warmup there is nothing to wait for
+        self.ready = not enabled
+        self.seconds: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self, app: FastAPI) -> None:
+        if self._enabled:
+            self._task = asyncio.create_task(self._run(app))
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+
+    async def _run(self, app: FastAPI) -> None:
+        started_at = time.perf_counter()
+        try:
+            await asyncio.gather(self._open_connections(), asyncio.to_thread(self._prepare, app))
+        except Exception:
+            # Serve anyway: a cold path is slower, not broken
+            logger.exception("Warmup failed")
+        self.seconds = time.perf_counter() - started_at
+        self.ready = True
+
+    async def _open_connections(self) -> None:
+        """Check out up to `connections` connections at once so they are pooled."""
+        engine = self._get_engine()
+
+        async def ping() -> None:
+            async with engine.connect() as connection:
+                await connection.execute(text("SELECT 1"))
+
+        await asyncio.gather(*(ping() for _ in range(max(self._connections, 1))))
+
+    @staticmethod
+    def _prepare(app: FastAPI) -> None:
+        """Import lazily loaded libraries and compile every response envelope."""
+        importlib.import_module("jose.jwt")
+
+        from app.core.security import get_pwd_context
+
+        get_pwd_context()
+        for route in app.routes:
+            if isinstance(route, APIRoute) and route.response_model is not None:
+                response_adapter(route.response_model)
+
@@ -1,22 +1,27 @@
 # app/database.py
-from sqlmodel import SQLModel, create_engine, Session
+from functools import lru_cache
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlmodel import Session
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.instrumentation import instrument_engine
+from app.core.metrics import instrument_pool
+from app.core.pooling import PoolLivenessCheck, engine_options, resolve_pool_profile
+from app.core.replica import ReplicaRouter, current_user_id
 from app.core.settings import settings
+from app.core.warmup import Warmup
+from app.core.cache import invalidation_bus
 
 
 # Select database URL based on ENV
 if settings.ENV == "dev":
     DATABASE_URL = (
-        f"postgresql+psycopg2://{settings.POSTGRES_USER}:{settings.POSTGRES_PASSWORD}"
+        f"postgresql+asyncpg://{settings.POSTGRES_USER}:{settings.POSTGRES_PASSWORD}"
         f"@{settings.POSTGRES_HOST}:{settings.POSTGRES_PORT}/{settings.POSTGRES_DB}"
     )
-
-    engine = create_engine(
-        DATABASE_URL,
-        echo=True,
-        pool_pre_ping=True,
-        pool_size=5,
-        max_overflow=10,
-    )
+    connect_args = {}
 
 else:
     if not settings.SUPABASE_PROJECT_ID or not settings.SUPABASE_PASSWORD:
@@ -32,28 +37,129 @@ else:
         DB_HOST = f"db.{settings.SUPABASE_PROJECT_ID}.supabase.co"
 
     DATABASE_URL = (
-        f"postgresql+psycopg2://{DB_USER}:{settings.SUPABASE_PASSWORD}"
+        f"postgresql+asyncpg://{DB_USER}:{settings.SUPABASE_PASSWORD}"
         f"@{DB_HOST}:5432/postgres"
     )
+    connect_args = {
+        # asyncpg never attempts GSS encryption, so only SSL is configured
+        "ssl": "require",
+    }
+
+# Same database through the sync driver. Only Alembic's offline (--sql) mode
+# uses it; the application and online migrations go through `engine`.
+SYNC_DATABASE_URL = DATABASE_URL.replace("+asyncpg", "+psycopg2", 1)
+
+
+@lru_cache(maxsize=None)
+def get_engine() -> AsyncEngine:
+    """
+    The primary engine, created on first use rather than at import so a cold
+    start does not pay for the dialect and pool until a request needs them.
+    Also available as `app.database.engine`.
+    """
+    primary = create_async_engine(
+        DATABASE_URL, **engine_options(connect_args=connect_args))
+    instrument_engine(primary.sync_engine)
+    instrument_pool(primary.sync_engine)
+    return primary
+
+
+@lru_cache(maxsize=None)
+def get_read_engine() -> Optional[AsyncEngine]:
+    """The optional read replica (same pooling profile and TLS settings), or None."""
+    if not settings.DATABASE_READ_URL:
+        return None
+    replica = create_async_engine(
+        settings.DATABASE_READ_URL, **engine_options(connect_args=connect_args))
+    instrument_engine(replica.sync_engine)
+    return replica
+
+
+def __getattr__(name: str):
+    # `engine` and `read_engine` stay importable without being built at import
+    if name == "engine":
+        return get_engine()
+    if name == "read_engine":
+        return get_read_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+pool_liveness_check = PoolLivenessCheck(
+    get_engine, resolve_pool_profile().liveness_seconds)
+warmup = Warmup(
+    get_engine, settings.WARMUP_ON_STARTUP, resolve_pool_profile().pool_size)
+
+replica_router = ReplicaRouter(
+    invalidation_bus, get_read_engine if settings.DATABASE_READ_URL else None)
+replica_router.track_writes()
 
-    engine = create_engine(
-        DATABASE_URL,
-        echo=True,
-        pool_pre_ping=True,
-        connect_args={
-            "sslmode": "require",
-            "gssencmode": "disable",
-        },
-    )
 
+class PrimarySession(Session):
+    """Session bound to the primary engine, resolved when it first runs a statement."""
 
-def create_db_and_tables() -> None:
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        return get_engine().sync_engine
+
+
+class ReadRoutingSession(Session):
+    """
+    Session of `get_read_session`: bound to the replica or the primary, as
+    decided by `replica_router` on its first statement (after
+    `get_current_user` has identified the user).
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        bind = self.info.get("bind")
+        if bind is None:
+            use_replica = replica_router.use_replica(current_user_id.get())
+            bind = (get_read_engine() if use_replica else get_engine()).sync_engine
+            self.info["bind"] = bind
+        return bind
+
+
+# Objects stay usable after commit: attribute access on an expired instance
+# would need a lazy load, which AsyncSession cannot do implicitly.
+async_session = async_sessionmaker(
+    class_=AsyncSession,
+    sync_session_class=PrimarySession,
+    expire_on_commit=False,
+)
+
+async_read_session = async_sessionmaker(
+    class_=AsyncSession,
+    sync_session_class=ReadRoutingSession,
+    expire_on_commit=False,
+    info={"read_only": True},
+)
+
+
+async def create_db_and_tables() -> None:
     """Create tables only in development."""
     if settings.ENV == "dev":
-        SQLModel.metadata.create_all(engine)
+        async with get_engine().begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
 
 
-def get_session():
+async def get_session():
     """Yield a database session."""
-    with Session(engine) as session:
+    async with async_session() as session:
+        yield session
+
+
+async def get_read_session():
+    """
+    Yield a session for read-only handlers: served by the read replica when
+    one is configured, caught up, and the user has not just written.
+    """
+    async with async_read_session() as session:
         yield session
+
+
+async def run_in_session(fetch, *args, **kwargs):
+    """
+    Await `fetch(session, *args, **kwargs)` on a read session of its own, so
+    independent queries can run concurrently under `asyncio.gather` (one
+    AsyncSession cannot run two statements at once).
+    """
+    async with async_read_session() as session:
+        return await fetch(session, *args, **kwargs)
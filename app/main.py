@@ -1,37 +1,52 @@
-import uvicorn
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
-from sqlmodel import Session, SQLModel, create_engine
+from fastapi.responses import JSONResponse, ORJSONResponse
 from contextlib import asynccontextmanager
-from app.database import get_session, create_db_and_tables
+from app.database import create_db_and_tables, pool_liveness_check, replica_router, warmup
 from app.routers import user
-from .routers import transaction, wallet, category
+from .routers import transaction, wallet, category, sync, dashboard, icons, metrics, health
 from app.exceptions import AppHTTPException
-from fastapi.staticfiles import StaticFiles
 from app.core.settings import settings
-
-
-print("Loaded ENV:", settings.ENV)
-print("Loaded POSTGRES_USER:", settings.POSTGRES_USER)
+from app.core.cache import invalidation_bus
+from app.core.response_cache import response_cache
+from app.core.icons import icon_manifest
+from app.core.instrumentation import QueryTimingMiddleware
+from app.core.metrics import MetricsMiddleware, mark_process_dead, record_app_error
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    print("Loaded ENV:", settings.ENV)
+    print("Loaded POSTGRES_USER:", settings.POSTGRES_USER)
     try:
-        create_db_and_tables()
+        await create_db_and_tables()
     except Exception as e:
         print("Error creating tables: ", e)
+    icon_manifest.load()
+    await invalidation_bus.start()
+    await pool_liveness_check.start()
+    await replica_router.start()
+    await warmup.start(app)
     yield
+    await warmup.stop()
+    await replica_router.stop()
+    await pool_liveness_check.stop()
+    await invalidation_bus.stop()
+    await response_cache.close()
+    mark_process_dead()
 
-app = FastAPI(lifespan=lifespan)
-
-app.mount("/static/icons", StaticFiles(directory="app/static/icons"),
-          name="static_icons")
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
+app.add_middleware(QueryTimingMiddleware)
+app.add_middleware(MetricsMiddleware)
 
 app.include_router(user.router)
 app.include_router(transaction.router)
 app.include_router(wallet.router)
 app.include_router(category.router)
+app.include_router(sync.router)
+app.include_router(dashboard.router)
+app.include_router(icons.router)
+app.include_router(metrics.router)
+app.include_router(health.router)
 
 
 @app.get("/")
@@ -41,6 +56,7 @@ def root():
 
 @app.exception_handler(AppHTTPException)
 async def http_exception_handler(request: Request, exc: AppHTTPException):
+    record_app_error(request.scope, exc.status_code, exc.error_code)
     return JSONResponse(
         status_code=exc.status_code,
         content={
@@ -48,6 +64,7 @@ async def http_exception_handler(request: Request, exc: AppHTTPException):
             "result_message": exc.detail,
             "error_code": exc.error_code
         },
+        headers=exc.headers,
     )
 
 
@@ -1,6 +1,7 @@
 from .bank_details import BankDetails
 from .cart_details import CartDetails
 from .category import Category
+from .daily_spending import DailySpending
 from .transaction import Transaction
 from .user import User
 from .wallet import Wallet
@@ -9,6 +10,7 @@ __all__ = [
     "BankDetails",
     "CartDetails",
     "Category",
+    "DailySpending",
     "Transaction",
     "User",
     "Wallet",
@@ -1,6 +1,6 @@
 # Category Model
 from uuid import uuid4
-from sqlalchemy import Column, DateTime, func
+from sqlalchemy import Column, DateTime, Index, func
 from sqlmodel import SQLModel, Field, Relationship
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from typing import TYPE_CHECKING, Optional, List
@@ -44,6 +44,12 @@ class CategoryBase(SQLModel):
 
 class Category(CategoryBase, table=True):
     """Database model for Category."""
+    __table_args__ = (
+        Index("ix_categories_user_id_is_active", "user_id", "is_active"),
+        # Delta sync seeks on (updated_at, category_id) per user
+        Index("ix_categories_user_id_updated_at", "user_id", "updated_at", "category_id"),
+    )
+
     # category_id: UUID = Field(
     #     default_factory=uuid4,
     #     # primary_key=True,
@@ -61,8 +67,6 @@ class Category(CategoryBase, table=True):
     category_id: str = Field(
         default_factory=lambda: str(uuid4()),
         primary_key=True,
-        index=True,
-        unique=True,
         max_length=36,
         nullable=False,
         description="Primary key stored as UUID string"
@@ -0,0 +1,56 @@
+from datetime import date
+from decimal import Decimal
+from typing import Optional
+from sqlalchemy import Column, Numeric, UniqueConstraint
+from sqlmodel import SQLModel, Field
+
+
+class DailySpending(SQLModel, table=True):
+    """
+    Per-user spending rolled up by local day (DEFAULT_TIMEZONE).
+
+    Derived from `transactions` and kept current by the transaction write
+    paths (see app/core/rollups.py), so range totals scan days instead of
+    transactions. No foreign keys: the rows are rebuilt by the backfill and
+    reconcile commands, and skipping FK checks keeps the upserts cheap.
+    """
+    __tablename__ = "daily_spending"
+    __table_args__ = (
+        # category_id is optional; NULLS NOT DISTINCT keeps a single row for
+        # uncategorized spending so ON CONFLICT can target it (PostgreSQL 15+)
+        UniqueConstraint(
+            "user_id", "local_date", "currency", "wallet_id", "category_id",
+            name="uq_daily_spending_key",
+            postgresql_nulls_not_distinct=True,
+        ),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+
+    user_id: int = Field(nullable=False)
+
+    local_date: date = Field(
+        nullable=False,
+        description="Transaction date in DEFAULT_TIMEZONE"
+    )
+
+    currency: str = Field(
+        max_length=3,
+        nullable=False,
+        description="ISO 4217 currency code"
+    )
+
+    wallet_id: str = Field(max_length=36, nullable=False)
+
+    category_id: Optional[str] = Field(default=None, max_length=36)
+
+    # Exact decimal sum, so repeated +/- deltas never drift
+    total_amount: Decimal = Field(
+        default=Decimal(0),
+        sa_column=Column(Numeric, nullable=False)
+    )
+
+    transaction_count: int = Field(default=0, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<DailySpending {self.user_id} {self.local_date} {self.total_amount} {self.currency}>"
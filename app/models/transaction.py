@@ -1,5 +1,5 @@
 from uuid import uuid4
-from sqlalchemy import Column, DateTime, func
+from sqlalchemy import Column, DateTime, Index, func, text
 from sqlmodel import SQLModel, Field, Relationship
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from datetime import datetime, timezone
@@ -53,6 +53,44 @@ class TransactionBase(SQLModel):
 
 class Transaction(TransactionBase, table=True):
     """Database model representing a financial transaction."""
+    # Composite indexes matching the listing and aggregate access patterns.
+    # Listings only ever read active rows, so those indexes are partial.
+    __table_args__ = (
+        Index(
+            "ix_transactions_user_id_created_at",
+            "user_id", text("created_at DESC"), text("transaction_id DESC"),
+            postgresql_where=text("is_active"),
+        ),
+        Index(
+            "ix_transactions_user_id_wallet_id_created_at",
+            "user_id", "wallet_id", text("created_at DESC"),
+            postgresql_where=text("is_active"),
+        ),
+        Index(
+            "ix_transactions_user_id_category_id_created_at",
+            "user_id", "category_id", text("created_at DESC"),
+            postgresql_where=text("is_active"),
+        ),
+        # Covers the date-range aggregates with an index-only scan
+        Index(
+            "ix_transactions_user_id_transaction_date",
+            "user_id", "transaction_date",
+            postgresql_include=["currency", "amount"],
+        ),
+        # Delta sync seeks on (updated_at, transaction_id), deleted rows included
+        Index(
+            "ix_transactions_user_id_updated_at",
+            "user_id", "updated_at", "transaction_id",
+        ),
+        # Statement imports skip lines already imported into the wallet
+        Index(
+            "uq_transactions_wallet_id_source_ref",
+            "wallet_id", "source_ref",
+            unique=True,
+            postgresql_where=text("source_ref IS NOT NULL"),
+        ),
+    )
+
     # transaction_id: UUID = Field(
     #     default_factory=uuid4,
     #     # primary_key=True,
@@ -67,8 +105,6 @@ class Transaction(TransactionBase, table=True):
     transaction_id: str = Field(
         default_factory=lambda: str(uuid4()),
         primary_key=True,
-        index=True,
-        unique=True,
         max_length=36,
         nullable=False,
         description="Primary key stored as UUID string"
@@ -78,11 +114,17 @@ class Transaction(TransactionBase, table=True):
         default_factory=short_uuid,
         index=True,
         unique=True,
-        max_length=12,
+        max_length=15,
         nullable=False,
         description="Transaction No. use to display for mobile side"
     )
 
+    source_ref: Optional[str] = Field(
+        default=None,
+        max_length=80,
+        description="Origin of an imported row (bank and reference), used to skip re-imports"
+    )
+
     created_at: datetime = Field(
         sa_column=Column(
             DateTime(timezone=True),
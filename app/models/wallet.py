@@ -1,5 +1,5 @@
 from uuid import uuid4
-from sqlalchemy import Column, func
+from sqlalchemy import Column, Index, func
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlmodel import DateTime, SQLModel, Field, Relationship
 from typing import TYPE_CHECKING, Optional, List
@@ -19,11 +19,15 @@ class Wallet(SQLModel, table=True):
     """
     Database model representing a expense wallet.
     """
+    __table_args__ = (
+        Index("ix_wallets_user_id_is_active", "user_id", "is_active"),
+        # Delta sync seeks on (updated_at, wallet_id) per user
+        Index("ix_wallets_user_id_updated_at", "user_id", "updated_at", "wallet_id"),
+    )
+
     wallet_id: str = Field(
         default_factory=lambda: str(uuid4()),
         primary_key=True,
-        index=True,
-        unique=True,
         max_length=36,
         nullable=False,
         description="Primary key stored as UUID string"
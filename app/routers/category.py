@@ -1,77 +1,132 @@
-import os
+from fastapi import APIRouter, Depends, Query, Request, status
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, status, HTTPException
-from typing import List
-
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from app.models.user import User
 from app.routers.user import get_current_user
-from app.schemas.category import CategoryDelete, CategoryRead, CategoryCreate, CategoryUpdate
+from app.schemas.category import CategoryDelete, CategoryRead, CategoryCreate, CategoryUpdate, IconManifestRead
 from app.models.category import Category
-from app.database import get_session
+from app.database import get_read_session, get_session
 from app.schemas.base_response import BaseResponse
 from app.exceptions import AppHTTPException
 from app.core.helper.success_response import success_response
+from app.core.helper.fast_response import fast_response
+from app.core.helper.conditional import collection_version, is_not_modified, make_etag, not_modified, set_validators
+from app.core.response_cache import response_cache
+from app.core.icons import ICON_BASE_URL, asset_response, hashed_name, icon_manifest
 
 router = APIRouter(prefix="/categories", tags=["Categories"])
 
-ICON_DIR = "app/static/icons"
-ICON_BASE_URL = "/static/icons"
+def category_conditions(user_id: int) -> list:
+    return [
+        Category.user_id == user_id,
+        Category.is_active == True,
+    ]
+
+
+async def fetch_categories(session: AsyncSession, user_id: int) -> List[Category]:
+    query = select(Category).where(*category_conditions(user_id))
+    return (await session.exec(query)).all()
 
 
 @router.get("/icons", response_model=BaseResponse[List[str]])
 async def get_icons():
     """
-    List all icon filenames (or URLs) available in the icons folder.
+    List the URLs of all icons available in the icons folder.
     """
+    return fast_response(BaseResponse[List[str]], data=icon_manifest.urls())
 
-    try:
-        files = [
-            f for f in os.listdir(ICON_DIR)
-            if os.path.isfile(os.path.join(ICON_DIR, f)) and f.lower().endswith(((".svg", ".png", ".jpg", ".jpeg", ".ico")))
-        ]
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Failed to read icons folder: {str(e)}"
-        )
 
-    icon_urls = [f"{ICON_BASE_URL}/{filename}" for filename in files]
-    return success_response(data=icon_urls)
+@router.get("/icons/manifest", response_model=BaseResponse[IconManifestRead])
+async def get_icon_manifest(request: Request):
+    """
+    Every icon with its content-hashed URL, and the URL of the sprite.
+    Hashed URLs never change content, so clients can cache them forever and
+    only refetch this manifest (conditional GET with `If-None-Match`).
+    """
+    icon_manifest.refresh()
+    etag = icon_manifest.version
+    if is_not_modified(request, etag, None):
+        return not_modified(etag, None)
+
+    icons = [
+        {
+            "name": icon.name,
+            "url": f"{ICON_BASE_URL}/{icon.name}",
+            "hashed_url": f"{ICON_BASE_URL}/{hashed_name(icon)}",
+            "hash": icon.digest,
+        }
+        for icon in icon_manifest.icons.values()
+    ]
+    manifest = {
+        "version": etag,
+        "icons": icons,
+        "sprite_url": f"{router.prefix}/icons/sprite.svg?v={icon_manifest.sprite.digest}",
+    }
+    return set_validators(
+        fast_response(BaseResponse[IconManifestRead], data=manifest), etag, None)
+
+
+@router.get("/icons/sprite.svg")
+async def get_icon_sprite(
+    request: Request,
+    v: Optional[str] = Query(
+        None,
+        description="Sprite hash from the manifest; makes the response immutable"
+    ),
+):
+    """
+    All SVG icons in one document, each as `<symbol id="{name}">` (e.g. use
+    `<use href="#book"/>`), so the app loads every icon in a single request.
+    """
+    icon_manifest.refresh()
+    sprite = icon_manifest.sprite
+    return asset_response(request, sprite, immutable=v == sprite.digest)
 
 
 @router.get("/", response_model=BaseResponse[List[CategoryRead]])
+@response_cache("categories", tags=("categories",))
 async def get_categories(
-    session: Session = Depends(get_session),
+    request: Request,
+    session: AsyncSession = Depends(get_read_session),
     current_user: User = Depends(get_current_user)
 ):
-    query = select(Category).where(
-        Category.user_id == current_user.id,
-        Category.is_active == True,
-    )
-    categories = session.exec(query).all()
-    return success_response(data=categories)
+    """
+    Retrieve all categories. Supports conditional GET with `If-None-Match`.
+    """
+    count, last_modified = await collection_version(
+        session, Category, *category_conditions(current_user.id))
+    etag = make_etag("categories", current_user.id, count, last_modified)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified(etag, last_modified)
+
+    categories = await fetch_categories(session, current_user.id)
+    return set_validators(
+        fast_response(BaseResponse[List[CategoryRead]], data=categories),
+        etag, last_modified)
 
 
 @router.post("/", response_model=BaseResponse[CategoryRead], status_code=status.HTTP_201_CREATED)
 async def create_category(
     category: CategoryCreate,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
     statement = select(Category).where(
         Category.user_id == current_user.id,
         Category.name == category.name,
     )
-    existing_category = session.exec(statement).first()
+    existing_category = (await session.exec(statement)).first()
     if existing_category:
         raise AppHTTPException(result_code=status.HTTP_400_BAD_REQUEST,
                                result_message="Category already exists", error_code="E400")
 
     new_category = Category(**category.model_dump(), user_id=current_user.id)
     session.add(new_category)
-    session.commit()
-    session.refresh(new_category)
+    await session.commit()
+    await response_cache.invalidate(current_user.id, "categories")
+    await session.refresh(new_category)
     return success_response(data=new_category)
 
 
@@ -79,10 +134,10 @@ async def create_category(
 async def update_category(
     id: str,
     category: CategoryUpdate,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
-    category_db = session.get(Category, id)
+    category_db = await session.get(Category, id)
     if not category_db or not category_db.is_active or category_db.user_id != current_user.id:
         raise AppHTTPException(
             result_code=404, result_message="Category not found", error_code="E404")
@@ -93,18 +148,19 @@ async def update_category(
     category_data = category.model_dump(exclude_unset=True)
     category_db.sqlmodel_update(category_data)
     session.add(category_db)
-    session.commit()
-    session.refresh(category_db)
+    await session.commit()
+    await response_cache.invalidate(current_user.id, "categories")
+    await session.refresh(category_db)
     return success_response(data=category_db)
 
 
 @router.post("/delete")
 async def delete_category(
     request: CategoryDelete,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
-    category_db = session.get(Category, request.category_id)
+    category_db = await session.get(Category, request.category_id)
     if not category_db or not category_db.is_active or category_db.id != current_user.id:
         raise AppHTTPException(
             result_code=404, result_message="Category not found", error_code="E404")
@@ -114,6 +170,7 @@ async def delete_category(
 
     category_db.is_active = False
     session.add(category_db)
-    session.commit()
-    session.refresh(category_db)
+    await session.commit()
+    await response_cache.invalidate(current_user.id, "categories")
+    await session.refresh(category_db)
     return success_response()
@@ -0,0 +1,64 @@
+import logging
+import asyncio
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query, status
+
+from app.core.helper.fast_response import fast_response
+from app.core.helper.timeseries import resolve_timezone
+from app.database import run_in_session
+from app.exceptions import AppHTTPException
+from app.models.user import User
+from app.routers.category import fetch_categories
+from app.routers.transaction import fetch_current_week_transactions, fetch_total_expenses
+from app.routers.user import get_current_user
+from app.routers.wallet import fetch_wallets
+from app.schemas.base_response import BaseResponse
+from app.schemas.dashboard import DashboardResponse
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
+
+
+@router.get("/", response_model=BaseResponse[DashboardResponse])
+async def get_dashboard(
+    *,
+    tz: Optional[str] = Query(
+        None,
+        description="IANA timezone of the current week. Defaults to the app timezone"
+    ),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Bootstrap the home screen: the data of `/auth/me`, `/wallets/`,
+    `/categories/`, `/transactions/current-week` and
+    `/transactions/total-expenses` in one response.
+
+    The token is checked once, and the four queries run concurrently, each on
+    its own pooled connection.
+    """
+    zone = resolve_timezone(tz)
+    try:
+        wallets, categories, current_week, total_expenses = await asyncio.gather(
+            run_in_session(fetch_wallets, current_user.id),
+            run_in_session(fetch_categories, current_user.id),
+            run_in_session(fetch_current_week_transactions, current_user.id, zone),
+            run_in_session(fetch_total_expenses, current_user.id),
+        )
+
+        return fast_response(BaseResponse[DashboardResponse], data={
+            "user": current_user,
+            "wallets": wallets,
+            "categories": categories,
+            "current_week": current_week,
+            "total_expenses": total_expenses,
+        })
+
+    except Exception:
+        logger.exception("Failed to fetch dashboard")
+        raise AppHTTPException(
+            result_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            result_message="Failed to fetch dashboard",
+            error_code="E500",
+        )
@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Response, status
+
+from app.database import warmup
+
+router = APIRouter(prefix="/health", tags=["Health"])
+
+
+@router.get("/live", include_in_schema=False)
+async def live():
+    """The process is up and serving HTTP."""
+    return {"status": "ok"}
+
+
+@router.get("/ready", include_in_schema=False)
+async def ready(response: Response):
+    """Ready for traffic: startup warmup (WARMUP_ON_STARTUP) has finished."""
+    if not warmup.ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return {"status": "warming_up"}
+    return {"status": "ok", "warmup_seconds": warmup.seconds}
@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Request, status
+
+from app.core.icons import asset_response, icon_manifest
+from app.exceptions import AppHTTPException
+
+router = APIRouter(prefix="/static/icons", tags=["Icons"])
+
+
+@router.get("/{filename}")
+async def get_icon(filename: str, request: Request):
+    """
+    Serve a category icon by plain name (`book.svg`) or content-hashed name
+    (`book.1a2b3c4d5e6f.svg`, from `/categories/icons/manifest`). Only the
+    hashed form is cached as immutable.
+    """
+    asset = icon_manifest.find(filename)
+    if asset is None:
+        raise AppHTTPException(
+            result_code=status.HTTP_404_NOT_FOUND,
+            result_message="Icon not found",
+            error_code="E404",
+        )
+    return asset_response(request, asset, immutable=filename != asset.name)
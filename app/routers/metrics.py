@@ -0,0 +1,15 @@
+from fastapi import APIRouter, Response
+
+from app.core.metrics import render_metrics
+
+router = APIRouter(tags=["Metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """
+    Prometheus exposition of request, error, pool and cache metrics.
+    Not authenticated: keep it off the public ingress.
+    """
+    content, media_type = render_metrics()
+    return Response(content=content, media_type=media_type)
@@ -0,0 +1,157 @@
+import logging
+import base64
+import json
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+from fastapi import APIRouter, Depends, Query, status
+from sqlalchemy import tuple_
+from sqlmodel import func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.constants.app_error_code import AppErrorCode
+from app.core.helper.loader_options import TRANSACTION_LIST_OPTIONS
+from app.core.helper.fast_response import fast_response
+from app.core.settings import settings
+from app.database import get_session
+from app.exceptions import AppHTTPException
+from app.models.category import Category
+from app.models.transaction import Transaction
+from app.models.user import User
+from app.models.wallet import Wallet
+from app.routers.user import get_current_user
+from app.schemas.base_response import BaseResponse
+from app.schemas.sync import SyncDeleted, SyncResponse
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/sync", tags=["Sync"])
+
+# Entity name -> (model, primary key column, key reported for tombstones).
+# Clients know transactions by transaction_no; TransactionRead has no id.
+SYNC_ENTITIES = {
+    "wallets": (Wallet, Wallet.wallet_id, "wallet_id"),
+    "categories": (Category, Category.category_id, "category_id"),
+    "transactions": (Transaction, Transaction.transaction_id, "transaction_no"),
+}
+
+Position = Tuple[datetime, str]
+
+
+def encode_sync_token(positions: Dict[str, Position]) -> str:
+    """Encode the last `(updated_at, id)` handed out per entity."""
+    payload = json.dumps(
+        {name: [updated_at.isoformat(), row_id]
+         for name, (updated_at, row_id) in positions.items()},
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_sync_token(token: str) -> Dict[str, Position]:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return {
+            name: (datetime.fromisoformat(updated_at), str(row_id))
+            for name, (updated_at, row_id) in payload.items()
+            if name in SYNC_ENTITIES
+        }
+    except (ValueError, TypeError, AttributeError):
+        raise AppHTTPException(
+            result_code=status.HTTP_400_BAD_REQUEST,
+            result_message="Invalid sync token",
+            error_code=AppErrorCode.INVALID_REQUEST,
+        )
+
+
+async def fetch_changes(
+    session: AsyncSession,
+    name: str,
+    user_id: int,
+    position: Optional[Position],
+    limit: int,
+    include_deleted: bool,
+) -> Tuple[list, bool]:
+    """
+    Rows of one entity changed after `position`, oldest change first, and
+    whether more are pending. Seeks on (user_id, updated_at, id).
+    """
+    model, id_column, _ = SYNC_ENTITIES[name]
+    statement = select(model).where(
+        model.user_id == user_id,
+        model.updated_at < func.now() - timedelta(seconds=settings.SYNC_SETTLE_SECONDS),
+    )
+    if position:
+        statement = statement.where(
+            tuple_(model.updated_at, id_column) > tuple_(*position))
+    if not include_deleted:
+        statement = statement.where(model.is_active == True)
+    if model is Transaction:
+        statement = statement.options(*TRANSACTION_LIST_OPTIONS)
+
+    rows = (await session.exec(
+        statement.order_by(model.updated_at, id_column).limit(limit + 1)
+    )).all()
+    return rows[:limit], len(rows) > limit
+
+
+@router.get("/", response_model=BaseResponse[SyncResponse])
+async def sync(
+    *,
+    since: Optional[str] = Query(
+        None,
+        description="`next_token` from the previous sync. Omit for a full sync"
+    ),
+    limit: int = Query(
+        settings.SYNC_PAGE_SIZE, ge=1, le=5_000,
+        description="Maximum rows per entity"
+    ),
+    session: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Return the wallets, categories and transactions changed since `since`.
+
+    Soft-deleted rows come back as ids under `deleted`; a full sync (no
+    `since`) skips them. Changes become visible SYNC_SETTLE_SECONDS after
+    they are written. While `has_more` is true, sync again with `next_token`.
+    """
+    try:
+        positions = decode_sync_token(since) if since else {}
+        include_deleted = since is not None
+
+        changes = {}
+        deleted = SyncDeleted()
+        has_more = False
+        for name, (_, id_column, tombstone_key) in SYNC_ENTITIES.items():
+            rows, more = await fetch_changes(
+                session, name, current_user.id, positions.get(name),
+                limit, include_deleted)
+            has_more = has_more or more
+
+            if rows:
+                last = rows[-1]
+                positions[name] = (last.updated_at, getattr(last, id_column.key))
+
+            changes[name] = [row for row in rows if row.is_active]
+            getattr(deleted, name).extend(
+                getattr(row, tombstone_key) for row in rows if not row.is_active)
+
+        return fast_response(BaseResponse[SyncResponse], data={
+            **changes,
+            "deleted": deleted,
+            "next_token": encode_sync_token(positions),
+            "has_more": has_more,
+        })
+
+    except AppHTTPException:
+        raise
+
+    except Exception:
+        logger.exception("Failed to sync")
+        raise AppHTTPException(
+            result_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            result_message="Failed to sync",
+            error_code="E500",
+        )
@@ -1,34 +1,141 @@
-from typing import List, Optional
-from fastapi import APIRouter, Depends, Query, status
-from sqlmodel import select, desc, func
-from datetime import datetime, timedelta, timezone
-from fastapi import APIRouter, Depends, Query, logger, status
-from typing import Dict, List, Optional
-from sqlalchemy import func
-from sqlmodel import Session, select, desc
-from sqlalchemy.orm import selectinload
-
-from app.core.helper.timezones import get_now_utc_plus_7
-from app.database import get_session
+import logging
+from datetime import date, datetime
+from typing import Dict, List, Optional, Set, Tuple
+
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import insert, tuple_
+from sqlmodel import desc, func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from zoneinfo import ZoneInfo
+from app.core.helper.timezones import local_range_to_utc, local_today, to_naive_utc
+from app.database import get_read_session, get_session
 from app.models.transaction import Transaction
 from app.models.wallet import Wallet
 from app.models.category import Category
+from app.models.daily_spending import DailySpending
 from app.models.user import User
 from app.routers.user import get_current_user
-from app.schemas.transaction import TransactionDelete, TransactionRead, TransactionCreate, TransactionUpdate
+from app.schemas.transaction import BulkMode, CurrentWeekResponse, StatementImportResult, TimeseriesPoint, TransactionBulkCreate, TransactionBulkItemResult, TransactionBulkResult, TransactionDelete, TransactionRead, TransactionCreate, TransactionUpdate
+from app.schemas.wallet import AccountType
 from app.schemas.base_response import BaseResponse, PaginatedResponse
 from app.exceptions import AppHTTPException
+from app.core.constants.app_error_code import AppErrorCode
 from app.core.helper.success_response import success_response, paginated_success_response
-from datetime import date, datetime, timezone, timedelta
+from app.core.helper.loader_options import TRANSACTION_DETAIL_OPTIONS, TRANSACTION_LIST_OPTIONS, load_transaction_for_read
+from app.core.rollups import apply_spending_changes, spending_of
+from app.core.statements import STATEMENT_FORMATS, StatementImportStats, import_statement, parse_statement
+from app.core.helper.timeseries import TimeBucket, bucket_bounds, bucket_start, resolve_timezone, spending_timeseries
+from app.core.helper.fast_response import FastJSONResponse, fast_response
+from app.core.helper.conditional import is_not_modified, make_etag, not_modified, set_validators
+from app.core.helper.fieldsets import load_related, parse_fields, selected_columns, serialize_rows
+from app.core.helper.export import EXPORT_MEDIA_TYPES, ExportFormat, stream_rows
+from app.core.helper.pagination import CountStrategy, count_cache, count_rows, decode_cursor, encode_cursor
+from app.core.response_cache import response_cache
 
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/transactions", tags=["Transactions"])
 
 
+def transaction_filters(
+    user_id: int,
+    wallet_id: Optional[str] = None,
+    category_id: Optional[str] = None,
+    currency: Optional[str] = None,
+    from_date: Optional[datetime] = None,
+    to_date: Optional[datetime] = None,
+) -> list:
+    """WHERE conditions shared by the transaction listing and export."""
+    conditions = [
+        Transaction.is_active == True,
+        Transaction.user_id == user_id,
+    ]
+    if wallet_id:
+        conditions.append(Transaction.wallet_id == wallet_id)
+    if category_id:
+        conditions.append(Transaction.category_id == category_id)
+    if currency:
+        conditions.append(Transaction.currency == currency)
+    if from_date:
+        conditions.append(Transaction.transaction_date >= to_naive_utc(from_date))
+    if to_date:
+        conditions.append(Transaction.transaction_date <= to_naive_utc(to_date))
+    return conditions
+
+
+async def fetch_total_expenses(
+    session: AsyncSession,
+    user_id: int,
+    from_date: Optional[date] = None,
+    to_date: Optional[date] = None,
+) -> Dict[str, float]:
+    """USD and KHR spending totals over local dates, from the daily rollups."""
+    # Base conditions: user
+    conditions = [
+        DailySpending.user_id == user_id,
+    ]
+
+    # Apply date filters if provided
+    if from_date:
+        conditions.append(DailySpending.local_date >= from_date)
+    if to_date:
+        conditions.append(DailySpending.local_date <= to_date)
+
+    # Query with filters
+    query = (
+        select(DailySpending.currency, func.sum(
+            DailySpending.total_amount).label("total"))
+        .where(*conditions)
+        .group_by(DailySpending.currency)
+    )
+
+    results = (await session.exec(query)).all()
+
+    # Default response with 0 if no expenses exist for that currency
+    totals = {
+        "total_in_usd": 0.0,
+        "total_in_khr": 0.0,
+    }
+
+    for currency, total in results:
+        if currency.upper() == "USD":
+            totals["total_in_usd"] = float(total or 0)
+        elif currency.upper() == "KHR":
+            totals["total_in_khr"] = float(total or 0)
+    return totals
+
+
+async def fetch_current_week_transactions(
+    session: AsyncSession,
+    user_id: int,
+    zone: ZoneInfo,
+    currency: Optional[str] = None,
+) -> List[Transaction]:
+    """Active transactions of the current local week (Monday to Sunday), newest first."""
+    today = local_today(zone)
+    start_utc, end_utc = local_range_to_utc(
+        *bucket_bounds(today, today, TimeBucket.WEEK), zone)
+
+    query = select(Transaction).where(
+        Transaction.user_id == user_id,
+        Transaction.is_active == True,
+        Transaction.transaction_date >= start_utc,
+        Transaction.transaction_date < end_utc,
+    ).order_by(desc(Transaction.transaction_date))
+
+    if currency:
+        query = query.where(Transaction.currency == currency.upper())
+
+    return (await session.exec(query.options(*TRANSACTION_LIST_OPTIONS))).all()
+
+
 @router.get("/", response_model=PaginatedResponse[List[TransactionRead]])
-def get_transactions(
+async def get_transactions(
     *,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
     wallet_id: Optional[str] = Query(None),
@@ -36,50 +143,109 @@ def get_transactions(
     currency: Optional[str] = Query(None),
     from_date: Optional[datetime] = Query(None),
     to_date: Optional[datetime] = Query(None),
+    cursor: Optional[str] = Query(
+        None,
+        description="Opaque `next_cursor` from a previous page. When set, `skip` is ignored and the page is fetched by keyset"
+    ),
+    count: CountStrategy = Query(
+        CountStrategy.EXACT,
+        description="How `total` is computed: exact, cached (reused until the next write), estimate (planner estimate for large sets) or none"
+    ),
+    fields: Optional[str] = Query(
+        None,
+        description="Comma-separated fields to return (e.g. 'transaction_no,amount,currency'). Unrequested columns are not queried"
+    ),
+    normalized: bool = Query(
+        False,
+        description="Return wallet_id/category_id per row and the referenced wallets and categories once, keyed by id, under `included`"
+    ),
     current_user: User = Depends(get_current_user),
 ):
     """
     Retrieve all transactions. 
+
+    Pages are ordered by `created_at` (newest first). Every page returns a
+    `next_cursor`; passing it back as `cursor` switches to keyset pagination,
+    which stays fast on deep pages where `skip` has to scan every skipped row.
+
+    `fields` and `normalized` shrink the page: only the requested columns are
+    selected, and wallets and categories are loaded with one query each.
     """
     try:
-        statement = select(Transaction).where(
-            Transaction.is_active == True,
-            Transaction.user_id == current_user.id
+        sparse = fields is not None or normalized
+        if sparse:
+            names = parse_fields(fields, normalized)
+            statement = select(*selected_columns(names))
+        else:
+            statement = select(Transaction)
+        statement = statement.where(
+            *transaction_filters(
+                current_user.id, wallet_id, category_id, currency, from_date, to_date)
         )
 
-        if wallet_id:
-            statement = statement.where(Transaction.wallet_id == wallet_id)
-        if category_id:
-            statement = statement.where(Transaction.category_id == category_id)
-        if currency:
-            statement = statement.where(Transaction.currency == currency)
-        if from_date:
-            statement = statement.where(
-                Transaction.transaction_date >= from_date
-            )
-        if to_date:
-            statement = statement.where(
-                Transaction.transaction_date <= to_date
-            )
+        signature = (wallet_id, category_id, currency, from_date, to_date)
+        total, total_is_estimate = await count_rows(
+            session, statement, count, current_user.id, signature)
 
-        statement = statement.order_by(desc(Transaction.created_at))
+        # transaction_id breaks ties between rows created in the same instant
+        statement = statement.order_by(
+            desc(Transaction.created_at), desc(Transaction.transaction_id))
 
-        count_statement = select(
-            func.count()).select_from(statement.subquery())
-        total = session.exec(count_statement).one()
-
-        transactions = session.exec(statement.offset(skip).limit(limit)).all()
-
-        return paginated_success_response(
+        if cursor:
+            cursor_created_at, cursor_transaction_id = decode_cursor(cursor)
+            statement = statement.where(
+                tuple_(Transaction.created_at, Transaction.transaction_id)
+                < tuple_(cursor_created_at, cursor_transaction_id)
+            )
+            skip = 0
+
+        if not sparse:
+            statement = statement.options(*TRANSACTION_LIST_OPTIONS)
+
+        # Fetch one extra row to know whether another page exists
+        transactions = (await session.exec(
+            statement.offset(skip).limit(limit + 1)
+        )).all()
+
+        next_cursor = None
+        if len(transactions) > limit:
+            transactions = transactions[:limit]
+            last = transactions[-1]
+            next_cursor = encode_cursor(last.created_at, last.transaction_id)
+
+        if sparse:
+            # Bypasses response_model, which would require every field
+            related = await load_related(session, transactions, names, normalized)
+            content = paginated_success_response(
+                data=serialize_rows(transactions, names, related),
+                total=total,
+                total_is_estimate=total_is_estimate,
+                skip=skip,
+                limit=limit,
+                cursor=cursor,
+                next_cursor=next_cursor,
+            ).model_dump(mode="json")
+            if normalized:
+                content["included"] = related
+            return FastJSONResponse(content=content)
+
+        return fast_response(
+            PaginatedResponse[List[TransactionRead]],
             data=transactions,
             total=total,
+            total_is_estimate=total_is_estimate,
             skip=skip,
             limit=limit,
+            cursor=cursor,
+            next_cursor=next_cursor,
         )
 
         # return success_response(data=transactions or [])
-    except Exception as e:
-        print(e)
+    except AppHTTPException:
+        raise
+
+    except Exception:
+        logger.exception("Failed to fetch transactions")
         raise AppHTTPException(
             result_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             result_message="Failed to fetch transactions",
@@ -88,8 +254,9 @@ def get_transactions(
 
 
 @router.get("/total-expenses", response_model=BaseResponse[Dict[str, float]])
-def get_total_expenses(
-    session: Session = Depends(get_session),
+@response_cache("total-expenses", tags=("transactions",))
+async def get_total_expenses(
+    session: AsyncSession = Depends(get_read_session),
     current_user: User = Depends(get_current_user),
     from_date: Optional[date] = Query(
         None,
@@ -102,7 +269,11 @@ def get_total_expenses(
 ):
     """
     Retrieve the total expenses in USD and KHR.
-    Can optionally filter by date range using `from_date` and `to_date`.
+    Can optionally filter by date range using `from_date` and `to_date`,
+    interpreted as local dates in the app timezone (DEFAULT_TIMEZONE).
+
+    Totals are read from the daily spending rollups, so the cost grows with
+    the number of days in the range rather than the number of transactions.
 
     Response example:
     {
@@ -111,56 +282,102 @@ def get_total_expenses(
     }
     """
     try:
-        # Base conditions: user + type
-        conditions = [
-            Transaction.user_id == current_user.id,
-        ]
-
-        # Apply date filters if provided
-        if from_date:
-            conditions.append(Transaction.transaction_date >=
-                              datetime.combine(from_date, datetime.min.time()))
-        if to_date:
-            conditions.append(Transaction.transaction_date <=
-                              datetime.combine(to_date, datetime.max.time()))
-
-        # Query with filters
-        query = (
-            select(Transaction.currency, func.sum(
-                Transaction.amount).label("total"))
-            .where(*conditions)
-            .group_by(Transaction.currency)
+        totals = await fetch_total_expenses(
+            session, current_user.id, from_date, to_date)
+        return fast_response(BaseResponse[Dict[str, float]], data=totals)
+
+    except Exception:
+        logger.exception("Failed to fetch total expenses")
+        raise AppHTTPException(
+            result_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            result_message="Failed to fetch total expenses",
+            error_code="E500",
         )
 
-        results = session.exec(query).all()
 
-        # Default response with 0 if no expenses exist for that currency
-        totals = {
-            "total_in_usd": 0.0,
-            "total_in_khr": 0.0,
-        }
+@router.get("/timeseries", response_model=BaseResponse[List[TimeseriesPoint]])
+async def get_transaction_timeseries(
+    *,
+    session: AsyncSession = Depends(get_read_session),
+    bucket: TimeBucket = Query(
+        TimeBucket.DAY,
+        description="Bucket width: day, week (starting Monday) or month"
+    ),
+    from_date: Optional[date] = Query(
+        None,
+        description="First local date (inclusive), YYYY-MM-DD. Defaults to the start of the current week"
+    ),
+    to_date: Optional[date] = Query(
+        None,
+        description="Last local date (inclusive), YYYY-MM-DD. Defaults to the end of the current week"
+    ),
+    tz: Optional[str] = Query(
+        None,
+        description="IANA timezone the dates and buckets are in (e.g. 'Asia/Phnom_Penh'). Defaults to the app timezone"
+    ),
+    currency: Optional[str] = Query(
+        None,
+        min_length=3,
+        max_length=3,
+        pattern="^[A-Z]{3}$",
+        description="Filter by 3-letter ISO currency code (e.g. 'USD', 'KHR')"
+    ),
+    wallet_id: Optional[str] = Query(None),
+    category_id: Optional[str] = Query(None),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Retrieve spending totals per day, week or month in the given timezone.
 
-        for currency, total in results:
-            if currency.upper() == "USD":
-                totals["total_in_usd"] = float(total or 0)
-            elif currency.upper() == "KHR":
-                totals["total_in_khr"] = float(total or 0)
+    The range is widened to whole buckets and every bucket is returned, with
+    zero totals when there was no spending.
+    """
+    try:
+        zone = resolve_timezone(tz)
+        today = local_today(zone)
+        from_date = from_date or bucket_start(today, TimeBucket.WEEK)
+        to_date = to_date or bucket_bounds(today, today, TimeBucket.WEEK)[1]
+        if from_date > to_date:
+            raise AppHTTPException(
+                result_code=status.HTTP_400_BAD_REQUEST,
+                result_message="from_date must not be after to_date",
+                error_code=AppErrorCode.INVALID_REQUEST,
+            )
+
+        points = await spending_timeseries(
+            session,
+            current_user.id,
+            bucket,
+            from_date,
+            to_date,
+            zone,
+            currency=currency,
+            wallet_id=wallet_id,
+            category_id=category_id,
+        )
+        return success_response(data=points)
 
-        return success_response(data=totals)
+    except AppHTTPException:
+        raise
 
-    except Exception as e:
-        logger.error(f"Failed to fetch total expenses: {str(e)}")
+    except Exception:
+        logger.exception("Failed to fetch transaction time series")
         raise AppHTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to fetch total expenses",
-            error_code="EXPENSE_FETCH_ERROR",
+            result_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            result_message="Failed to fetch transaction time series",
+            error_code="E500",
         )
 
 
-@router.get("/current-week", response_model=BaseResponse[List[TransactionRead]])
-def get_current_week_transactions(
+@router.get("/current-week", response_model=CurrentWeekResponse)
+@response_cache(
+    "current-week",
+    tags=("transactions", "wallets", "categories"),
+    vary=lambda tz, **_: local_today(resolve_timezone(tz)),
+)
+async def get_current_week_transactions(
     *,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
     currency: Optional[str] = Query(
         None,
         min_length=3,
@@ -168,82 +385,151 @@ def get_current_week_transactions(
         pattern="^[A-Z]{3}$",
         description="Filter by 3-letter ISO currency code (e.g. 'USD', 'KHR')"
     ),
+    tz: Optional[str] = Query(
+        None,
+        description="IANA timezone the week is in. Defaults to the app timezone"
+    ),
     current_user: User = Depends(get_current_user),
 ):
     """
-    Retrieve all transactions for the current week (Monday to Sunday) in UTC+7 timezone.
+    Retrieve all transactions for the current week (Monday to Sunday) in the given timezone.
     Optionally filter by currency code. Returns transactions ordered by date (newest first).
+
+    `days` carries the week's chart data: the daily buckets of
+    `/transactions/timeseries`, served from the rollups in the app timezone.
     """
     try:
-        # --- Calculate current week in UTC+7 ---
-        tz_offset = timedelta(hours=7)
-        now_utc = datetime.now(timezone.utc)
-        now_local = now_utc + tz_offset
-
-        # Start of week (Monday 00:00 local)
-        start_local = (now_local - timedelta(days=now_local.weekday())).replace(
-            hour=0, minute=0, second=0, microsecond=0
+        zone = resolve_timezone(tz)
+        today = local_today(zone)
+        week_start, week_end = bucket_bounds(today, today, TimeBucket.WEEK)
+
+        transactions = await fetch_current_week_transactions(
+            session, current_user.id, zone, currency)
+        days = await spending_timeseries(
+            session,
+            current_user.id,
+            TimeBucket.DAY,
+            week_start,
+            week_end,
+            zone,
+            currency=currency,
         )
-        # End of week (Sunday 23:59:59 local)
-        end_local = start_local + \
-            timedelta(days=6, hours=23, minutes=59,
-                      seconds=59, microseconds=999999)
-
-        # Convert back to UTC for DB query
-        start_utc = start_local - tz_offset
-        end_utc = end_local - tz_offset
-
-        # Debug
-        print("Start of week UTC:", start_utc)
-        print("End of week UTC:", end_utc)
-
-        # --- Build query ---
-        query = select(Transaction).where(
-            Transaction.user_id == current_user.id,
-            func.date(Transaction.transaction_date) >= start_utc.date(),
-            func.date(Transaction.transaction_date) <= end_utc.date()
-        ).order_by(desc(Transaction.transaction_date))
-
-        if currency:
-            query = query.where(Transaction.currency == currency.upper())
-
-        transactions = session.exec(query).all()
 
-        return success_response(
-            result_code=status.HTTP_200_OK,
-            result_message="Success",
-            data=transactions
+        return fast_response(
+            CurrentWeekResponse,
+            data=transactions,
+            days=days,
         )
 
-    except Exception as e:
-        logger.error(f"Failed to fetch current week transactions: {str(e)}")
+    except AppHTTPException:
+        raise
+
+    except Exception:
+        logger.exception("Failed to fetch current week transactions")
         raise AppHTTPException(
             result_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             result_message="Failed to fetch current week transactions",
-            error_code="TRANSACTION_FETCH_ERROR",
+            error_code="E500",
+        )
+
+
+@router.get("/export")
+async def export_transactions(
+    *,
+    format: ExportFormat = Query(
+        ExportFormat.CSV,
+        description="csv or ndjson (one JSON object per line)"
+    ),
+    compress: bool = Query(
+        False,
+        description="Gzip the stream on the fly and download a .gz file"
+    ),
+    wallet_id: Optional[str] = Query(None),
+    category_id: Optional[str] = Query(None),
+    currency: Optional[str] = Query(None),
+    from_date: Optional[datetime] = Query(None),
+    to_date: Optional[datetime] = Query(None),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Download all transactions matching the `GET /transactions` filters,
+    oldest first, with wallet and category names.
+
+    The file is streamed from a server-side cursor, so it can cover the
+    whole history of an account without paging.
+    """
+    statement = (
+        select(
+            Transaction.transaction_no,
+            Transaction.transaction_date,
+            Transaction.amount,
+            Transaction.currency,
+            Transaction.note,
+            Wallet.wallet_name,
+            Category.name.label("category_name"),
+            Transaction.created_at,
         )
+        .join(Wallet, Wallet.wallet_id == Transaction.wallet_id)
+        .outerjoin(Category, Category.category_id == Transaction.category_id)
+        .where(*transaction_filters(
+            current_user.id, wallet_id, category_id, currency, from_date, to_date))
+        .order_by(Transaction.transaction_date, Transaction.transaction_id)
+    )
+
+    filename = f"transactions.{format.value}"
+    media_type = EXPORT_MEDIA_TYPES[format]
+    if compress:
+        filename += ".gz"
+        media_type = "application/gzip"
+
+    return StreamingResponse(
+        stream_rows(statement, format, compress=compress),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
 
 @router.get("/{id}", response_model=BaseResponse[TransactionRead])
-def get_transaction(id: str, session: Session = Depends(get_session), current_user: User = Depends(get_current_user)):
+async def get_transaction(id: str, request: Request, session: AsyncSession = Depends(get_read_session), current_user: User = Depends(get_current_user)):
     """
     Retrieve a single transaction by ID.
+
+    Supports conditional GET: the ETag covers the transaction and its embedded
+    wallet and category, and is checked before the row is loaded.
     """
-    transaction = session.get(Transaction, id)
-    if not transaction or transaction.user_id != current_user.id or not transaction.is_active:
+    version = (await session.exec(
+        select(Transaction.updated_at, Wallet.updated_at, Category.updated_at)
+        .join(Wallet, Wallet.wallet_id == Transaction.wallet_id)
+        .outerjoin(Category, Category.category_id == Transaction.category_id)
+        .where(
+            Transaction.transaction_id == id,
+            Transaction.user_id == current_user.id,
+            Transaction.is_active == True,
+        )
+    )).first()
+    if version is None:
         raise AppHTTPException(
             result_code=404,
             result_message="Transaction not found",
             error_code="E404"
         )
 
-    return success_response(data=transaction)
+    etag = make_etag("transaction", id, *version)
+    last_modified = max(value for value in version if value is not None)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified(etag, last_modified)
+
+    transaction = await session.get(
+        Transaction, id, options=TRANSACTION_DETAIL_OPTIONS)
+    return set_validators(
+        fast_response(BaseResponse[TransactionRead], data=transaction),
+        etag, last_modified)
 
 
 @router.post("/", response_model=BaseResponse[TransactionRead], status_code=status.HTTP_201_CREATED)
 async def create_transaction(
     transaction_in: TransactionCreate,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -260,10 +546,10 @@ async def create_transaction(
             )
 
     try:
-        wallet = session.get(Wallet, transaction_in.wallet_id)
+        wallet = await session.get(Wallet, transaction_in.wallet_id)
         validate_entity(wallet, "Wallet")
 
-        category = session.get(Category, transaction_in.category_id)
+        category = await session.get(Category, transaction_in.category_id)
         validate_entity(category, "Category")
 
         new_transaction = Transaction(
@@ -272,8 +558,13 @@ async def create_transaction(
         )
 
         session.add(new_transaction)
-        session.commit()
-        session.refresh(new_transaction)
+        await apply_spending_changes(
+            session, added=[spending_of(new_transaction)])
+        await session.commit()
+        new_transaction = await load_transaction_for_read(
+            session, new_transaction.transaction_id)
+        await count_cache.invalidate_user(current_user.id)
+        await response_cache.invalidate(current_user.id, "transactions")
 
         return success_response(
             result_code=status.HTTP_201_CREATED,
@@ -284,9 +575,9 @@ async def create_transaction(
     except AppHTTPException:
         raise
 
-    except Exception as e:
-        print(e)
-        session.rollback()
+    except Exception:
+        logger.exception("Failed to create transaction")
+        await session.rollback()
         raise AppHTTPException(
             result_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             result_message="Failed to create transaction",
@@ -294,18 +585,271 @@ async def create_transaction(
         )
 
 
+def plan_bulk_items(
+    bulk_in: TransactionBulkCreate,
+    user_id: int,
+    valid_wallet_ids: Set[str],
+    valid_category_ids: Set[str],
+) -> Tuple[List[TransactionBulkItemResult], Dict[int, Transaction]]:
+    """
+    Validate bulk items against the user's active wallets and categories.
+
+    Returns one (not yet successful) result per item in request order and the
+    transactions to insert keyed by item index; none in `atomic` mode when
+    any item is invalid.
+    """
+    results: List[TransactionBulkItemResult] = []
+    new_transactions: Dict[int, Transaction] = {}
+    for index, item in enumerate(bulk_in.items):
+        error_message = None
+        if item.wallet_id not in valid_wallet_ids:
+            error_message = "Wallet does not exist or is inactive"
+        elif item.category_id and item.category_id not in valid_category_ids:
+            error_message = "Category does not exist or is inactive"
+
+        results.append(TransactionBulkItemResult(
+            index=index,
+            success=False,
+            error_code="E404" if error_message else None,
+            error_message=error_message,
+        ))
+        if not error_message:
+            # Built through the model for its id/number defaults
+            new_transactions[index] = Transaction(
+                **item.model_dump(), user_id=user_id)
+
+    if len(new_transactions) < len(bulk_in.items) and bulk_in.mode == BulkMode.ATOMIC:
+        new_transactions = {}
+    return results, new_transactions
+
+
+def mark_bulk_inserted(
+    results: List[TransactionBulkItemResult],
+    new_transactions: Dict[int, Transaction],
+    inserted: List[Tuple[str, str]],
+) -> None:
+    """Mark the items of the `(transaction_id, transaction_no)` rows RETURNING gave back."""
+    index_of = {t.transaction_id: index for index, t in new_transactions.items()}
+    for transaction_id, transaction_no in inserted:
+        index = index_of[transaction_id]
+        results[index].success = True
+        results[index].transaction_id = transaction_id
+        results[index].transaction_no = transaction_no
+
+
+@router.post("/bulk", response_model=BaseResponse[TransactionBulkResult], status_code=status.HTTP_201_CREATED)
+async def create_transactions_bulk(
+    bulk_in: TransactionBulkCreate,
+    response: Response,
+    session: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Create up to BULK_MAX_ITEMS transactions in one request.
+
+    Wallets and categories are validated with one query each and the rows are
+    written with a single multi-row INSERT ... RETURNING. Every item gets a
+    result in request order. In `atomic` mode any invalid item rejects the
+    whole batch with 422; in `partial` mode the valid items are created and
+    the invalid ones are reported.
+    """
+    try:
+        items = bulk_in.items
+
+        wallet_ids = {item.wallet_id for item in items}
+        valid_wallet_ids = set((await session.exec(
+            select(Wallet.wallet_id).where(
+                Wallet.wallet_id.in_(wallet_ids),
+                Wallet.user_id == current_user.id,
+                Wallet.is_active == True,
+            )
+        )).all())
+
+        category_ids = {item.category_id for item in items if item.category_id}
+        valid_category_ids = set()
+        if category_ids:
+            valid_category_ids = set((await session.exec(
+                select(Category.category_id).where(
+                    Category.category_id.in_(category_ids),
+                    Category.user_id == current_user.id,
+                    Category.is_active == True,
+                )
+            )).all())
+
+        results, new_transactions = plan_bulk_items(
+            bulk_in, current_user.id, valid_wallet_ids, valid_category_ids)
+
+        if new_transactions:
+            columns = (
+                "transaction_id", "transaction_no", "amount", "currency", "note",
+                "transaction_date", "is_active", "wallet_id", "category_id", "user_id",
+            )
+            inserted = (await session.exec(
+                insert(Transaction)
+                .values([
+                    {column: getattr(transaction, column) for column in columns}
+                    for transaction in new_transactions.values()
+                ])
+                .returning(Transaction.transaction_id, Transaction.transaction_no)
+            )).all()
+            await apply_spending_changes(
+                session, added=[spending_of(t) for t in new_transactions.values()])
+            await session.commit()
+            await count_cache.invalidate_user(current_user.id)
+            await response_cache.invalidate(current_user.id, "transactions")
+
+            mark_bulk_inserted(results, new_transactions, inserted)
+
+        created = len(new_transactions)
+        result_code = status.HTTP_201_CREATED
+        if not created:
+            result_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+            response.status_code = result_code
+        return success_response(
+            result_code=result_code,
+            result_message="Success" if created else "No transactions were created",
+            data=TransactionBulkResult(
+                created=created,
+                failed=len(items) - created,
+                results=results,
+            ),
+        )
+
+    except AppHTTPException:
+        raise
+
+    except Exception:
+        logger.exception("Failed to create transactions")
+        await session.rollback()
+        raise AppHTTPException(
+            result_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            result_message="Failed to create transactions",
+            error_code="E500",
+        )
+
+
+@router.post(
+    "/import",
+    response_model=BaseResponse[StatementImportResult],
+    status_code=status.HTTP_201_CREATED,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"text/csv": {"schema": {"type": "string", "format": "binary"}}},
+        }
+    },
+)
+async def import_bank_statement(
+    request: Request,
+    wallet_id: str = Query(
+        ...,
+        description="Wallet the statement lines are imported into"
+    ),
+    bank: Optional[AccountType] = Query(
+        None,
+        description="Statement format (ABA, WING or AC). Defaults to the wallet type"
+    ),
+    category_id: Optional[str] = Query(
+        None,
+        description="Category assigned to every imported transaction"
+    ),
+    tz: Optional[str] = Query(
+        None,
+        description="IANA timezone of the statement dates. Defaults to the app timezone"
+    ),
+    session: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Import the spending lines of a bank statement CSV sent as the raw request
+    body (`Content-Type: text/csv`).
+
+    The body is parsed as it arrives and loaded with COPY, so large statements
+    import with bounded memory. Lines already imported into the wallet are
+    skipped, so re-uploading an overlapping statement is safe.
+    """
+    wallet = await session.get(Wallet, wallet_id)
+    if not wallet or not wallet.is_active or wallet.user_id != current_user.id:
+        raise AppHTTPException(
+            result_code=status.HTTP_404_NOT_FOUND,
+            result_message="Wallet does not exist or is inactive",
+            error_code="E404"
+        )
+
+    if category_id:
+        category = await session.get(Category, category_id)
+        if not category or not category.is_active or category.user_id != current_user.id:
+            raise AppHTTPException(
+                result_code=status.HTTP_404_NOT_FOUND,
+                result_message="Category does not exist or is inactive",
+                error_code="E404"
+            )
+
+    bank_name = bank.value if bank else wallet.wallet_type
+    columns = STATEMENT_FORMATS.get(bank_name)
+    if columns is None:
+        raise AppHTTPException(
+            result_code=status.HTTP_400_BAD_REQUEST,
+            result_message=f"Statement import is not supported for {bank_name} wallets",
+            error_code=AppErrorCode.INVALID_REQUEST,
+        )
+    zone = resolve_timezone(tz)
+
+    try:
+        stats = StatementImportStats()
+        lines = parse_statement(
+            request.stream(), columns, wallet.currency, zone, stats)
+        imported = await import_statement(
+            session, lines, bank_name, current_user.id, wallet_id, category_id)
+        await session.commit()
+        if imported:
+            await count_cache.invalidate_user(current_user.id)
+            await response_cache.invalidate(current_user.id, "transactions")
+
+        return success_response(
+            result_code=status.HTTP_201_CREATED,
+            result_message="Success",
+            data=StatementImportResult(
+                parsed=stats.parsed,
+                imported=imported,
+                duplicates=stats.parsed - stats.skipped - imported,
+                skipped=stats.skipped,
+                errors=stats.errors,
+            ),
+        )
+
+    except ValueError as e:
+        await session.rollback()
+        raise AppHTTPException(
+            result_code=status.HTTP_400_BAD_REQUEST,
+            result_message=str(e),
+            error_code=AppErrorCode.INVALID_REQUEST,
+        )
+
+    except Exception:
+        logger.exception("Failed to import statement")
+        await session.rollback()
+        raise AppHTTPException(
+            result_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            result_message="Failed to import statement",
+            error_code="E500",
+        )
+
+
 @router.patch("/{id}", response_model=BaseResponse[TransactionRead])
 async def update_transaction(
     id: str,
     transaction_in: TransactionUpdate,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
     """
     Update an existing transaction by ID.
     """
     try:
-        transaction_db = session.get(Transaction, id)
+        # Locked until commit: a concurrent update or delete waits and then
+        # sees this one's result, so the rollup delta is taken only once
+        transaction_db = await session.get(Transaction, id, with_for_update=True)
         if not transaction_db or not transaction_db.is_active or transaction_db.user_id != current_user.id:
             raise AppHTTPException(
                 result_code=404,
@@ -313,26 +857,40 @@ async def update_transaction(
                 error_code="E404"
             )
 
+        spending_before = spending_of(transaction_db)
         update_data = transaction_in.model_dump(exclude_unset=True)
         transaction_db.sqlmodel_update(update_data)
 
         session.add(transaction_db)
-        session.commit()
-        session.refresh(transaction_db)
+        await apply_spending_changes(
+            session,
+            added=[spending_of(transaction_db)],
+            removed=[spending_before],
+        )
+        await session.commit()
+        transaction_db = await load_transaction_for_read(
+            session, transaction_db.transaction_id)
+        await count_cache.invalidate_user(current_user.id)
+        await response_cache.invalidate(current_user.id, "transactions")
 
         return success_response(data=transaction_db)
-    except AppHTTPException as e:
-        session.rollback()
+
+    except AppHTTPException:
+        await session.rollback()
+        raise
+
+    except Exception:
+        logger.exception("Failed to update transaction")
+        await session.rollback()
         raise AppHTTPException(
             result_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             result_message="Failed to update transaction",
             error_code="E500",
-            detail=str(e)
         )
 
 
 # @router.delete("/{id}", response_model=BaseResponse[None])
-# async def delete_transaction(id: UUID, session: Session = Depends(get_session)):
+# async def delete_transaction(id: UUID, session: AsyncSession = Depends(get_session)):
 #     """
 #     Delete a transaction by ID.
 #     """
@@ -363,11 +921,13 @@ async def update_transaction(
 async def delete_transaction(
     *,
     request: TransactionDelete,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
     try:
-        transaction_db = session.get(Transaction, request.transaction_id)
+        # Locked until commit, so a concurrent delete sees the row inactive
+        transaction_db = await session.get(
+            Transaction, request.transaction_id, with_for_update=True)
         if not transaction_db or not transaction_db.is_active or transaction_db.user_id != current_user.id:
             raise AppHTTPException(
                 result_code=404,
@@ -378,16 +938,23 @@ async def delete_transaction(
         transaction_db.is_active = False
 
         session.add(transaction_db)
-        session.commit()
-        session.refresh(transaction_db)
+        await apply_spending_changes(
+            session, removed=[spending_of(transaction_db)])
+        await session.commit()
+        await count_cache.invalidate_user(current_user.id)
+        await response_cache.invalidate(current_user.id, "transactions")
 
         return success_response()
 
-    except Exception as e:
-        session.rollback()
+    except AppHTTPException:
+        await session.rollback()
+        raise
+
+    except Exception:
+        logger.exception("Failed to delete transaction")
+        await session.rollback()
         raise AppHTTPException(
             result_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             result_message="Failed to delete transaction",
             error_code="E500",
-            detail=str(e)
         )
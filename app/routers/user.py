@@ -1,16 +1,16 @@
+import logging
+
 from fastapi import APIRouter, Body, Depends, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
-from sqlalchemy import select
-from sqlmodel import Session
+from sqlalchemy import select, update
+from sqlmodel.ext.asyncio.session import AsyncSession
 from app.core.constants.app_error_code import AppErrorCode
 from app.core.settings import settings
 from app.core.security import (
     ALGORITHM,
     create_access_token,
     create_refresh_token,
-    get_password_hash,
-    verify_password
+    password_hasher,
 )
 from app.database import get_session
 from app.exceptions import AppHTTPException
@@ -18,7 +18,10 @@ from app.models.user import User
 from app.schemas.base_response import BaseResponse
 from app.schemas.user import RefreshTokenRequest, UserCreate, UserLogin, UserRead, UserWithToken
 from app.core.helper.success_response import success_response
-from app.core.security import oauth2_scheme
+from app.core.security import oauth2_scheme, user_cache
+from app.core.replica import current_user_id
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
@@ -26,9 +29,9 @@ router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 
 @router.post("/register", response_model=BaseResponse[UserWithToken])
-def register(user_data: UserCreate, session: Session = Depends(get_session)):
-    existing_user = session.exec(select(User).where(
-        User.username == user_data.username)).first()
+async def register(user_data: UserCreate, session: AsyncSession = Depends(get_session)):
+    existing_user = (await session.exec(select(User).where(
+        User.username == user_data.username))).first()
     if existing_user:
         raise AppHTTPException(
             result_code=status.HTTP_400_BAD_REQUEST,
@@ -36,15 +39,15 @@ def register(user_data: UserCreate, session: Session = Depends(get_session)):
             error_code="E400"
         )
 
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await password_hasher.hash(user_data.password)
     new_user = User(
         username=user_data.username,
         email=user_data.email,
         hashed_password=hashed_password,
     )
     session.add(new_user)
-    session.commit()
-    session.refresh(new_user)
+    await session.commit()
+    await session.refresh(new_user)
 
     access_token = create_access_token({"sub": new_user.id})
     refresh_token = create_refresh_token(new_user.id, new_user.token_version)
@@ -62,20 +65,28 @@ def register(user_data: UserCreate, session: Session = Depends(get_session)):
 
 
 @router.post("/login", response_model=BaseResponse[UserWithToken])
-def login(request: UserLogin, session: Session = Depends(get_session)):
-    user = session.scalars(select(User).where(
-        User.username == request.username)).first()
-    if not user or not verify_password(request.password, user.hashed_password):
+async def login(request: UserLogin, session: AsyncSession = Depends(get_session)):
+    user = (await session.scalars(select(User).where(
+        User.username == request.username))).first()
+    is_valid, new_hash = (False, None)
+    if user:
+        is_valid, new_hash = await password_hasher.verify_and_update(
+            request.password, user.hashed_password)
+    if not is_valid:
         raise AppHTTPException(
             result_code=status.HTTP_401_UNAUTHORIZED,
             result_message="Incorrect username or password",
             error_code="E401"
         )
 
+    # The configured bcrypt cost changed since this hash was made
+    if new_hash:
+        user.hashed_password = new_hash
+
     # Optional: update last login
     # user.last_login = user.last_login  # or datetime.now(timezone.utc)
     session.add(user)
-    session.commit()
+    await session.commit()
 
     access_token = create_access_token({"sub": user.id})
     refresh_token = create_refresh_token(user.id, user.token_version)
@@ -93,32 +104,34 @@ def login(request: UserLogin, session: Session = Depends(get_session)):
 
 
 @router.post("/refresh", response_model=BaseResponse[UserWithToken])
-def refresh_token(
+async def refresh_token(
     body: RefreshTokenRequest = Body(...),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
 ):
     """
     Refresh an access token using a valid refresh token.
     Rotates the refresh token by incrementing the user's token_version.
     """
+    from jose import JWTError, jwt
+
     try:
         payload = jwt.decode(
             body.refresh_token,  # ✅ fixed: use request body
             settings.JWT_SECRET_KEY,
             algorithms=[ALGORITHM],
         )
-        print("Decoded refresh token payload:", payload)  # debug
-        user_id: int | None = payload.get("sub")
+        # `sub` is encoded as a string; asyncpg binds parameters strictly by type
+        user_id: int = int(payload.get("sub"))
         token_version: int | None = payload.get("token_version")
-    except JWTError as e:
-        print("JWT decode error:", e)
+    except (JWTError, TypeError, ValueError) as e:
+        logger.info("Rejected refresh token: %s", e)
         raise AppHTTPException(
             result_code=status.HTTP_401_UNAUTHORIZED,
             result_message="Invalid refresh token",
             error_code=AppErrorCode.REFRESH_TOKEN_INVALID,
         )
 
-    user = session.get(User, user_id)
+    user = await session.get(User, user_id)
     if not user or user.token_version != token_version:
         raise AppHTTPException(
             result_code=status.HTTP_401_UNAUTHORIZED,
@@ -129,7 +142,7 @@ def refresh_token(
     # 🔄 Rotate refresh token
     user.token_version += 1
     session.add(user)
-    session.commit()
+    await session.commit()
 
     access_token = create_access_token({"sub": user.id})
     new_refresh_token = create_refresh_token(user.id, user.token_version)
@@ -147,10 +160,12 @@ def refresh_token(
 
 
 
-def get_current_user(
+async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_session)
 ) -> User:
+    from jose import JWTError, jwt
+
     credentials_exception = AppHTTPException(
         result_code=status.HTTP_401_UNAUTHORIZED,
         result_message="Access token expired or invalid",
@@ -164,7 +179,7 @@ def get_current_user(
         if user_id_str is None:
             raise credentials_exception
     except JWTError as e:
-        print("JWT Error:", e)
+        logger.info("Rejected access token: %s", e)
         raise credentials_exception
 
     try:
@@ -172,14 +187,22 @@ def get_current_user(
     except ValueError:
         raise credentials_exception
 
-    user = session.get(User, user_id)
+    user = user_cache.get(user_id)
+    if user is not None:
+        session.add(user)
+        current_user_id.set(user.id)
+        return user
+
+    user = await session.get(User, user_id)
     if not user:
         raise credentials_exception
+    user_cache.set(user)
+    current_user_id.set(user.id)
     return user
 
 
 @router.get("/me", response_model=BaseResponse[UserRead])
-def read_user_current(current_user: User = Depends(get_current_user)):
+async def read_user_current(current_user: User = Depends(get_current_user)):
     return success_response(
         data=UserRead(
             id=current_user.id,
@@ -190,12 +213,19 @@ def read_user_current(current_user: User = Depends(get_current_user)):
 
 
 @router.post("/logout", response_model=BaseResponse[None])
-def logout(session: Session = Depends(get_session), current_user: User = Depends(get_current_user)):
+async def logout(session: AsyncSession = Depends(get_session), current_user: User = Depends(get_current_user)):
     """
     Logout the current user by invalidating their refresh token.
     """
-    current_user.token_version += 1
-    session.add(current_user)
-    session.commit()
+    # Increment in the database: `current_user` may be a cached copy that
+    # predates a refresh handled by another worker
+    await session.exec(
+        update(User)
+        .where(User.id == current_user.id)
+        .values(token_version=User.token_version + 1)
+    )
+    await session.commit()
+    # A bulk UPDATE fires no ORM events, so evict the cached row here
+    await user_cache.invalidate(current_user.id)
 
     return success_response()
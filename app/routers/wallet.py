@@ -1,7 +1,8 @@
-from fastapi import APIRouter, Depends, Query, status, HTTPException
-from sqlmodel import Session, select
+from fastapi import APIRouter, Depends, Query, Request, status, HTTPException
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from typing import List
-from app.database import get_session
+from app.database import get_read_session, get_session
 
 from app.models.user import User
 from app.routers.user import get_current_user
@@ -10,32 +11,55 @@ from app.models.wallet import Wallet
 
 from app.schemas.base_response import BaseResponse
 from app.core.helper.success_response import success_response
+from app.core.helper.fast_response import fast_response
+from app.core.helper.conditional import collection_version, is_not_modified, make_etag, not_modified, set_validators
+from app.core.response_cache import response_cache
 from app.exceptions import AppHTTPException
 from typing import Optional
 
 router = APIRouter(prefix="/wallets", tags=["Wallets"])
 
 
+def wallet_conditions(user_id: int, is_active: bool = True) -> list:
+    return [
+        Wallet.user_id == user_id,
+        Wallet.is_active == is_active,
+    ]
+
+
+async def fetch_wallets(session: AsyncSession, user_id: int, is_active: bool = True) -> List[Wallet]:
+    statement = select(Wallet).where(*wallet_conditions(user_id, is_active))
+    statement = statement.order_by(Wallet.wallet_type)
+    return (await session.exec(statement)).all()
+
+
 @router.get("/", response_model=BaseResponse[List[AccountRead]])
+@response_cache("wallets", tags=("wallets",))
 async def get_wallets(
     *,
+    request: Request,
     is_active: Optional[bool] = Query(None),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
     current_user: User = Depends(get_current_user)
 ):
     """
     Retrieve all wallets.
+
+    Supports conditional GET: send the returned ETag as `If-None-Match` to get
+    `304 Not Modified` while the wallets are unchanged.
     """
     try:
         active_filter = is_active if is_active is not None else True
-        statement = select(Wallet).where(
-            Wallet.user_id == current_user.id,
-            Wallet.is_active == active_filter,
-        )
-        statement = statement.order_by(Wallet.wallet_type)
+        count, last_modified = await collection_version(
+            session, Wallet, *wallet_conditions(current_user.id, active_filter))
+        etag = make_etag("wallets", current_user.id, active_filter, count, last_modified)
+        if is_not_modified(request, etag, last_modified):
+            return not_modified(etag, last_modified)
 
-        wallets = session.exec(statement).all()
-        return success_response(data=wallets)
+        wallets = await fetch_wallets(session, current_user.id, active_filter)
+        return set_validators(
+            fast_response(BaseResponse[List[AccountRead]], data=wallets),
+            etag, last_modified)
     except Exception as e:
         raise AppHTTPException(
             result_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -47,14 +71,14 @@ async def get_wallets(
 @router.post("/", response_model=BaseResponse[AccountRead], status_code=status.HTTP_201_CREATED)
 async def create_wallet(
     wallet_in: AccountCreate,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
     statement = select(Wallet).where(
         Wallet.user_id == current_user.id,
         Wallet.wallet_number == wallet_in.wallet_number,
     )
-    existing_wallet = session.exec(statement).first()
+    existing_wallet = (await session.exec(statement)).first()
     if existing_wallet:
         raise AppHTTPException(
             result_code=status.HTTP_400_BAD_REQUEST,
@@ -64,8 +88,9 @@ async def create_wallet(
 
     new_wallet = Wallet(**wallet_in.model_dump(), user_id=current_user.id)
     session.add(new_wallet)
-    session.commit()
-    session.refresh(new_wallet)
+    await session.commit()
+    await response_cache.invalidate(current_user.id, "wallets")
+    await session.refresh(new_wallet)
     return success_response(data=new_wallet)
 
 
@@ -73,10 +98,10 @@ async def create_wallet(
 async def update_wallet(
     id: str,
     wallet: AccountUpdate,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
-    wallet_db = session.get(Wallet, id)
+    wallet_db = await session.get(Wallet, id)
     if not wallet_db or not wallet_db.is_active or wallet_db.user_id != current_user.id:
         raise AppHTTPException(
             result_code=status.HTTP_404_NOT_FOUND,
@@ -87,8 +112,9 @@ async def update_wallet(
     wallet_data = wallet.model_dump(exclude_unset=True)
     wallet_db.sqlmodel_update(wallet_data)
     session.add(wallet_db)
-    session.commit()
-    session.refresh(wallet_db)
+    await session.commit()
+    await response_cache.invalidate(current_user.id, "wallets")
+    await session.refresh(wallet_db)
     return success_response(data=wallet_db)
 
 
@@ -96,10 +122,10 @@ async def update_wallet(
 async def delete_wallet(
     *,
     request: AccountDelete,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
-    wallet_db = session.get(Wallet, request.wallet_id)
+    wallet_db = await session.get(Wallet, request.wallet_id)
     if not wallet_db or not wallet_db.is_active or wallet_db.user_id != current_user.id:
         raise AppHTTPException(
             result_code=status.HTTP_404_NOT_FOUND,
@@ -109,6 +135,7 @@ async def delete_wallet(
 
     wallet_db.is_active = False
     session.add(wallet_db)
-    session.commit()
-    session.refresh(wallet_db)
+    await session.commit()
+    await response_cache.invalidate(current_user.id, "wallets")
+    await session.refresh(wallet_db)
     return success_response()
@@ -24,9 +24,13 @@ class BaseResponse(BaseModel, Generic[T]):
     )
 
 class PaginatedResponse(BaseResponse[T], Generic[T]):
-    total: int
+    total: Optional[int]
+    total_is_estimate: bool = Field(default=False)
     skip: int
     limit: int
+    # Keyset pagination: echo of the requested cursor and the token for the next page
+    cursor: Optional[str] = Field(default=None)
+    next_cursor: Optional[str] = Field(default=None)
 
 class ErrorResponse(BaseModel): 
     result_code: int 
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, ConfigDict, Field, field_validator
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 from app.core.helper.timezones import get_now_utc_plus_7
@@ -157,3 +157,34 @@ class CategoryDelete(BaseModel):
         examples=["123e4567-e89b-12d3-a456-426614174000"],
         description="Unique identifier for the category",
     )
+
+
+class IconRead(BaseModel):
+    """
+    One category icon in the icon manifest.
+    """
+    name: str = Field(..., examples=["book.svg"])
+    url: str = Field(
+        ...,
+        examples=["/static/icons/book.svg"],
+        description="Plain URL, the form stored in `icon_url`",
+    )
+    hashed_url: str = Field(
+        ...,
+        examples=["/static/icons/book.1a2b3c4d5e6f.svg"],
+        description="Content-hashed URL that can be cached forever",
+    )
+    hash: str = Field(..., examples=["1a2b3c4d5e6f"])
+
+
+class IconManifestRead(BaseModel):
+    """
+    Every category icon, plus a sprite holding all SVG icons as `<symbol>`s.
+    """
+    version: str = Field(..., description="Changes whenever any icon changes")
+    icons: List[IconRead]
+    sprite_url: str = Field(
+        ...,
+        examples=["/categories/icons/sprite.svg?v=1a2b3c4d5e6f"],
+        description="Sprite URL for this version, cacheable forever",
+    )
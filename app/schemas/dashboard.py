@@ -0,0 +1,25 @@
+from pydantic import BaseModel, Field
+from typing import Dict, List
+from app.schemas.user import UserRead
+from app.schemas.wallet import AccountRead
+from app.schemas.category import CategoryRead
+from app.schemas.transaction import TransactionRead
+
+
+class DashboardResponse(BaseModel):
+    """Everything the home screen loads on open, in one response."""
+    user: UserRead
+
+    wallets: List[AccountRead] = Field(default_factory=list)
+
+    categories: List[CategoryRead] = Field(default_factory=list)
+
+    current_week: List[TransactionRead] = Field(
+        default_factory=list,
+        description="Transactions of the current week, newest first"
+    )
+
+    total_expenses: Dict[str, float] = Field(
+        default_factory=dict,
+        description="All-time totals: total_in_usd and total_in_khr"
+    )
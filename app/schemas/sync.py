@@ -0,0 +1,52 @@
+from pydantic import BaseModel, Field
+from typing import List
+from app.schemas.wallet import AccountRead
+from app.schemas.category import CategoryRead
+from app.schemas.transaction import TransactionRead
+
+
+class SyncDeleted(BaseModel):
+    """Rows soft-deleted since the token (tombstones)."""
+    wallets: List[str] = Field(
+        default_factory=list,
+        description="wallet_id of deleted wallets"
+    )
+
+    categories: List[str] = Field(
+        default_factory=list,
+        description="category_id of deleted categories"
+    )
+
+    transactions: List[str] = Field(
+        default_factory=list,
+        description="transaction_no of deleted transactions"
+    )
+
+
+class SyncResponse(BaseModel):
+    wallets: List[AccountRead] = Field(
+        default_factory=list,
+        description="Wallets created or updated since the token"
+    )
+
+    categories: List[CategoryRead] = Field(
+        default_factory=list,
+        description="Categories created or updated since the token"
+    )
+
+    transactions: List[TransactionRead] = Field(
+        default_factory=list,
+        description="Transactions created or updated since the token"
+    )
+
+    deleted: SyncDeleted = Field(default_factory=SyncDeleted)
+
+    next_token: str = Field(
+        ...,
+        description="Pass as `since` on the next sync"
+    )
+
+    has_more: bool = Field(
+        ...,
+        description="More changes are pending; sync again right away with `next_token`"
+    )
@@ -1,8 +1,12 @@
 from pydantic import BaseModel, ConfigDict, Field, PositiveFloat, field_validator, field_serializer
-from typing import Optional
-from datetime import datetime, timezone
+from enum import Enum
+from typing import List, Optional
+from datetime import date, datetime, timezone
+from app.schemas.base_response import BaseResponse
 from app.schemas.wallet import AccountRead
 from app.schemas.category import CategoryRead
+from app.core.helper.timezones import to_naive_utc
+from app.core.settings import settings
 
 # --- Base model for UTC timestamps ---
 
@@ -51,6 +55,11 @@ class TransactionBase(BaseUTCModel):
                 raise ValueError("Note cannot be empty or whitespace only")
         return value
 
+    @field_validator("transaction_date")
+    def normalize_transaction_date(cls, value: datetime) -> datetime:
+        """Store offsets as naive UTC, matching the column type."""
+        return to_naive_utc(value)
+
 # --- Read Schema ---
 
 
@@ -83,6 +92,48 @@ class TransactionCreate(TransactionBase):
         description="Optional reference to category"
     )
 
+# --- Bulk Create Schemas ---
+
+
+class BulkMode(str, Enum):
+    ATOMIC = "atomic"      # insert every item or none
+    PARTIAL = "partial"    # insert the valid items, report the others
+
+
+class TransactionBulkCreate(BaseModel):
+    items: List[TransactionCreate] = Field(
+        ...,
+        min_length=1,
+        max_length=settings.BULK_MAX_ITEMS,
+        description="Transactions to create, in order"
+    )
+
+    mode: BulkMode = Field(
+        BulkMode.ATOMIC,
+        description="atomic: all-or-nothing; partial: keep the valid items"
+    )
+
+
+class TransactionBulkItemResult(BaseModel):
+    index: int = Field(
+        ...,
+        description="Position of the item in the request"
+    )
+
+    success: bool
+
+    transaction_id: Optional[str] = None
+    transaction_no: Optional[str] = None
+
+    error_code: Optional[str] = None
+    error_message: Optional[str] = None
+
+
+class TransactionBulkResult(BaseModel):
+    created: int
+    failed: int
+    results: List[TransactionBulkItemResult]
+
 # --- Update Schema ---
 
 
@@ -131,3 +182,56 @@ class TransactionDelete(BaseModel):
         ...,
         description="Unique identifier for the transaction"
     )
+
+# --- Time Series Schema ---
+
+
+class TimeseriesPoint(BaseModel):
+    bucket_start: date = Field(
+        ...,
+        description="First local day of the bucket"
+    )
+
+    total_in_usd: float = 0.0
+    total_in_khr: float = 0.0
+
+    transaction_count: int = 0
+
+
+class CurrentWeekResponse(BaseResponse[List[TransactionRead]]):
+    # Spending per day of the same week, Monday first, for the home screen chart
+    days: List[TimeseriesPoint] = Field(default_factory=list)
+
+# --- Statement Import Schema ---
+
+
+class StatementImportError(BaseModel):
+    line: int
+    message: str
+
+
+class StatementImportResult(BaseModel):
+    parsed: int = Field(
+        ...,
+        description="Statement lines read after the header"
+    )
+
+    imported: int = Field(
+        ...,
+        description="Transactions created"
+    )
+
+    duplicates: int = Field(
+        ...,
+        description="Lines already imported into the wallet"
+    )
+
+    skipped: int = Field(
+        ...,
+        description="Lines without spending (income) or that could not be parsed"
+    )
+
+    errors: List[StatementImportError] = Field(
+        default_factory=list,
+        description="The first lines that could not be parsed"
+    )
@@ -1,175 +1,504 @@
-from fastapi import FastAPI, HTTPException
-from faker import Faker
-from uuid import uuid4
-from datetime import datetime
+"""
+Synthetic data generator for benchmarking at production volumes.
+
+Users with their wallets, categories and transactions are written straight
+into the real tables with `COPY`, then the spending rollups are rebuilt:
+
+    python -m app.seed.seed_data --users 20000 --transactions 10000000 \\
+        [--seed 42] [--end-date 2025-06-30] [--years 3] [--workers 4] \\
+        [--truncate] [--defer-indexes]
+
+Each user's rows come from a random generator seeded with `--seed` and the
+user's number, so the same seed, counts, `--end-date` and `--years` always
+produce the same rows, whatever `--workers` is. Only user ids come from the
+database sequence (`--truncate` restarts it, making them 1..N as well), and
+the shared password hash has a random salt. Wallet and transaction numbers
+are unique within a load, not across loads, so the generator only loads
+into a database without wallets or transactions (or with `--truncate`).
+
+The data is shaped like real usage:
+- Activity per user is log-normal: a few heavy users own a large share of
+  the transactions, and heavier users tend to have longer histories.
+- Histories span up to `--years` before the end date (exclusive), with more
+  activity in recent months, on weekends and around meals.
+- Users have 1-5 wallets (ABA, WING, ACLEDA, cash, ...), about a third of
+  them in KHR, whose transactions are in riel.
+- Amounts are log-normal per category; ~3% of transactions are
+  uncategorized and ~1% are soft-deleted.
+
+Transactions are staged in an unlogged table and moved into `transactions`
+in `created_at` order, so rows are laid out on disk by time as in
+production rather than clustered by user. `--defer-indexes` drops the
+secondary indexes and foreign keys of `transactions` for that step and
+rebuilds them after, which is much faster for large loads.
+"""
+import argparse
+import asyncio
+import math
 import random
-from typing import List, Optional
-from pydantic import BaseModel
+import time
+from bisect import bisect
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from itertools import accumulate
+from multiprocessing import get_context
+from typing import Iterator, List, NamedTuple, Sequence
+from uuid import UUID
+from zoneinfo import ZoneInfo
 
-app = FastAPI()
-fake = Faker()
+from sqlalchemy import text
 
-# ----- Your schemas (simplified for example) -----
+from app.core.settings import settings
 
+LOCAL_TZ = ZoneInfo(settings.DEFAULT_TIMEZONE)
 
-class Wallet(BaseModel):
-    id: str
-    wallet_number: str
-    wallet_name: str
-    currency: str
-    wallet_type: str
-    wallet_logo: str = None
-    is_active: bool = True
-    created_at: datetime
-    updated_at: Optional[datetime] = None
+# Users committed per database transaction
+BATCH_USERS = 500
 
+STAGING_TABLE = "seed_transactions"
 
-class Category(BaseModel):
-    id: str
-    name: str
-    description: str
-    icon_name: str
-    created_at: datetime
-    updated_at: Optional[datetime] = None
-
-
-class Transaction(BaseModel):
-    id: str
-    wallet_id: str
-    category_id: str
-    currency: str
-    amount: float
-    note: str
-    transaction_date: datetime
-    created_at: datetime
-    updated_at: Optional[datetime] = None
-
-
-# ----- In-memory "database" for demo -----
-wallets_db = []
-categories_db = []
-transactions_db = []
-
-# ----- Constants -----
-ACCOUNT_TYPES = ["ABA", "WING", "AC", "CASH"]
-CURRENCIES = ["USD", "KHR"]
-CATEGORY_EXAMPLES = [
-    {"name": "Food & Drinks", "description": "Meals, coffee, snacks", "icon_name": "restaurant"},
-    {"name": "Sports", "description": "Gym, fitness, sports activities", "icon_name": "fitness_center"},
-    {"name": "Utilities", "description": "Electricity, water, internet bills", "icon_name": "flash_on"},
-    {"name": "Health", "description": "Medical, pharmacy", "icon_name": "local_hospital"},
-    {"name": "Salary", "description": "Monthly income", "icon_name": "attach_money"},
-    {"name": "Transfers", "description": "Money moved between wallets", "icon_name": "swap_horiz"},
-]
-
-# ----- Data generation functions -----
-
-
-def generate_wallet() -> Wallet:
-    return Wallet(
-        id=str(uuid4()),
-        wallet_number=fake.bothify(text='??##??##'),
-        wallet_name=fake.company(),
-        currency=random.choice(CURRENCIES),
-        wallet_type=random.choice(ACCOUNT_TYPES),
-        is_active=True,
-        created_at=fake.date_time_between(start_date='-2y', end_date='now'),
-        updated_at=None,
-    )
+KHR_PER_USD = 4_100
 
-
-def generate_category() -> Category:
-    cat = random.choice(CATEGORY_EXAMPLES)
-    return Category(
-        id=str(uuid4()),
-        name=cat["name"],
-        description=cat["description"],
-        icon_name=cat["icon_name"],
-        created_at=fake.date_time_between(start_date='-2y', end_date='now'),
-        updated_at=None,
-    )
+# wallet type, relative frequency, share of KHR wallets
+WALLET_TYPES = (
+    ("ABA", 45, 0.25),
+    ("WING", 15, 0.4),
+    ("AC", 15, 0.35),
+    ("CASH", 20, 0.5),
+    ("CREDIT", 4, 0.0),
+    ("INVESTMENT", 1, 0.0),
+)
+WALLET_NAMES = {
+    "ABA": "ABA", "WING": "Wing", "AC": "ACLEDA",
+    "CASH": "Cash", "CREDIT": "Credit Card", "INVESTMENT": "Investment",
+}
 
 
-def generate_transaction(wallet: Wallet, category: Category) -> Transaction:
-    trans_date = fake.date_time_between(start_date='-90d', end_date='now')
-    amount = round(random.uniform(5, 500), 2)
-
-    return Transaction(
-        id=str(uuid4()),
-        wallet_id=wallet.id,
-        category_id=category.id,
-        currency=wallet.currency,
-        amount=abs(amount),
-        note=fake.sentence(nb_words=6),
-        transaction_date=trans_date,
-        created_at=trans_date,
-        updated_at=None,
+class CategoryProfile(NamedTuple):
+    name: str
+    description: str
+    icon: str
+    # Share of transactions, before each user's own preferences
+    weight: float
+    # Log-normal amount in USD: median and spread
+    median_usd: float
+    sigma: float
+    notes: Sequence[str]
+
+
+CATEGORIES = (
+    CategoryProfile("Food & Drinks", "Meals, coffee, snacks", "foods_and_drinks.svg", 38, 4.0, 0.7,
+                    ("Coffee", "Iced latte", "Lunch", "Dinner", "Breakfast", "Bubble tea", "Groceries")),
+    CategoryProfile("Transport", "Tuk-tuk, ride hailing, fuel", "transport.svg", 14, 3.0, 0.8,
+                    ("PassApp", "Grab", "Tuk-tuk", "Fuel", "Parking")),
+    CategoryProfile("Delivery", "Food and parcel delivery", "delivery.svg", 8, 6.0, 0.6,
+                    ("Foodpanda", "Nham24", "Parcel")),
+    CategoryProfile("Shopping", "Clothes, electronics, household", "shopping.svg", 10, 18.0, 1.0,
+                    ("Clothes", "Market", "Online order", "Household")),
+    CategoryProfile("Utilities & Bills", "Electricity, water, internet, phone", "utilities_and_bills.svg", 5, 22.0, 0.6,
+                    ("Electricity", "Water", "Internet", "Phone top-up")),
+    CategoryProfile("Health", "Clinic, pharmacy", "health.svg", 4, 12.0, 1.0,
+                    ("Pharmacy", "Clinic", "Dentist")),
+    CategoryProfile("Movies", "Cinema and streaming", "movie.svg", 4, 7.0, 0.5,
+                    ("Cinema", "Streaming subscription")),
+    CategoryProfile("Sport", "Gym and sports", "sport.svg", 3, 10.0, 0.7,
+                    ("Gym", "Football", "Badminton")),
+    CategoryProfile("Education", "Courses, school fees", "education.svg", 2, 45.0, 1.0,
+                    ("Course", "School fee", "Books")),
+    CategoryProfile("Travel", "Trips and hotels", "travel.svg", 2, 60.0, 1.0,
+                    ("Hotel", "Bus ticket", "Flight")),
+    CategoryProfile("Books", "Books and stationery", "book.svg", 1, 8.0, 0.5,
+                    ("Bookstore", "Stationery")),
+    CategoryProfile("Other", "Everything else", "other.svg", 9, 10.0, 1.2,
+                    ("Gift", "Donation", "Misc")),
+)
+
+# Relative activity per local hour: mornings, lunch and the evening peak
+HOUR_WEIGHTS = (
+    1, 0.5, 0.2, 0.1, 0.1, 0.3, 2, 5, 7, 5, 4, 6,
+    9, 7, 4, 4, 5, 7, 9, 9, 7, 5, 3, 2,
+)
+HOUR_CUM_WEIGHTS = tuple(accumulate(HOUR_WEIGHTS))
+# Chance of keeping a drawn day, Monday first: weekends are busier
+WEEKDAY_ACCEPT = (0.75, 0.75, 0.75, 0.8, 0.9, 1.0, 1.0)
+
+UNCATEGORIZED_RATE = 0.03
+INACTIVE_RATE = 0.01
+NOTE_RATE = 0.6
+
+USER_COLUMNS = [
+    "id", "username", "email", "hashed_password", "is_active", "created_at", "token_version"]
+WALLET_COLUMNS = [
+    "wallet_id", "wallet_number", "wallet_name", "currency", "wallet_type",
+    "is_active", "created_at", "updated_at", "user_id"]
+CATEGORY_COLUMNS = [
+    "category_id", "name", "description", "icon_url", "is_active",
+    "created_at", "updated_at", "user_id"]
+TRANSACTION_COLUMNS = [
+    "transaction_id", "transaction_no", "amount", "currency", "note",
+    "transaction_date", "is_active", "created_at", "updated_at",
+    "wallet_id", "category_id", "user_id"]
+
+_MASK_48 = (1 << 48) - 1
+
+
+def _scramble(value: int, key: int) -> int:
+    """
+    A bijection of 48-bit integers: distinct values give distinct,
+    random-looking results, used for unique wallet and transaction numbers.
+    """
+    value = (value ^ key) & _MASK_48
+    value = (value * 0x9E3779B97F4B) & _MASK_48
+    value ^= value >> 24
+    value = (value * 0xBF58476D1CE5) & _MASK_48
+    value ^= value >> 21
+    return value
+
+
+def _user_rng(seed: int, user_no: int) -> random.Random:
+    return random.Random(f"{seed}:{user_no}")
+
+
+def _activity_weight(rng: random.Random) -> float:
+    """The first draw of every user's generator: how active they are."""
+    return rng.lognormvariate(0, 1.5)
+
+
+def _uuid(rng: random.Random) -> str:
+    return str(UUID(int=rng.getrandbits(128), version=4))
+
+
+def allocate_transactions(
+    seed: int, users: int, transactions: int, max_per_user: int,
+) -> List[int]:
+    """Transactions per user, proportional to each user's activity weight."""
+    weights = [_activity_weight(_user_rng(seed, user_no)) for user_no in range(users)]
+    scale = transactions / sum(weights)
+    return [min(round(weight * scale), max_per_user) for weight in weights]
+
+
+class UserData(NamedTuple):
+    user: tuple
+    wallets: List[tuple]
+    categories: List[tuple]
+    transactions: Iterator[tuple]
+
+
+def generate_user(
+    seed: int,
+    user_no: int,
+    user_id: int,
+    count: int,
+    end: date,
+    years: float,
+    hashed_password: str,
+) -> UserData:
+    """
+    Rows of one user. Transactions are produced lazily, after the user,
+    wallet and category rows, from the same generator.
+    """
+    rng = _user_rng(seed, user_no)
+    weight = _activity_weight(rng)
+    number_key = _scramble(seed, 0x5EED)
+
+    # Heavier users tend to have been around longer
+    max_days = max(int(years * 365), 30)
+    history_days = 30 + int((max_days - 30) * rng.betavariate(2 + min(weight, 8), 1.2))
+    start = end - timedelta(days=history_days)
+    signed_up_at = datetime.combine(
+        start, datetime.min.time(), LOCAL_TZ) - timedelta(minutes=rng.randint(1, 1440))
+    signed_up_at = signed_up_at.astimezone(timezone.utc)
+
+    username = f"bench{seed}_{user_no}"
+    user = (
+        user_id, username, f"{username}@example.com", hashed_password,
+        True, signed_up_at, 0,
     )
 
-# ----- API endpoints -----
-
-
-@app.post("/seed/wallets", response_model=List[Wallet])
-def seed_wallets(count: int = 5):
-    new_wallets = [generate_wallet() for _ in range(count)]
-    wallets_db.extend(new_wallets)
-    return new_wallets
-
-
-@app.post("/seed/categories", response_model=List[Category])
-def seed_categories():
-    # Seed one of each example category only
-    new_categories = [Category(**cat) for cat in [
-        {
-            "id": str(uuid4()),
-            "name": c["name"],
-            "description": c["description"],
-            "icon_name": c["icon_name"],
-            "created_at": datetime.utcnow(),
-            "updated_at": None,
-        } for c in CATEGORY_EXAMPLES
-    ]]
-    categories_db.extend(new_categories)
-    return new_categories
-
-
-@app.post("/seed/transactions", response_model=List[Transaction])
-def seed_transactions(count: int = 50):
-    if not wallets_db or not categories_db:
-        raise HTTPException(
-            status_code=400, detail="Seed wallets and categories first")
-
-    new_transactions = []
-    for _ in range(count):
-        wallet = random.choice(wallets_db)
-        category = random.choice(categories_db)
-        trans = generate_transaction(wallet, category)
-        new_transactions.append(trans)
-
-    transactions_db.extend(new_transactions)
-    return new_transactions
-
-
-@app.get("/wallets", response_model=List[Wallet])
-def list_wallets():
-    return wallets_db
-
-
-@app.get("/categories", response_model=List[Category])
-def list_categories():
-    return categories_db
-
-
-@app.get("/transactions", response_model=List[Transaction])
-def list_transactions():
-    return transactions_db
-
-
-def seed_all():
-    # call your generate_wallet, generate_category, generate_transaction
-    # save to DB or whatever persistence you use
-    pass
+    wallets = []
+    wallet_weights = []
+    types = [wallet_type for wallet_type, _, _ in WALLET_TYPES]
+    type_weights = [frequency for _, frequency, _ in WALLET_TYPES]
+    khr_share = {wallet_type: share for wallet_type, _, share in WALLET_TYPES}
+    wallet_count = rng.choices((1, 2, 3, 4, 5), weights=(30, 35, 20, 10, 5))[0]
+    names = set()
+    for k in range(wallet_count):
+        wallet_type = rng.choices(types, weights=type_weights)[0]
+        currency = "KHR" if rng.random() < khr_share[wallet_type] else "USD"
+        name = f"{WALLET_NAMES[wallet_type]} {currency}"
+        if name in names:
+            name = f"{name} {k + 1}"
+        names.add(name)
+        wallets.append((
+            _uuid(rng),
+            f"{_scramble(user_no << 4 | k, number_key):012X}",
+            name, currency, wallet_type, True, signed_up_at, signed_up_at, user_id,
+        ))
+        # The first wallet is the everyday one
+        wallet_weights.append(6.0 if k == 0 else rng.uniform(0.5, 3))
+
+    categories = []
+    category_weights = []
+    for profile in CATEGORIES:
+        categories.append((
+            _uuid(rng), profile.name, profile.description,
+            f"/static/icons/{profile.icon}", True, signed_up_at, signed_up_at, user_id,
+        ))
+        category_weights.append(profile.weight * rng.lognormvariate(0, 0.5))
+
+    def transactions() -> Iterator[tuple]:
+        wallet_cum = list(accumulate(wallet_weights))
+        category_cum = list(accumulate(category_weights))
+        first_day = start.toordinal()
+        for n in range(count):
+            # More activity in recent months: day positions skew to the end
+            while True:
+                day = date.fromordinal(
+                    first_day + int(history_days * rng.random() ** 0.7))
+                if rng.random() < WEEKDAY_ACCEPT[day.weekday()]:
+                    break
+            hour = bisect(HOUR_CUM_WEIGHTS, rng.random() * HOUR_CUM_WEIGHTS[-1])
+            local_time = datetime(
+                day.year, day.month, day.day, hour,
+                rng.randrange(60), rng.randrange(60), tzinfo=LOCAL_TZ)
+            transaction_date = local_time.astimezone(timezone.utc)
+            # Most are recorded right away, some days later
+            delay = rng.expovariate(1 / 300) if rng.random() < 0.9 else rng.uniform(3600, 3 * 86400)
+            created_at = transaction_date + timedelta(seconds=delay)
+
+            wallet = wallets[bisect(wallet_cum, rng.random() * wallet_cum[-1])]
+            index = bisect(category_cum, rng.random() * category_cum[-1])
+            profile = CATEGORIES[index]
+            category_id = None if rng.random() < UNCATEGORIZED_RATE else categories[index][0]
+
+            amount = max(rng.lognormvariate(math.log(profile.median_usd), profile.sigma), 0.25)
+            currency = wallet[3]
+            if currency == "KHR":
+                amount = float(max(round(amount * KHR_PER_USD, -2), 100))
+            else:
+                amount = round(amount, 2)
+
+            yield (
+                _uuid(rng),
+                f"TXN{_scramble(user_no << 22 | n, number_key):012X}",
+                amount,
+                currency,
+                rng.choice(profile.notes) if rng.random() < NOTE_RATE else None,
+                # Naive UTC, like every other writer of transaction_date
+                transaction_date.replace(tzinfo=None),
+                rng.random() >= INACTIVE_RATE,
+                created_at,
+                created_at,
+                wallet[0],
+                category_id,
+                user_id,
+            )
+
+    return UserData(user, wallets, categories, transactions())
+
+
+class LoadSlice(NamedTuple):
+    seed: int
+    first_user_no: int
+    user_ids: List[int]
+    counts: List[int]
+    end: date
+    years: float
+    hashed_password: str
+
+
+async def _copy(connection, table: str, columns: List[str], records) -> None:
+    raw_connection = await connection.get_raw_connection()
+    await raw_connection.driver_connection.copy_records_to_table(
+        table, records=records, columns=columns)
+
+
+async def _load_slice(job: LoadSlice) -> int:
+    from app.database import get_engine
+
+    engine = get_engine()
+    loaded = 0
+    try:
+        for offset in range(0, len(job.user_ids), BATCH_USERS):
+            batch = [
+                generate_user(
+                    job.seed, job.first_user_no + i, job.user_ids[i], job.counts[i],
+                    job.end, job.years, job.hashed_password,
+                )
+                for i in range(offset, min(offset + BATCH_USERS, len(job.user_ids)))
+            ]
+            async with engine.begin() as connection:
+                await _copy(connection, "users", USER_COLUMNS, [data.user for data in batch])
+                await _copy(connection, "wallets", WALLET_COLUMNS,
+                            [row for data in batch for row in data.wallets])
+                await _copy(connection, "categories", CATEGORY_COLUMNS,
+                            [row for data in batch for row in data.categories])
+                await _copy(connection, STAGING_TABLE, TRANSACTION_COLUMNS,
+                            (row for data in batch for row in data.transactions))
+            loaded += sum(job.counts[offset:offset + len(batch)])
+            print(f"  users {job.first_user_no + offset + len(batch)}"
+                  f" (slice from {job.first_user_no}): {loaded} transactions")
+    finally:
+        await engine.dispose()
+    return loaded
+
+
+def _run_slice(job: LoadSlice) -> int:
+    """Process pool entry point: one event loop and engine per worker."""
+    return asyncio.run(_load_slice(job))
+
+
+async def _prepare(args, users: int) -> List[int]:
+    """Clear or check the target tables, stage, and reserve `users` ids."""
+    from app.database import get_engine
+
+    async with get_engine().begin() as connection:
+        if args.truncate:
+            await connection.execute(text(
+                "TRUNCATE users, wallets, categories, transactions, daily_spending"
+                " RESTART IDENTITY CASCADE"))
+        elif (await connection.execute(text(
+                "SELECT EXISTS (SELECT 1 FROM transactions)"
+                " OR EXISTS (SELECT 1 FROM wallets)"))).scalar_one():
+            # Wallet and transaction numbers are unique within one load
+            # only; another load's could collide with them
+            raise SystemExit(
+                "The database already has wallets or transactions: pass --truncate"
+                " to load into an empty one")
+
+        await connection.execute(text(f"DROP TABLE IF EXISTS {STAGING_TABLE}"))
+        await connection.execute(text(
+            f"CREATE UNLOGGED TABLE {STAGING_TABLE} (LIKE transactions INCLUDING DEFAULTS)"))
+        # Several nextval() calls in one statement never interleave with
+        # another session's, but keep them sorted to map user numbers to ids
+        result = await connection.execute(text(
+            "SELECT nextval(pg_get_serial_sequence('users', 'id'))"
+            " FROM generate_series(1, :users)"), {"users": users})
+        return sorted(result.scalars().all())
+
+
+# Secondary indexes and foreign keys of `transactions`, as the database has them
+_INDEXES_QUERY = text(
+    "SELECT index_class.relname, pg_get_indexdef(index_class.oid)"
+    " FROM pg_index JOIN pg_class index_class ON index_class.oid = pg_index.indexrelid"
+    " WHERE pg_index.indrelid = 'transactions'::regclass"
+    " AND NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conindid = pg_index.indexrelid)"
+)
+_FOREIGN_KEYS_QUERY = text(
+    "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint"
+    " WHERE conrelid = 'transactions'::regclass AND contype = 'f'"
+)
+
+
+async def _finish(defer_indexes: bool) -> None:
+    """Move staged transactions in time order, then rebuild the rollups."""
+    from app.core.rollups import backfill
+    from app.database import async_session, get_engine
+
+    columns = ", ".join(TRANSACTION_COLUMNS)
+    async with get_engine().begin() as connection:
+        indexes, foreign_keys = [], []
+        if defer_indexes:
+            # Building an index once, and checking a foreign key with one
+            # join, is far cheaper than maintaining them row by row
+            indexes = (await connection.execute(_INDEXES_QUERY)).all()
+            foreign_keys = (await connection.execute(_FOREIGN_KEYS_QUERY)).all()
+            for name, _ in foreign_keys:
+                await connection.execute(text(f'ALTER TABLE transactions DROP CONSTRAINT "{name}"'))
+            for name, _ in indexes:
+                await connection.execute(text(f'DROP INDEX "{name}"'))
+
+        started_at = time.perf_counter()
+        await connection.execute(text(
+            f"INSERT INTO transactions ({columns})"
+            f" SELECT {columns} FROM {STAGING_TABLE} ORDER BY created_at, transaction_id"))
+        await connection.execute(text(f"DROP TABLE {STAGING_TABLE}"))
+        print(f"  moved in {time.perf_counter() - started_at:.1f}s")
+
+        if defer_indexes:
+            started_at = time.perf_counter()
+            await connection.execute(text("SET LOCAL maintenance_work_mem = '512MB'"))
+            for _, definition in indexes:
+                await connection.execute(text(definition))
+            for name, definition in foreign_keys:
+                await connection.execute(text(
+                    f'ALTER TABLE transactions ADD CONSTRAINT "{name}" {definition}'))
+            print(f"  {len(indexes)} indexes and {len(foreign_keys)} foreign keys"
+                  f" rebuilt in {time.perf_counter() - started_at:.1f}s")
+
+    async with async_session() as session:
+        await backfill(session)
+
+    async with get_engine().begin() as connection:
+        await connection.execute(text(
+            "ANALYZE users, wallets, categories, transactions, daily_spending"))
+
+
+async def _main() -> None:
+    from app.core.security import get_password_hash
+    from app.database import get_engine
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--users", type=int, required=True)
+    parser.add_argument("--transactions", type=int, required=True,
+                        help="Approximate total across all users")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--end-date", type=date.fromisoformat, default=None,
+                        help="Histories end the day before (default: today)")
+    parser.add_argument("--years", type=float, default=3.0,
+                        help="Longest history")
+    parser.add_argument("--max-per-user", type=int, default=100_000)
+    parser.add_argument("--password", default="password",
+                        help="Password of every generated user")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Processes generating and copying rows")
+    parser.add_argument("--truncate", action="store_true",
+                        help="Empty users, wallets, categories and transactions first")
+    parser.add_argument("--defer-indexes", action="store_true",
+                        help="Rebuild the transaction indexes and foreign keys after loading")
+    args = parser.parse_args()
+
+    if args.truncate and settings.ENV == "prod":
+        raise SystemExit("Refusing to truncate tables with ENV=prod")
+    # Transaction numbers pack the user number and the row number in 48 bits
+    if args.users >= 1 << 26 or args.max_per_user >= 1 << 22:
+        raise SystemExit("At most 2^26 users and 2^22 transactions per user")
+
+    end = args.end_date or datetime.now(LOCAL_TZ).date()
+    started_at = time.perf_counter()
+    counts = allocate_transactions(args.seed, args.users, args.transactions, args.max_per_user)
+    total = sum(counts)
+    print(f"{args.users} users, {total} transactions, seed {args.seed},"
+          f" histories until {end - timedelta(days=1)}")
+
+    user_ids = await _prepare(args, args.users)
+    await get_engine().dispose()
+    # Hashed once: bcrypt per user would dominate the run
+    hashed_password = get_password_hash(args.password)
+
+    workers = max(1, min(args.workers, args.users))
+    size = math.ceil(args.users / workers)
+    jobs = [
+        LoadSlice(args.seed, first, user_ids[first:first + size], counts[first:first + size],
+                  end, args.years, hashed_password)
+        for first in range(0, args.users, size)
+    ]
+    if workers == 1:
+        for job in jobs:
+            await _load_slice(job)
+    else:
+        # spawn: each worker builds its own engine instead of inheriting ours
+        with ProcessPoolExecutor(workers, mp_context=get_context("spawn")) as pool:
+            await asyncio.gather(*(
+                asyncio.get_running_loop().run_in_executor(pool, _run_slice, job)
+                for job in jobs))
+    loaded_at = time.perf_counter()
+    print(f"Generated and copied in {loaded_at - started_at:.1f}s; moving into transactions")
+
+    await _finish(args.defer_indexes)
+    await get_engine().dispose()
+    print(f"Done in {time.perf_counter() - started_at:.1f}s")
 
 
 if __name__ == "__main__":
-    seed_all()
+    asyncio.run(_main())
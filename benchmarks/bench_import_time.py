@@ -0,0 +1,80 @@
+"""
+Cold import time of the application (`import app.main`), measured in fresh
+interpreters with `-X importtime`. Exits with status 1 when the median is
+over the budget, so CI can guard scale-to-zero cold starts. No database is
+needed: engines and crypto are built on first use.
+
+    python -m benchmarks.bench_import_time [--runs 5] [--budget-ms 1500] [--top 15]
+"""
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+# import time: self [us] | cumulative | imported package
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def import_once(module: str) -> Tuple[float, Dict[str, int]]:
+    """Total import time in ms and cumulative us per top-level import."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        sys.exit(result.stderr)
+
+    total_us = 0
+    modules: Dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if match is None:
+            continue
+        cumulative, indent, name = int(match[2]), len(match[3]), match[4]
+        if indent == 1:
+            # Outermost imports: their cumulative times add up to the total
+            total_us += cumulative
+            modules[name] = cumulative
+        elif name.startswith("app."):
+            modules[name] = cumulative
+    return total_us / 1000, modules
+
+
+def run(module: str, runs: int, top: int) -> float:
+    totals: List[float] = []
+    per_module: Dict[str, List[int]] = defaultdict(list)
+    for _ in range(runs):
+        total_ms, modules = import_once(module)
+        totals.append(total_ms)
+        for name, cumulative in modules.items():
+            per_module[name].append(cumulative)
+
+    median = statistics.median(totals)
+    print(f"import {module}: {runs} runs, median {median:.0f} ms "
+          f"(min {min(totals):.0f}, max {max(totals):.0f})")
+    print("  slowest imports (median cumulative ms):")
+    slowest = sorted(per_module.items(), key=lambda item: -statistics.median(item[1]))
+    for name, values in slowest[:top]:
+        print(f"  {statistics.median(values) / 1000:8.1f}  {name}")
+    return median
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=1500)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    median = run(args.module, args.runs, args.top)
+    if median > args.budget_ms:
+        print(f"over budget: {median:.0f} ms > {args.budget_ms:.0f} ms")
+        sys.exit(1)
+    print(f"within budget ({args.budget_ms:.0f} ms)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Serialization cost of one page of 100 transactions, before and after the
+fast response path. No database is needed; rows are built in memory.
+
+    python -m benchmarks.bench_serialization [--rows 100] [--repeat 2000]
+"""
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.core.helper.fast_response import fast_response
+from app.core.helper.success_response import paginated_success_response
+from app.models.category import Category
+from app.models.transaction import Transaction
+from app.models.wallet import Wallet
+from app.schemas.base_response import PaginatedResponse
+from app.schemas.transaction import TransactionRead
+
+ResponseType = PaginatedResponse[List[TransactionRead]]
+
+
+def build_rows(count: int) -> List[Transaction]:
+    wallet = Wallet(
+        wallet_id="6e3fa3fd-fa5b-4f2f-b8cd-fbd3f07ad152", wallet_number="W000001",
+        wallet_name="Main", currency="USD", wallet_type="ABA", user_id=1,
+    )
+    category = Category(
+        category_id="0f8c6f8e-7c55-4d8e-9d7e-1c1f8f6f2a10", name="Food",
+        icon_url="/static/icons/food.svg", user_id=1,
+        created_at=datetime(2024, 1, 1), updated_at=datetime(2024, 1, 1),
+    )
+    start = datetime(2024, 3, 1, 8, 30)
+    rows = []
+    for i in range(count):
+        transaction = Transaction(
+            transaction_id=f"00000000-0000-0000-0000-{i:012d}",
+            transaction_no=f"TXN{i:012X}", amount=1.5 + i, currency="USD",
+            note=f"Coffee #{i}", transaction_date=start + timedelta(hours=i),
+            wallet_id=wallet.wallet_id, category_id=category.category_id, user_id=1,
+        )
+        transaction.wallet = wallet
+        transaction.category = category
+        rows.append(transaction)
+    return rows
+
+
+async def before(rows, field) -> bytes:
+    """success_response model, then FastAPI's response_model pass, then json.dumps."""
+    content = paginated_success_response(data=rows, total=len(rows), skip=0, limit=len(rows))
+    value = await serialize_response(field=field, response_content=content)
+    return JSONResponse(content=value).body
+
+
+async def after(rows) -> bytes:
+    return fast_response(ResponseType, data=rows, total=len(rows), skip=0, limit=len(rows)).body
+
+
+async def measure(fn, repeat: int) -> float:
+    await fn()  # warm up (adapter compilation, imports)
+    started = time.perf_counter()
+    for _ in range(repeat):
+        await fn()
+    return (time.perf_counter() - started) / repeat
+
+
+async def run(rows: int, repeat: int) -> None:
+    transactions = build_rows(rows)
+    field = create_model_field(name="Response", type_=ResponseType, mode="serialization")
+    old = await before(transactions, field)
+    new = await after(transactions)
+    assert json.loads(old) == json.loads(new), "outputs differ"
+
+    slow = await measure(lambda: before(transactions, field), repeat)
+    fast = await measure(lambda: after(transactions), repeat)
+    print(f"{rows} transactions, {repeat} runs")
+    print(f"  before (success_response + response_model): {slow * 1e6:8.1f} us")
+    print(f"  after  (fast_response):                      {fast * 1e6:8.1f} us")
+    print(f"  speedup: {slow / fast:.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.rows, args.repeat))
+
+if __name__ == "__main__":
+    main()
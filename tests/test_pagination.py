@@ -0,0 +1,114 @@
+import asyncio
+import base64
+from datetime import datetime
+
+import pytest
+from sqlmodel import select
+
+from app.core.cache import InvalidationBus
+from app.core.constants.app_error_code import AppErrorCode
+from app.core.helper import pagination
+from app.core.helper.pagination import (
+    CountCache,
+    CountStrategy,
+    count_rows,
+    decode_cursor,
+    encode_cursor,
+)
+from app.exceptions import AppHTTPException
+from app.models.transaction import Transaction
+
+
+def _token(payload: bytes) -> str:
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2025, 3, 14, 9, 26, 53, 589793)
+    cursor = encode_cursor(created_at, "3f2c1e0a-txn")
+
+    assert decode_cursor(cursor) == (created_at, "3f2c1e0a-txn")
+
+
+def test_cursor_is_url_safe_without_padding():
+    cursor = encode_cursor(datetime(2025, 1, 1), "a" * 37)
+
+    assert "=" not in cursor
+    assert set(cursor) <= set(
+        "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_")
+
+
+@pytest.mark.parametrize("cursor", [
+    "",
+    "not a cursor!",
+    "%%%%",
+    _token(b"\xff\xfe\x00"),
+    _token(b"[1,2"),
+    _token(b"42"),
+    _token(b'["2025-01-01T00:00:00"]'),
+    _token(b'["2025-01-01T00:00:00","a","b"]'),
+    _token(b'["yesterday","abc"]'),
+    _token(b'[null,"abc"]'),
+])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(AppHTTPException) as exc_info:
+        decode_cursor(cursor)
+
+    assert exc_info.value.status_code == 400
+    assert exc_info.value.error_code == AppErrorCode.INVALID_REQUEST
+
+
+def test_tampered_cursor_is_rejected():
+    cursor = encode_cursor(datetime(2025, 1, 1, 12), "abc")
+    # Replace the leading `[` of the JSON payload
+    tampered = _token(b"{" + base64.urlsafe_b64decode(cursor + "==")[1:])
+
+    with pytest.raises(AppHTTPException) as exc_info:
+        decode_cursor(tampered)
+
+    assert exc_info.value.status_code == 400
+    assert exc_info.value.error_code == AppErrorCode.INVALID_REQUEST
+
+
+class _CountingSession:
+    """Answers COUNT queries with `totals` in turn, running `during` mid-query."""
+
+    def __init__(self, *totals, during=None):
+        self._totals = list(totals)
+        self._during = during
+
+    async def exec(self, statement):
+        if self._during:
+            await self._during()
+        total = self._totals.pop(0)
+        return type("Result", (), {"one": lambda _: total})()
+
+
+def _count(session, user_id=1):
+    statement = select(Transaction).where(Transaction.user_id == user_id)
+    return asyncio.run(count_rows(
+        session, statement, CountStrategy.CACHED, user_id, ("all",)))
+
+
+@pytest.fixture
+def count_cache(monkeypatch):
+    cache = CountCache(InvalidationBus(), maxsize=16, ttl=60)
+    monkeypatch.setattr(pagination, "count_cache", cache)
+    return cache
+
+
+def test_cached_count_is_reused_until_invalidated(count_cache):
+    assert _count(_CountingSession(3)) == (3, False)
+    assert _count(_CountingSession()) == (3, False)
+
+    asyncio.run(count_cache.invalidate_user(1))
+
+    assert _count(_CountingSession(4)) == (4, False)
+
+
+def test_count_racing_a_write_is_not_served(count_cache):
+    # The write commits and invalidates while the COUNT is running
+    racing = _CountingSession(3, during=lambda: count_cache.invalidate_user(1))
+
+    assert _count(racing) == (3, False)
+    assert _count(_CountingSession(4)) == (4, False)
@@ -0,0 +1,146 @@
+import asyncio
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from app.core.statements import (
+    HEADER_SEARCH_LINES,
+    STATEMENT_FORMATS,
+    StatementImportStats,
+    iter_csv_records,
+    parse_statement,
+)
+
+PHNOM_PENH = ZoneInfo("Asia/Phnom_Penh")
+
+
+async def _chunks(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+def _records(data: bytes, size: int = 7):
+    async def collect():
+        return [record async for record in iter_csv_records(_chunks(data, size))]
+    return asyncio.run(collect())
+
+
+def _parse(data: str, bank: str, default_currency: str = "USD", size: int = 7):
+    stats = StatementImportStats()
+
+    async def collect():
+        return [
+            line async for line in parse_statement(
+                _chunks(data.encode(), size), STATEMENT_FORMATS[bank],
+                default_currency, PHNOM_PENH, stats)
+        ]
+    return asyncio.run(collect()), stats
+
+
+@pytest.mark.parametrize("size", [1, 3, 7, 4096])
+def test_records_do_not_depend_on_chunk_boundaries(size):
+    data = 'a,b\n1,"x\ny"\n2,"café"\n'.encode()
+
+    assert _records(data, size) == [
+        (1, ["a", "b"]),
+        (3, ["1", "x\ny"]),
+        (4, ["2", "café"]),
+    ]
+
+
+def test_quoted_fields_keep_newlines_commas_and_escaped_quotes():
+    data = b'id,note\n1,"line one\nline ""two"", with comma\n\nline four"\n2,plain\n'
+
+    assert _records(data) == [
+        (1, ["id", "note"]),
+        (5, ["1", 'line one\nline "two", with comma\n\nline four']),
+        (6, ["2", "plain"]),
+    ]
+
+
+def test_records_handle_bom_crlf_and_a_missing_final_newline():
+    data = b'\xef\xbb\xbfid,note\r\n1,"a\r\nb"\r\n2,last'
+
+    assert _records(data) == [
+        (1, ["id", "note"]),
+        (3, ["1", "a\r\nb"]),
+        (4, ["2", "last"]),
+    ]
+
+
+def test_aba_statement():
+    statement = (
+        "Account Name,SOK DARA\n"
+        "Account Number,000 123 456\n"
+        "\n"
+        "Date,Transaction Details,Money In,Money Out,Balance,Ccy,Reference No.\n"
+        '"Jan 05, 2025","Coffee, Brown\nTK branch",,"2.50","97.50",USD,FT25005ABC\n'
+        '"Jan 06, 2025",Salary,500.00,,597.50,USD,FT25006DEF\n'
+        "06/01/2025,Top up,,\"10,000\",,khr,FT25006GHI\n"
+    )
+
+    lines, stats = _parse(statement, "ABA")
+
+    assert [line.line_no for line in lines] == [6, 8]
+    coffee, top_up = lines
+    assert coffee.note == "Coffee, Brown\nTK branch"
+    assert coffee.amount == 2.5
+    assert coffee.currency == "USD"
+    assert coffee.reference == "FT25005ABC"
+    # Midnight in Phnom Penh (UTC+7), stored as naive UTC
+    assert coffee.transaction_date == datetime(2025, 1, 4, 17, 0)
+    assert top_up.amount == 10_000
+    assert top_up.currency == "KHR"
+    assert (stats.parsed, stats.skipped, stats.errors) == (3, 1, [])
+
+
+def test_wing_statement():
+    statement = (
+        "Transaction Date,Transaction ID,Description,Credit,Debit,Currency\n"
+        "05-01-2025 14:30:00,W001,Lunch,,-4.25,USD\n"
+        "05-01-2025 15:00:00,W002,Refund,4.25,,USD\n"
+        "yesterday,W003,Taxi,,3.00,USD\n"
+    )
+
+    lines, stats = _parse(statement, "WING")
+
+    assert len(lines) == 1
+    assert lines[0].amount == 4.25
+    assert lines[0].reference == "W001"
+    assert lines[0].transaction_date == datetime(2025, 1, 5, 7, 30)
+    assert stats.skipped == 2
+    assert stats.errors == [{"line": 4, "message": "Unrecognized date 'yesterday'"}]
+
+
+def test_acleda_statement_uses_the_default_currency():
+    statement = (
+        "Value Date,Narrative,Deposit,Withdrawal,Reference\n"
+        "05/01/2025,Market,,12.00,AC1\n"
+        "06-Jan-2025,Fuel,,30.00,AC2\n"
+    )
+
+    lines, stats = _parse(statement, "AC", default_currency="KHR")
+
+    assert [(line.note, line.amount, line.currency) for line in lines] == [
+        ("Market", 12.0, "KHR"),
+        ("Fuel", 30.0, "KHR"),
+    ]
+    assert lines[1].transaction_date == datetime(2025, 1, 5, 17, 0)
+    assert stats.errors == []
+
+
+def test_invalid_currency_is_reported():
+    statement = "Value Date,Withdrawal,Currency\n05/01/2025,1.00,DOLLARS\n"
+
+    lines, stats = _parse(statement, "AC")
+
+    assert lines == []
+    assert stats.errors == [{"line": 2, "message": "Invalid currency 'DOLLARS'"}]
+
+
+def test_missing_header_row_is_rejected():
+    statement = "Account Name,SOK DARA\n" * (HEADER_SEARCH_LINES + 5)
+
+    with pytest.raises(ValueError, match="header row not found"):
+        _parse(statement, "ABA")
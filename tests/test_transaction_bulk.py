@@ -0,0 +1,88 @@
+from datetime import datetime, timezone
+
+from app.routers.transaction import mark_bulk_inserted, plan_bulk_items
+from app.schemas.transaction import BulkMode, TransactionBulkCreate
+
+USER_ID = 7
+WALLETS = {"wallet-a"}
+CATEGORIES = {"category-a"}
+
+
+def _bulk(mode: BulkMode, *items) -> TransactionBulkCreate:
+    return TransactionBulkCreate(mode=mode, items=[
+        {
+            "amount": 1.5,
+            "currency": "USD",
+            "transaction_date": datetime(2025, 1, 1, tzinfo=timezone.utc),
+            "wallet_id": wallet_id,
+            "category_id": category_id,
+        }
+        for wallet_id, category_id in items
+    ])
+
+
+def _insert(new_transactions):
+    """What INSERT ... RETURNING gives back, in no particular order."""
+    return [
+        (transaction.transaction_id, f"TXN-{index}")
+        for index, transaction in reversed(new_transactions.items())
+    ]
+
+
+def test_all_valid_items_are_created_in_request_order():
+    bulk_in = _bulk(BulkMode.ATOMIC,
+                    ("wallet-a", "category-a"), ("wallet-a", None), ("wallet-a", "category-a"))
+
+    results, new_transactions = plan_bulk_items(bulk_in, USER_ID, WALLETS, CATEGORIES)
+    mark_bulk_inserted(results, new_transactions, _insert(new_transactions))
+
+    assert list(new_transactions) == [0, 1, 2]
+    assert all(t.user_id == USER_ID for t in new_transactions.values())
+    assert [result.index for result in results] == [0, 1, 2]
+    assert [result.transaction_no for result in results] == ["TXN-0", "TXN-1", "TXN-2"]
+    for index, result in enumerate(results):
+        assert result.success
+        assert result.transaction_id == new_transactions[index].transaction_id
+        assert result.error_code is None
+
+
+def test_atomic_mode_creates_nothing_when_an_item_is_invalid():
+    bulk_in = _bulk(BulkMode.ATOMIC,
+                    ("wallet-a", "category-a"), ("wallet-b", None), ("wallet-a", "category-b"))
+
+    results, new_transactions = plan_bulk_items(bulk_in, USER_ID, WALLETS, CATEGORIES)
+
+    assert new_transactions == {}
+    assert not any(result.success for result in results)
+    # The valid item has no error, so the client can tell what to fix
+    assert results[0].error_code is None
+    assert results[1].error_code == "E404"
+    assert results[1].error_message == "Wallet does not exist or is inactive"
+    assert results[2].error_code == "E404"
+    assert results[2].error_message == "Category does not exist or is inactive"
+
+
+def test_partial_mode_creates_the_valid_items_only():
+    bulk_in = _bulk(BulkMode.PARTIAL,
+                    ("wallet-b", None), ("wallet-a", "category-a"),
+                    ("wallet-a", "category-b"), ("wallet-a", None))
+
+    results, new_transactions = plan_bulk_items(bulk_in, USER_ID, WALLETS, CATEGORIES)
+    mark_bulk_inserted(results, new_transactions, _insert(new_transactions))
+
+    assert list(new_transactions) == [1, 3]
+    assert [result.success for result in results] == [False, True, False, True]
+    assert [result.transaction_no for result in results] == [None, "TXN-1", None, "TXN-3"]
+    assert results[1].transaction_id == new_transactions[1].transaction_id
+    assert results[3].transaction_id == new_transactions[3].transaction_id
+    assert results[0].transaction_id is None
+    assert [result.error_code for result in results] == ["E404", None, "E404", None]
+
+
+def test_partial_mode_with_no_valid_items_creates_nothing():
+    bulk_in = _bulk(BulkMode.PARTIAL, ("wallet-b", None), ("wallet-a", "category-b"))
+
+    results, new_transactions = plan_bulk_items(bulk_in, USER_ID, WALLETS, CATEGORIES)
+
+    assert new_transactions == {}
+    assert [result.success for result in results] == [False, False]
@@ -0,0 +1,104 @@
+import asyncio
+from collections import defaultdict
+from datetime import datetime
+
+import pytest
+
+from app.exceptions import AppHTTPException
+from app.models.transaction import Transaction
+from app.models.user import User
+from app.routers import transaction as transaction_router
+from app.schemas.transaction import TransactionDelete
+
+TRANSACTION_ID = "txn-1"
+USER = User(id=1, username="dara", email="dara@example.com", hashed_password="x")
+
+
+class _Database:
+    """Committed rows plus the row locks `FOR UPDATE` takes until commit."""
+
+    def __init__(self, *rows: Transaction):
+        self.rows = {row.transaction_id: row.model_dump() for row in rows}
+        self.locks = defaultdict(asyncio.Lock)
+
+
+class _Session:
+    def __init__(self, database: _Database):
+        self._database = database
+        self._held = []
+        self._added = []
+
+    async def get(self, model, ident, with_for_update=None):
+        if with_for_update:
+            lock = self._database.locks[ident]
+            await lock.acquire()
+            self._held.append(lock)
+        row = model(**self._database.rows[ident])
+        # Let the other request run up to its own read
+        await asyncio.sleep(0)
+        return row
+
+    def add(self, instance):
+        self._added.append(instance)
+
+    async def commit(self):
+        for instance in self._added:
+            self._database.rows[instance.transaction_id] = instance.model_dump()
+        self._release()
+
+    async def rollback(self):
+        self._release()
+
+    def _release(self):
+        self._added = []
+        while self._held:
+            self._held.pop().release()
+
+
+@pytest.fixture
+def removed(monkeypatch):
+    removed_entries = []
+
+    async def apply_spending_changes(session, added=(), removed=()):
+        removed_entries.extend(removed)
+
+    async def invalidate(*args):
+        pass
+
+    monkeypatch.setattr(transaction_router, "apply_spending_changes", apply_spending_changes)
+    monkeypatch.setattr(transaction_router.count_cache, "invalidate_user", invalidate)
+    monkeypatch.setattr(transaction_router.response_cache, "invalidate", invalidate)
+    return removed_entries
+
+
+def test_concurrent_deletes_remove_the_amount_once(removed):
+    database = _Database(Transaction(
+        transaction_id=TRANSACTION_ID,
+        transaction_no="TXN1",
+        amount=12.5,
+        currency="USD",
+        transaction_date=datetime(2025, 3, 1, 5),
+        wallet_id="wallet-1",
+        category_id="category-1",
+        user_id=USER.id,
+        is_active=True,
+    ))
+
+    async def delete():
+        return await transaction_router.delete_transaction(
+            request=TransactionDelete(transaction_id=TRANSACTION_ID),
+            session=_Session(database),
+            current_user=USER,
+        )
+
+    async def delete_twice():
+        return await asyncio.gather(delete(), delete(), return_exceptions=True)
+
+    first, second = asyncio.run(delete_twice())
+
+    assert not isinstance(first, Exception)
+    assert isinstance(second, AppHTTPException)
+    assert second.status_code == 404
+    assert database.rows[TRANSACTION_ID]["is_active"] is False
+    assert len(removed) == 1
+    assert removed[0][1] == 12.5